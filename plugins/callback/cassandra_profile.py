@@ -0,0 +1,212 @@
+# 2026 Rhys Campbell <rhyscampbell@bluewin.ch>
+# https://github.com/rhysmeister
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+
+DOCUMENTATION = '''
+name: cassandra_profile
+type: aggregate
+author: Rhys Campbell (@rhysmeister)
+short_description: Profiles the community.cassandra tasks of a play and the nodetool and cqlsh calls they make.
+requirements:
+  - Enable the callback in ansible.cfg, i.e. C(callbacks_enabled = community.cassandra.cassandra_profile).
+description:
+  - Records the duration of every community.cassandra task on every host.
+  - The modules return the wall time of each nodetool, fqltool and cqlsh call in C(subprocess_timings) \
+    when their I(subprocess_timings) option is set, i.e. with module_defaults for the modules of the play. \
+    These are merged with the task durations.
+  - At the end of the playbook a summary of the slowest tasks is shown. For each host, the time spent in \
+    subprocesses is split into an estimated JVM start-up time and the remaining work.
+  - The JVM start-up time is estimated as the duration of the fastest nodetool call on the host \
+    multiplied by the number of nodetool calls. The other tools are estimated the same way.
+  - Optionally writes a Chrome trace file that can be opened with chrome://tracing or https://ui.perfetto.dev. \
+    Every host is a process with the tasks on one thread and the subprocesses on a second.
+  - The subprocess start times are taken from the clock of the managed host. When they do not fall \
+    inside the task on the controller clock they are shifted to end with the task.
+options:
+  trace_file:
+    description:
+      - The file the Chrome trace is written to.
+      - No trace is written when not set.
+    type: path
+    env:
+      - name: CASSANDRA_PROFILE_TRACE_FILE
+    ini:
+      - section: callback_cassandra_profile
+        key: trace_file
+  summary_count:
+    description:
+      - The number of slowest tasks shown in the summary.
+    type: int
+    default: 10
+    env:
+      - name: CASSANDRA_PROFILE_SUMMARY_COUNT
+    ini:
+      - section: callback_cassandra_profile
+        key: summary_count
+'''
+
+import json
+import time
+
+from ansible.plugins.callback import CallbackBase
+
+
+ACTION_PREFIXES = ('community.cassandra.', 'cassandra_')
+
+
+class CallbackModule(CallbackBase):
+    '''
+    Profiles the community.cassandra tasks of a play
+    '''
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = 'aggregate'
+    CALLBACK_NAME = 'community.cassandra.cassandra_profile'
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(self, display=None):
+        super(CallbackModule, self).__init__(display=display)
+        self.playbook_start = time.time()
+        self.running = {}
+        self.tasks = []
+        self.trace_file = None
+        self.summary_count = 10
+
+    def set_options(self, task_keys=None, var_options=None, direct=None):
+        super(CallbackModule, self).set_options(task_keys=task_keys, var_options=var_options, direct=direct)
+        self.trace_file = self.get_option('trace_file')
+        self.summary_count = self.get_option('summary_count')
+
+    def _is_cassandra_task(self, task):
+        action = getattr(task, 'resolved_action', None) or task.action
+        return action is not None and action.startswith(ACTION_PREFIXES)
+
+    def v2_playbook_on_start(self, playbook):
+        self.playbook_start = time.time()
+
+    def v2_runner_on_start(self, host, task):
+        if self._is_cassandra_task(task):
+            self.running[(host.get_name(), task._uuid)] = time.time()
+
+    def _record(self, result, status):
+        host = result._host.get_name()
+        task = result._task
+        start = self.running.pop((host, task._uuid), None)
+        if start is None:
+            return
+        timings = list(result._result.get('subprocess_timings', []))
+        # Loops return the timings of each item in results
+        for item in result._result.get('results', []):
+            if isinstance(item, dict):
+                timings += item.get('subprocess_timings', [])
+        self.tasks.append(dict(host=host,
+                               name=task.get_name().strip(),
+                               action=getattr(task, 'resolved_action', None) or task.action,
+                               status=status,
+                               start=start,
+                               end=time.time(),
+                               subprocesses=timings))
+
+    def v2_runner_on_ok(self, result):
+        self._record(result, 'ok')
+
+    def v2_runner_on_failed(self, result, ignore_errors=False):
+        self._record(result, 'failed')
+
+    def v2_runner_on_skipped(self, result):
+        self._record(result, 'skipped')
+
+    def v2_runner_on_unreachable(self, result):
+        self._record(result, 'unreachable')
+
+    def host_breakdown(self):
+        '''
+        Returns the task and subprocess time of each host, splitting the
+        subprocess time into the estimated start-up time and the rest, i.e.
+
+        { "cass1": { "tasks": 12, "task_seconds": 95.2, "calls": 41,
+                     "subprocess_seconds": 80.1, "startup_seconds": 57.4,
+                     "work_seconds": 22.7, "overhead_seconds": 15.1 } }
+        '''
+        hosts = {}
+        for task in self.tasks:
+            h = hosts.setdefault(task['host'], dict(tasks=0, task_seconds=0.0, calls=0,
+                                                    subprocess_seconds=0.0, tools={}))
+            h['tasks'] += 1
+            h['task_seconds'] += task['end'] - task['start']
+            for sub in task['subprocesses']:
+                h['calls'] += 1
+                h['subprocess_seconds'] += sub['elapsed']
+                h['tools'].setdefault(sub['tool'], []).append(sub['elapsed'])
+        for h in hosts.values():
+            h['startup_seconds'] = sum(len(e) * min(e) for e in h.pop('tools').values())
+            h['work_seconds'] = h['subprocess_seconds'] - h['startup_seconds']
+            # Calls made side by side can add up to more than the task took
+            h['overhead_seconds'] = max(h['task_seconds'] - h['subprocess_seconds'], 0.0)
+        return hosts
+
+    def trace_events(self):
+        '''
+        Returns the tasks and subprocesses as Chrome trace events
+        '''
+        events = []
+        pids = {}
+        for task in sorted(self.tasks, key=lambda t: t['start']):
+            if task['host'] not in pids:
+                pids[task['host']] = len(pids) + 1
+                events.append(dict(name='process_name', ph='M', pid=pids[task['host']],
+                                   args=dict(name=task['host'])))
+            pid = pids[task['host']]
+            events.append(dict(name=task['name'], cat=task['action'], ph='X', pid=pid, tid=1,
+                               ts=self._microseconds(task['start']),
+                               dur=self._microseconds(task['end'], task['start']),
+                               args=dict(status=task['status'], calls=len(task['subprocesses']))))
+            if not task['subprocesses']:
+                continue
+            first = min(s['start'] for s in task['subprocesses'])
+            last = max(s['start'] + s['elapsed'] for s in task['subprocesses'])
+            shift = 0.0
+            if first < task['start'] or last > task['end']:
+                shift = task['end'] - last
+            for sub in task['subprocesses']:
+                events.append(dict(name="{0} {1}".format(sub['tool'], sub['command']), cat=sub['tool'],
+                                   ph='X', pid=pid, tid=2,
+                                   ts=self._microseconds(sub['start'] + shift),
+                                   dur=int(sub['elapsed'] * 1000000),
+                                   args=dict(rc=sub['rc'])))
+        return events
+
+    def _microseconds(self, t, start=None):
+        if start is None:
+            start = self.playbook_start
+        return int((t - start) * 1000000)
+
+    def v2_playbook_on_stats(self, stats):
+        if not self.tasks:
+            return
+        self._display.banner("CASSANDRA TASK PROFILE")
+        slowest = sorted(self.tasks, key=lambda t: t['start'] - t['end'])[:self.summary_count]
+        for task in slowest:
+            subprocess_seconds = sum(s['elapsed'] for s in task['subprocesses'])
+            self._display.display("{0:<60} {1:<20} {2:>9.2f}s  {3} calls {4:.2f}s".format(
+                task['name'][:60], task['host'][:20], task['end'] - task['start'],
+                len(task['subprocesses']), subprocess_seconds))
+
+        self._display.banner("CASSANDRA SUBPROCESS TIME")
+        for (host, h) in sorted(self.host_breakdown().items()):
+            self._display.display(
+                "{0}: {1} tasks {2:.2f}s, {3} calls {4:.2f}s, "
+                "estimated start-up {5:.2f}s, work {6:.2f}s, other {7:.2f}s".format(
+                    host, h['tasks'], h['task_seconds'], h['calls'], h['subprocess_seconds'],
+                    h['startup_seconds'], h['work_seconds'], h['overhead_seconds']))
+
+        if self.trace_file:
+            try:
+                with open(self.trace_file, 'w') as f:
+                    json.dump(dict(traceEvents=self.trace_events(), displayTimeUnit='ms'), f)
+                self._display.display("Chrome trace written to {0}".format(self.trace_file))
+            except (IOError, OSError) as excep:
+                self._display.warning("Unable to write {0}: {1}".format(self.trace_file, excep))
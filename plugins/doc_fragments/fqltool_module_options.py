@@ -0,0 +1,31 @@
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    # fqltool documentation
+    DOCUMENTATION = r'''
+options:
+  log_dir:
+    description:
+      - The full query log directory.
+    type: path
+    required: true
+    aliases:
+      - path
+  fqltool_path:
+    description:
+      - The path to fqltool.
+    type: str
+  debug:
+    description:
+      - Enable additional debug output.
+    type: bool
+    default: False
+  subprocess_timings:
+    description:
+      - Return the wall time of each fqltool call made by the module in C(subprocess_timings).
+      - Used by the community.cassandra.cassandra_profile callback, i.e. set it for every task with module_defaults.
+    type: bool
+    default: False
+'''
@@ -0,0 +1,30 @@
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    # nodetool job documentation
+    DOCUMENTATION = r'''
+options:
+  state:
+    description:
+      - Run the command as a job detached from the task rather than waiting for it to finish.
+      - started starts the command in the background and returns at once. Nothing is started \
+        when the job in I(job_file) is still running.
+      - status returns the job and, while it runs, its progress from nodetool compactionstats. \
+        The module fails when the job finished with a non zero return code.
+      - cancelled stops all operations of this type on the node with nodetool stop and ends the job.
+      - When not set the command runs in the foreground.
+    type: str
+    choices:
+      - started
+      - status
+      - cancelled
+  job_file:
+    description:
+      - The file the pid, start time and return code of the job are recorded in.
+      - The output of the command is written to this file with the suffix C(.out).
+      - Updates of the file are serialized with a lock on this file with the suffix C(.lock).
+      - Defaults to C(/var/tmp/cassandra_<command>.job).
+    type: path
+'''
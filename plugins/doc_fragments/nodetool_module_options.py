@@ -57,4 +57,10 @@ options:
       - Version of Cassandra being connected to by nodetool.
       - If a value if not provided we use `nodetool version`to auto-discover it.
     type: str
+  subprocess_timings:
+    description:
+      - Return the wall time of each nodetool call made by the module in C(subprocess_timings).
+      - Used by the community.cassandra.cassandra_profile callback, i.e. set it for every task with module_defaults.
+    type: bool
+    default: False
 '''
@@ -0,0 +1,27 @@
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    # Session daemon documentation
+    DOCUMENTATION = r'''
+options:
+  session_daemon:
+    description:
+      - Send statements to a local session daemon that keeps a warm driver session.
+      - The daemon is started on first use and is keyed by the contact points, port, credentials, TLS settings, \
+        consistency level and connection mode so tasks sharing these pay connection setup once.
+    type: bool
+    default: false
+  session_daemon_dir:
+    description:
+      - Directory holding the session daemon unix sockets.
+      - Must be owned by the current user and not accessible by others.
+      - Defaults to ansible-cassandra-sessions-<uid> in the system temporary directory.
+    type: str
+  session_daemon_idle_timeout:
+    description:
+      - Number of seconds without a client after which the session daemon exits.
+    type: int
+    default: 300
+'''
@@ -0,0 +1,37 @@
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    # wait_until documentation
+    DOCUMENTATION = r'''
+options:
+  wait_until:
+    description:
+      - Poll until all of these conditions are met.
+      - A condition is a dotted path into the returned values, an operator (<, <=, >, >=, ==, !=) and a number, \
+        i.e. C(thread_pools.MutationStage.pending < 10).
+      - A condition without an operator must be true.
+      - The module fails if a path is not present, except for a thread pool, table or message type that \
+        a module does not list while it has no activity, which counts as 0.
+      - The module fails if the conditions are not met within I(wait_timeout).
+    type: list
+    elements: str
+  wait_timeout:
+    description:
+      - The maximum number of seconds to wait for I(wait_until).
+    type: int
+    default: 300
+  poll_interval:
+    description:
+      - The minimum number of seconds between polls.
+      - While the values move towards the conditions the interval follows the estimated time left, \
+        otherwise it doubles after each poll.
+    type: int
+    default: 1
+  max_poll_interval:
+    description:
+      - The maximum number of seconds between polls.
+    type: int
+    default: 30
+'''
@@ -2,6 +2,23 @@ from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
 
+# Mirrors cassandra.ConsistencyLevel.name_to_value so argument specs
+# can be built without importing the driver
+CONSISTENCY_LEVELS = [
+    'ANY',
+    'ONE',
+    'TWO',
+    'THREE',
+    'QUORUM',
+    'ALL',
+    'LOCAL_QUORUM',
+    'EACH_QUORUM',
+    'SERIAL',
+    'LOCAL_SERIAL',
+    'LOCAL_ONE',
+]
+
+
 def cassandra_common_argument_spec():
     """
     Returns a dict containing common options for the Cassandra modules
@@ -17,4 +34,5 @@ def cassandra_common_argument_spec():
         username=dict(type='str', no_log=True, aliases=['login_user']),
         nodetool_flags=dict(type='str', default="-Dcom.sun.jndi.rmiURLParsing=legacy"),
         cassandra_version=dict(type='str', default=None),
+        subprocess_timings=dict(type='bool', default=False),
     )
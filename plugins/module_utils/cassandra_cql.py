@@ -0,0 +1,134 @@
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+import os
+try:
+    import ssl
+except ImportError as imp_exc:
+    SSL_LIBRARY_IMPORT_ERROR = imp_exc
+else:
+    SSL_LIBRARY_IMPORT_ERROR = None
+
+
+def cassandra_cql_argument_spec():
+    """
+    Returns a dict containing the connection options of the modules in
+    this collection that connect with the cassandra driver. login_host
+    is left to the modules as its default differs.
+    """
+    return dict(
+        login_user=dict(type='str'),
+        login_password=dict(type='str', no_log=True),
+        login_port=dict(type='int', default=9042),
+        ssl=dict(type='bool', default=False),
+        ssl_cert_reqs=dict(type='str',
+                           required=False,
+                           default='CERT_NONE',
+                           choices=['CERT_NONE',
+                                    'CERT_OPTIONAL',
+                                    'CERT_REQUIRED']),
+        ssl_ca_certs=dict(type='str', default=''),
+    )
+
+
+def check_ssl_options(module):
+    '''
+    Fails the module when the ssl options cannot be used
+    '''
+    if module.params['ssl'] is True and SSL_LIBRARY_IMPORT_ERROR is not None:
+        msg = ("This module requires the SSL python"
+               " library. You can probably install it with pip"
+               " install ssl.")
+        module.fail_json(msg=msg)
+
+    ssl_cert_reqs = module.params['ssl_cert_reqs']
+    ssl_ca_certs = module.params['ssl_ca_certs']
+
+    if ssl_cert_reqs in ('CERT_REQUIRED', 'CERT_OPTIONAL') and ssl_ca_certs == '':
+        msg = ("When verify mode is set to CERT_REQUIRED or CERT_OPTIONAL "
+               "ssl_ca_certs is also required to be set and not empty")
+        module.fail_json(msg=msg)
+
+    if ssl_cert_reqs in ('CERT_REQUIRED', 'CERT_OPTIONAL') and os.path.exists(ssl_ca_certs) is not True:
+        msg = ("ssl_ca_certs certificate: File not found")
+        module.fail_json(msg=msg)
+
+
+def get_auth_provider(module):
+    '''
+    Returns a PlainTextAuthProvider for login_user or None when no user
+    is given. The driver must be importable.
+    '''
+    if module.params['login_user'] is None:
+        return None
+    from cassandra.auth import PlainTextAuthProvider
+    return PlainTextAuthProvider(username=module.params['login_user'],
+                                 password=module.params['login_password'])
+
+
+def get_ssl_context(module):
+    '''
+    Returns an SSLContext for the ssl options or None when ssl is false
+    '''
+    if module.params['ssl'] is not True:
+        return None
+    ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS)
+    ssl_context.verify_mode = getattr(ssl, module.params['ssl_cert_reqs'])
+    if module.params['ssl_cert_reqs'] in ('CERT_REQUIRED', 'CERT_OPTIONAL'):
+        ssl_context.load_verify_locations(module.params['ssl_ca_certs'])
+    return ssl_context
+
+
+def get_read_and_write_sessions(login_host,
+                                login_port,
+                                auth_provider,
+                                ssl_context,
+                                consistency_level,
+                                coordinator_only=False):
+    '''
+    Returns a tuple of (read, write) Cluster objects using
+    consistency_level. Reads with ANY or EACH_QUORUM and writes with
+    SERIAL or LOCAL_SERIAL are not supported by Cassandra so those use
+    the default of LOCAL_ONE.
+
+    Every Cluster gets its own execution profile and load balancing
+    policy. The driver populates a policy with the hosts of the Cluster
+    it is attached to so they cannot be shared.
+    '''
+    from cassandra.cluster import Cluster
+    from cassandra.cluster import EXEC_PROFILE_DEFAULT
+    from cassandra.cluster import ExecutionProfile
+    from cassandra import ConsistencyLevel
+    from cassandra.policies import WhiteListRoundRobinPolicy
+
+    cluster_options = {}
+    if coordinator_only:
+        # Don't track the rest of the ring
+        cluster_options['topology_event_refresh_window'] = -1
+        cluster_options['status_event_refresh_window'] = -1
+        cluster_options['token_metadata_enabled'] = False
+
+    def new_cluster(cluster_consistency_level):
+        profile_options = {}
+        if coordinator_only:
+            # Only open pools to the supplied hosts
+            profile_options['load_balancing_policy'] = WhiteListRoundRobinPolicy(login_host or ['127.0.0.1'])
+        if cluster_consistency_level is not None:
+            profile_options['consistency_level'] = ConsistencyLevel.name_to_value[cluster_consistency_level]
+        options = dict(cluster_options)
+        if profile_options:
+            options['execution_profiles'] = {EXEC_PROFILE_DEFAULT: ExecutionProfile(**profile_options)}
+        return Cluster(login_host,
+                       port=login_port,
+                       auth_provider=auth_provider,
+                       ssl_context=ssl_context,
+                       **options)
+
+    if consistency_level in ["ANY", "EACH_QUORUM"]:  # Not supported for reads
+        cluster_r = new_cluster(None)  # Will be LOCAL_ONE
+    else:
+        cluster_r = new_cluster(consistency_level)
+    if consistency_level in ["SERIAL", "LOCAL_SERIAL"]:  # Not supported for writes
+        cluster_w = new_cluster(None)  # Will be LOCAL_ONE
+    else:
+        cluster_w = new_cluster(consistency_level)
+    return (cluster_r, cluster_w)  # Return a tuple of sessions for C* (read, write)
@@ -0,0 +1,337 @@
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+import errno
+import hashlib
+import json
+import os
+import socket
+import stat
+import tempfile
+import threading
+import time
+
+
+# Module parameters that identify a driver session. Tasks that share
+# all of these share a daemon and therefore a warm session.
+SESSION_KEY_PARAMS = [
+    'login_host',
+    'login_port',
+    'login_user',
+    'login_password',
+    'ssl',
+    'ssl_cert_reqs',
+    'ssl_ca_certs',
+    'consistency_level',
+    'coordinator_only',
+]
+
+
+def session_daemon_argument_spec():
+    """
+    Returns a dict containing the session daemon options for the
+    CQL modules in this collection
+    """
+    return dict(
+        session_daemon=dict(type='bool', default=False),
+        session_daemon_dir=dict(type='str', default=None),
+        session_daemon_idle_timeout=dict(type='int', default=300),
+    )
+
+
+class SessionDaemonError(Exception):
+    """
+    Raised when the session daemon cannot be reached or a statement
+    sent to it fails. error_type holds the class name of the exception
+    raised by the driver inside the daemon, i.e. InvalidRequest.
+    """
+
+    def __init__(self, msg, error_type=None):
+        Exception.__init__(self, msg)
+        self.error_type = error_type
+
+
+class RemoteRow(dict):
+    """
+    A row returned by the session daemon. Supports both row.column and
+    row['column'] access so it can stand in for the named tuple and
+    dict_factory rows returned by the driver.
+    """
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+class SessionDaemonClient(object):
+
+    """
+    Sends newline delimited json requests to a session daemon over
+    its unix socket. Adds the following methods;
+        - request
+        - close
+    """
+
+    def __init__(self, socket_path, timeout=120):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(socket_path)
+        self.reader = self.sock.makefile('rb')
+
+    def request(self, **kwargs):
+        _send_message(self.sock, kwargs)
+        line = self.reader.readline()
+        if not line:
+            raise SessionDaemonError("The session daemon closed the connection")
+        response = json.loads(line.decode('utf-8'))
+        if 'error' in response:
+            raise SessionDaemonError(response['error'], response.get('error_type'))
+        return response
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+
+class RemoteSession(object):
+
+    """
+    Minimal stand-in for a driver Session backed by a session daemon.
+    Adds the following methods;
+        - execute
+        - execution_profile_clone_update
+        - export_keyspace
+    """
+
+    def __init__(self, client, profile):
+        self.client = client
+        self.profile = profile
+
+    def execute(self, cql, execution_profile=None):
+        response = self.client.request(op='execute', profile=self.profile, cql=cql)
+        return [RemoteRow(row) for row in response['rows']]
+
+    def execution_profile_clone_update(self, *args, **kwargs):
+        # Rows from the daemon are always dict-like so there is nothing to clone
+        return None
+
+    def export_keyspace(self, keyspace):
+        response = self.client.request(op='export_keyspace', keyspace=keyspace)
+        return response['cql']
+
+
+class SessionDaemon(object):
+
+    """
+    Serves statements for a pair of connected read and write sessions
+    until no client has been seen for idle_timeout seconds.
+    """
+
+    def __init__(self, cluster_r, cluster_w, idle_timeout):
+        from cassandra.cluster import EXEC_PROFILE_DEFAULT
+        from cassandra.query import dict_factory
+        self.cluster_r = cluster_r
+        self.cluster_w = cluster_w
+        self.idle_timeout = idle_timeout
+        session_r = cluster_r.connect()
+        session_w = cluster_w.connect()
+        self.sessions = {
+            "read": (session_r, session_r.execution_profile_clone_update(EXEC_PROFILE_DEFAULT,
+                                                                         row_factory=dict_factory)),
+            "write": (session_w, session_w.execution_profile_clone_update(EXEC_PROFILE_DEFAULT,
+                                                                          row_factory=dict_factory)),
+        }
+        self.lock = threading.Lock()
+        self.active = 0
+        self.last_activity = time.time()
+
+    def dispatch(self, request):
+        op = request.get('op')
+        if op == "ping":
+            return dict(pong=True)
+        elif op == "execute":
+            (session, profile) = self.sessions[request['profile']]
+            rows = session.execute(request['cql'], execution_profile=profile)
+            return dict(rows=list(rows))
+        elif op == "export_keyspace":
+            keyspace = self.cluster_w.metadata.keyspaces[request['keyspace']]
+            return dict(cql=keyspace.export_as_string())
+        raise ValueError("Unknown session daemon operation: {0}".format(op))
+
+    def handle(self, conn):
+        with self.lock:
+            self.active += 1
+        try:
+            reader = conn.makefile('rb')
+            for line in iter(reader.readline, b''):
+                try:
+                    response = self.dispatch(json.loads(line.decode('utf-8')))
+                except Exception as excep:
+                    response = dict(error=str(excep), error_type=type(excep).__name__)
+                _send_message(conn, response)
+            reader.close()
+        except Exception:
+            pass  # The client went away, nothing to report it to
+        finally:
+            conn.close()
+            with self.lock:
+                self.active -= 1
+                self.last_activity = time.time()
+
+    def is_idle(self):
+        with self.lock:
+            return self.active == 0 and time.time() - self.last_activity > self.idle_timeout
+
+    def serve(self, listener):
+        listener.settimeout(1.0)
+        while not self.is_idle():
+            try:
+                (conn, addr) = listener.accept()
+            except socket.timeout:
+                continue
+            conn.settimeout(None)
+            with self.lock:
+                self.last_activity = time.time()
+            t = threading.Thread(target=self.handle, args=(conn,))
+            t.daemon = True
+            t.start()
+
+    def shutdown(self):
+        self.cluster_r.shutdown()
+        self.cluster_w.shutdown()
+
+
+def _json_default(value):
+    if isinstance(value, bytes):
+        return value.decode('utf-8', 'replace')
+    if hasattr(value, '__iter__') and not isinstance(value, dict):
+        return list(value)  # set, SortedSet etc.
+    return str(value)
+
+
+def _send_message(sock, message):
+    data = json.dumps(message, default=_json_default) + "\n"
+    sock.sendall(data.encode('utf-8'))
+
+
+def session_daemon_dir(params):
+    """
+    Returns the directory holding the session daemon sockets, creating
+    it if needed. The directory must be private to the current user as
+    each socket hands out an authenticated session.
+    """
+    path = params.get('session_daemon_dir')
+    if path is None:
+        path = os.path.join(tempfile.gettempdir(),
+                            "ansible-cassandra-sessions-{0}".format(os.getuid()))
+    try:
+        os.makedirs(path, 0o700)
+    except OSError as excep:
+        if excep.errno != errno.EEXIST:
+            raise
+    st = os.stat(path)
+    if st.st_uid != os.getuid() or stat.S_IMODE(st.st_mode) & 0o077:
+        raise SessionDaemonError("Session daemon directory {0} must be owned by the "
+                                 "current user and not accessible to others".format(path))
+    return path
+
+
+def session_socket_path(params):
+    """
+    Returns the unix socket path of the daemon serving sessions for
+    the connection related params. Credentials are hashed, never stored.
+    """
+    key = json.dumps([params.get(p) for p in SESSION_KEY_PARAMS], default=str)
+    digest = hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+    return os.path.join(session_daemon_dir(params), "{0}.sock".format(digest))
+
+
+def _connect_client(socket_path):
+    try:
+        return SessionDaemonClient(socket_path)
+    except socket.error as excep:
+        if excep.errno == errno.ECONNREFUSED:
+            try:
+                os.unlink(socket_path)  # Stale socket from a dead daemon
+            except OSError:
+                pass
+        elif excep.errno != errno.ENOENT:
+            raise
+    return None
+
+
+def _daemon_main(socket_path, connect, idle_timeout, status_fd):
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    os.umask(0o077)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        listener.bind(socket_path)
+    except socket.error as excep:
+        # Lost a start race with another task, that daemon will serve us
+        status = "ready" if excep.errno == errno.EADDRINUSE else str(excep)
+        os.write(status_fd, status.encode('utf-8'))
+        os.close(status_fd)
+        return
+    listener.listen(16)
+    try:
+        (cluster_r, cluster_w) = connect()
+        daemon = SessionDaemon(cluster_r, cluster_w, idle_timeout)
+    except Exception as excep:
+        listener.close()
+        os.unlink(socket_path)
+        os.write(status_fd, "Error connecting to cluster: {0}".format(excep).encode('utf-8'))
+        os.close(status_fd)
+        return
+    os.write(status_fd, b"ready")
+    os.close(status_fd)
+    try:
+        daemon.serve(listener)
+    finally:
+        listener.close()
+        os.unlink(socket_path)
+        daemon.shutdown()
+
+
+def _spawn_daemon(socket_path, connect, idle_timeout):
+    (r, w) = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(r)
+        try:
+            os.setsid()
+            if os.fork() == 0:
+                _daemon_main(socket_path, connect, idle_timeout, w)
+        finally:
+            os._exit(0)
+    os.close(w)
+    os.waitpid(pid, 0)
+    status = b""
+    while True:
+        chunk = os.read(r, 4096)
+        if not chunk:
+            break
+        status += chunk
+    os.close(r)
+    status = status.decode('utf-8')
+    if status != "ready":
+        raise SessionDaemonError(status or "The session daemon exited before becoming ready")
+
+
+def get_session_daemon_sessions(module, connect):
+    """
+    Returns a (read, write) tuple of RemoteSession objects served by the
+    session daemon for the module's connection params. If no daemon is
+    running one is forked, connect is called inside it and must return a
+    tuple of (read, write) Cluster objects.
+    """
+    socket_path = session_socket_path(module.params)
+    client = _connect_client(socket_path)
+    if client is None:
+        _spawn_daemon(socket_path, connect, module.params['session_daemon_idle_timeout'])
+        client = _connect_client(socket_path)
+    if client is None:
+        raise SessionDaemonError("Unable to connect to the session daemon at {0}".format(socket_path))
+    return (RemoteSession(client, "read"), RemoteSession(client, "write"))
@@ -0,0 +1,15 @@
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+import math
+
+
+def percentile(values, p):
+    """
+    Returns the nearest rank percentile p of the sorted values, i.e. the
+    smallest value with at least p percent of the values at or below it.
+    Returns None when there are no values.
+    """
+    if not values:
+        return None
+    rank = int(math.ceil(p / 100.0 * len(values))) - 1
+    return values[min(max(rank, 0), len(values) - 1)]
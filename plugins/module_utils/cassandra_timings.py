@@ -0,0 +1,45 @@
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+import threading
+import time
+
+
+_lock = threading.Lock()
+
+
+def record_subprocess_timing(module, tool, command, start, rc):
+    """
+    Records the wall time of a nodetool or cqlsh call that started at
+    start. The timings are returned by the module as subprocess_timings,
+    i.e.
+
+    [ { "tool": "nodetool", "command": "getcompactionthroughput",
+        "start": 1700000000.12, "elapsed": 1.532, "rc": 0 } ]
+
+    and are read by the community.cassandra.cassandra_profile callback.
+    Does nothing unless the subprocess_timings option of the module is
+    set. exit_json and fail_json are then wrapped on the first call to
+    return the timings. command must not hold credentials.
+    """
+    if not module.params.get('subprocess_timings'):
+        return
+    timing = dict(tool=tool,
+                  command=command,
+                  start=round(start, 3),
+                  elapsed=round(time.time() - start, 3),
+                  rc=rc)
+    with _lock:
+        if not hasattr(module, '_subprocess_timings'):
+            module._subprocess_timings = []
+            for name in ('exit_json', 'fail_json'):
+                setattr(module, name, _with_timings(module, getattr(module, name)))
+        module._subprocess_timings.append(timing)
+
+
+def _with_timings(module, method):
+    def wrapper(**kwargs):
+        if 'subprocess_timings' not in kwargs:
+            with _lock:
+                kwargs['subprocess_timings'] = list(module._subprocess_timings)
+        return method(**kwargs)
+    return wrapper
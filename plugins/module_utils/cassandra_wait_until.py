@@ -0,0 +1,270 @@
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+import re
+import time
+
+
+CONDITION_REGEX = re.compile(r"^\s*(.+?)\s*(<=|>=|==|!=|<|>)\s*(\S+)\s*$")
+
+OPERATORS = {
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+}
+
+
+def wait_until_argument_spec():
+    """
+    Returns a dict containing the options for the modules in this
+    collection that can wait for a condition on the values they return
+    """
+    return dict(
+        wait_until=dict(type='list', elements='str', default=None),
+        wait_timeout=dict(type='int', default=300),
+        poll_interval=dict(type='int', default=1),
+        max_poll_interval=dict(type='int', default=30),
+    )
+
+
+def lookup_path(facts, path):
+    """
+    Returns the value at a dotted path in facts. Keys may contain dots
+    themselves, i.e. keyspace.table, so the longest matching key is used
+    at each level. Raises KeyError(path, found, available) if the path
+    does not exist, where found is the part of the path that exists and
+    available the keys below it.
+    """
+    parts = path.split(".")
+    found = []
+    value = facts
+    while parts:
+        if not isinstance(value, dict):
+            raise KeyError(path, ".".join(found), [])
+        for i in range(len(parts), 0, -1):
+            key = ".".join(parts[:i])
+            if key in value:
+                value = value[key]
+                found.append(key)
+                parts = parts[i:]
+                break
+        else:
+            raise KeyError(path, ".".join(found), sorted(value))
+    return value
+
+
+def parse_value(value):
+    if value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+class WaitCondition(object):
+
+    """
+    A single condition of the form "<path> <operator> <number>",
+    i.e. "thread_pools.MutationStage.pending < 10", or a bare path that
+    must be true, i.e. "no_active_streams". Adds the following methods;
+        - evaluate
+        - distance
+    """
+
+    def __init__(self, condition, option='wait_until'):
+        self.condition = condition
+        self.option = option
+        match = CONDITION_REGEX.match(condition)
+        if match is None:
+            self.path = condition.strip()
+            self.operator = "=="
+            self.value = True
+        else:
+            self.path = match.group(1)
+            self.operator = match.group(2)
+            try:
+                self.value = parse_value(match.group(3))
+            except ValueError:
+                raise ValueError("Invalid value in {0} condition: {1}".format(option, condition))
+        if not self.path or " " in self.path:
+            raise ValueError("Invalid {0} condition: {1}".format(option, condition))
+
+    def evaluate(self, facts, optional=None):
+        """
+        Returns (met, current value). Raises ValueError if the path does not
+        exist unless the missing key is directly below one of the optional
+        paths, i.e. a table without pending compactions is not listed below
+        pending_tables, in which case the value counts as 0.
+        """
+        try:
+            current = lookup_path(facts, self.path)
+        except KeyError as excep:
+            (found, available) = excep.args[1:]
+            if found not in (optional or []):
+                if found:
+                    raise ValueError("Unknown path {0} in {1} condition {2}, keys available below {3}: {4}".format(
+                        self.path, self.option, self.condition, found, ", ".join(available)))
+                raise ValueError("Unknown path {0} in {1} condition {2}, keys available: {3}".format(
+                    self.path, self.option, self.condition, ", ".join(available)))
+            current = False if isinstance(self.value, bool) else 0
+        if current is None:
+            return (False, current)
+        return (OPERATORS[self.operator](current, self.value), current)
+
+    def distance(self, current):
+        """
+        Returns how far a numeric value is from meeting the condition or
+        None if that cannot be measured.
+        """
+        if isinstance(self.value, bool) or isinstance(current, bool) \
+                or not isinstance(current, (int, float)):
+            return None
+        if self.operator in ("<", "<="):
+            return max(current - self.value, 0)
+        if self.operator in (">", ">="):
+            return max(self.value - current, 0)
+        return abs(current - self.value)
+
+
+def parse_wait_conditions(module, option='wait_until'):
+    """
+    Returns a list of WaitCondition from a list of conditions in option
+    or fails the module if one of them is invalid.
+    """
+    conditions = []
+    for condition in module.params[option] or []:
+        try:
+            conditions.append(WaitCondition(condition, option))
+        except ValueError as excep:
+            module.fail_json(msg=str(excep))
+    return conditions
+
+
+class AdaptivePoller(object):
+
+    """
+    Works out how long to sleep between polls. While the values are moving
+    towards the conditions the next poll is timed for about half of the
+    estimated time left, otherwise the interval doubles. The interval always
+    stays between poll_interval and max_poll_interval. Adds the following methods;
+        - next_interval
+    """
+
+    def __init__(self, poll_interval, max_poll_interval):
+        self.min_interval = max(poll_interval, 1)
+        self.max_interval = max(max_poll_interval, self.min_interval)
+        self.interval = self.min_interval
+        self.last = None
+
+    def next_interval(self, distances, now):
+        if self.last is None:
+            self.last = (now, distances)
+            return self.interval
+        estimates = []
+        (last_time, last_distances) = self.last
+        elapsed = now - last_time
+        for (previous, current) in zip(last_distances, distances):
+            if previous is None or current is None or elapsed <= 0:
+                continue
+            rate = (previous - current) / elapsed
+            if rate > 0:
+                estimates.append(current / rate)
+        self.last = (now, distances)
+        if estimates:
+            self.interval = max(estimates) / 2
+        else:
+            self.interval = self.interval * 2
+        self.interval = min(max(self.interval, self.min_interval), self.max_interval)
+        return self.interval
+
+
+def wait_until(module, conditions, get_facts, optional=None):
+    """
+    Calls get_facts() until all conditions are met or wait_timeout expires.
+    optional lists the paths below which a missing key counts as 0. Fails
+    the module if a condition refers to a path that does not exist.
+    Returns a dict of the form
+
+    { "facts": { ... }, "met": True, "polls": 3, "elapsed": 12.4,
+      "conditions": { "thread_pools.MutationStage.pending < 10": 4 } }
+
+    where conditions holds the last value seen for each condition.
+    """
+    poller = AdaptivePoller(module.params['poll_interval'],
+                            module.params['max_poll_interval'])
+    deadline = time.time() + module.params['wait_timeout']
+    start = time.time()
+    polls = 0
+    while True:
+        facts = get_facts()
+        polls += 1
+        met = True
+        values = {}
+        distances = []
+        for condition in conditions:
+            try:
+                (ok, current) = condition.evaluate(facts, optional)
+            except ValueError as excep:
+                module.fail_json(msg=str(excep))
+            met = met and ok
+            values[condition.condition] = current
+            distances.append(condition.distance(current))
+        now = time.time()
+        if met or now >= deadline:
+            break
+        time.sleep(min(poller.next_interval(distances, now), max(deadline - now, 0)))
+    return dict(facts=facts,
+                met=met,
+                polls=polls,
+                elapsed=round(time.time() - start, 2),
+                conditions=values)
+
+
+def run_wait(module, get_stats, result, optional=None, progress=None):
+    """
+    Returns the values of get_stats() for the modules that can wait for
+    conditions on them. get_stats() adds its values to result itself so
+    they are returned on failure too.
+
+        - With wait_until set polls until the conditions are met, sets
+          result['wait'] and fails the module on timeout.
+        - Otherwise calls get_stats() once, or twice rate_interval seconds
+          apart for the modules with that option.
+
+    When progress is given and two or more samples were taken
+    result['progress'] is set to progress(first, last, elapsed).
+    """
+    conditions = parse_wait_conditions(module)
+    samples = []
+
+    def sample():
+        stats = get_stats()
+        if not samples:
+            samples.append((time.time(), stats))
+        else:
+            samples[1:] = [(time.time(), stats)]
+        return stats
+
+    if conditions:
+        wait = wait_until(module, conditions, sample, optional)
+        stats = wait.pop('facts')
+        result['wait'] = wait
+    else:
+        stats = sample()
+        rate_interval = module.params.get('rate_interval') or 0
+        if rate_interval > 0:
+            time.sleep(rate_interval)
+            stats = sample()
+
+    if progress is not None and len(samples) > 1:
+        result['progress'] = progress(samples[0][1], samples[1][1],
+                                      samples[1][0] - samples[0][0])
+
+    if conditions and not result['wait']['met']:
+        result['msg'] = "Timed out after {0} seconds waiting for: {1}".format(
+            module.params['wait_timeout'], ", ".join(module.params['wait_until']))
+        module.fail_json(**result)
+    return stats
@@ -0,0 +1,195 @@
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+import os
+import re
+import subprocess
+import tempfile
+import time
+
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_timings import record_subprocess_timing
+
+
+FIELD_REGEX = re.compile(r"^(Type|Query start time|Protocol version|Generated timestamp|"
+                         r"Generated nowInSeconds|Keyspace|Batch type|Query|Queries|Values)\s*:\s?(.*)$")
+
+TABLE_REGEX = re.compile(r"\b(?:FROM|INTO|UPDATE|TABLE|TRUNCATE)\s+(\"?\w+\"?)(?:\.(\"?\w+\"?))?",
+                         re.IGNORECASE)
+
+
+def fqltool_argument_spec():
+    """
+    Returns a dict containing common options for the modules in this
+    collection that read the full query log with fqltool
+    """
+    return dict(
+        log_dir=dict(type='path', required=True, aliases=['path']),
+        fqltool_path=dict(type='str', default=None),
+        debug=dict(type='bool', default=False),
+        subprocess_timings=dict(type='bool', default=False),
+    )
+
+
+class FqlToolCmd(object):
+    """
+    This is a generic FqlToolCmd class for building and running fqltool
+    commands against the full query log in log_dir. Adds the following methods;
+        - fqltool_cmd
+        - run_command
+        - stream_command
+        - stream_dump
+    """
+
+    def __init__(self, module):
+        self.module = module
+        self.log_dir = module.params['log_dir']
+        self.fqltool_path = module.params['fqltool_path']
+        self.roll_cycle = module.params.get('roll_cycle')
+        self.debug = module.params['debug']
+
+    def fqltool_cmd(self, sub_command, args=None):
+        fqltool = "fqltool"
+        if self.fqltool_path is not None and len(self.fqltool_path) > 0:
+            fqltool = os.path.join(self.fqltool_path, fqltool)
+        cmd = [fqltool, sub_command]
+        if sub_command == "dump" and self.roll_cycle is not None:
+            # Only dump accepts --roll-cycle, replay rejects it
+            cmd += ["--roll-cycle", self.roll_cycle]
+        if args:
+            cmd += args
+        cmd += ["--", self.log_dir]
+        if self.debug:
+            self.module.debug(" ".join(cmd))
+        return cmd
+
+    def run_command(self, sub_command, args=None):
+        start = time.time()
+        (rc, out, err) = self.module.run_command(self.fqltool_cmd(sub_command, args))
+        record_subprocess_timing(self.module, "fqltool", sub_command, start, rc)
+        return (rc, out, err)
+
+    def stream_command(self, sub_command, args=None):
+        """
+        Runs fqltool and yields its stdout line by line as it is produced
+        rather than buffering it like module.run_command does. The return
+        code and stderr are stored in self.rc and self.err once the
+        generator is exhausted.
+        """
+        self.rc = None
+        self.err = ''
+        start = time.time()
+        with tempfile.TemporaryFile() as err_file:
+            proc = subprocess.Popen(self.fqltool_cmd(sub_command, args),
+                                    stdout=subprocess.PIPE,
+                                    stderr=err_file)
+            try:
+                for line in iter(proc.stdout.readline, b''):
+                    yield line.decode('utf-8', 'replace')
+            finally:
+                proc.stdout.close()
+                self.rc = proc.wait()
+                err_file.seek(0)
+                self.err = err_file.read().decode('utf-8', 'replace')
+                record_subprocess_timing(self.module, "fqltool", sub_command, start, self.rc)
+
+    def stream_dump(self):
+        """
+        Yields the records of fqltool dump one at a time
+        """
+        return parse_fqltool_dump(self.stream_command("dump"))
+
+
+def query_table(query, keyspace):
+    """
+    Returns a (keyspace, table) tuple for the object the statement
+    operates on. keyspace is the session keyspace from the log and
+    is used when the statement does not qualify the table.
+    """
+    match = TABLE_REGEX.search(query)
+    if match is None:
+        return (keyspace, None)
+    if match.group(2) is not None:
+        return (match.group(1).strip('"'), match.group(2).strip('"'))
+    return (keyspace, match.group(1).strip('"'))
+
+
+def parse_fqltool_dump(lines):
+    """
+    Parses fqltool dump output one line at a time and yields a dict per
+    logged record, i.e.
+
+    Type: single-query
+    Query start time: 1585755357062
+    Protocol version: 5
+    Generated timestamp:-9223372036854775808
+    Generated nowInSeconds:1585755357
+    Query: SELECT * FROM ks.users WHERE id = 1
+    Values:
+
+    Type: batch
+    Query start time: 1585755418102
+    ...
+    Batch type: UNLOGGED
+    Queries: INSERT INTO ks.users (id) VALUES (2)
+    INSERT INTO ks.users (id) VALUES (3)
+    Values:
+
+    yields
+
+    { "type": "single-query", "start_time": 1585755357062, "keyspace": None,
+      "queries": ["SELECT * FROM ks.users WHERE id = 1"] }
+    { "type": "batch", "start_time": 1585755418102, "keyspace": None,
+      "queries": ["INSERT INTO ks.users (id) VALUES (2)", "INSERT INTO ks.users (id) VALUES (3)"] }
+    """
+    record = None
+    section = None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        match = FIELD_REGEX.match(line)
+        if match is not None:
+            field, value = match.group(1), match.group(2).strip()
+            if field == "Type":
+                if record is not None:
+                    yield record
+                record = dict(type=value, start_time=None, keyspace=None, queries=[])
+                section = None
+            elif record is None:
+                continue
+            elif field == "Query start time":
+                try:
+                    record['start_time'] = int(value)
+                except ValueError:
+                    pass
+            elif field == "Keyspace":
+                record['keyspace'] = value or None
+            elif field in ("Query", "Queries"):
+                section = field
+                if value:
+                    record['queries'].append(value)
+            elif field == "Values":
+                section = "Values"
+            else:
+                section = None
+        elif record is not None and line.strip() and not line.startswith("---"):
+            if section == "Query" and record['queries']:
+                record['queries'][-1] += " " + line.strip()  # multi-line statement
+            elif section in ("Query", "Queries"):
+                record['queries'].append(line.strip())
+    if record is not None:
+        yield record
+
+
+def write_report_file(module, path, content):
+    """
+    Atomically writes content to path. Returns False if the file
+    already has the same content.
+    """
+    if os.path.exists(path):
+        with open(path) as f:
+            if f.read() == content:
+                return False
+    if not module.check_mode:
+        (fd, tmp) = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)))
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+        module.atomic_move(tmp, path)
+    return True
@@ -1,6 +1,12 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
+import shlex
 import socket
+import subprocess
+import tempfile
+import time
+
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_timings import record_subprocess_timing
 
 
 class NodeToolCmd(object):
@@ -19,6 +25,7 @@ class NodeToolCmd(object):
         self.nodetool_flags = module.params['nodetool_flags']
         self.debug = module.params['debug']
         self.cassandra_version = module.params['cassandra_version']
+        self.sub_commands = {}  # built command: sub command, for timings without credentials
         if self.host is None:
             self.host = socket.getfqdn()
         if self.cassandra_version is None:
@@ -30,9 +37,59 @@ class NodeToolCmd(object):
                 module.fail_json(msg="Unable to determine Cassandra version", stderr=err)
 
     def execute_command(self, cmd):
-        return self.module.run_command(cmd)
+        start = time.time()
+        (rc, out, err) = self.module.run_command(cmd)
+        record_subprocess_timing(self.module, "nodetool", self.sub_commands.get(cmd, "nodetool"), start, rc)
+        return (rc, out, err)
 
     def nodetool_cmd(self, sub_command):
+        return self.execute_command(self.build_nodetool_cmd(sub_command))
+
+    def stream_nodetool_cmd(self, sub_command):
+        """
+        Runs nodetool and yields its stdout line by line as it is produced.
+        Used for commands whose output grows with the number of tables.
+        module.run_command cannot be used as it only returns once the
+        process has exited, with all of its output held in memory. The
+        return code and stderr are stored in self.rc and self.err once the
+        generator is exhausted. Fails the module like module.run_command
+        if nodetool cannot be started, without the JMX password in the
+        error.
+        """
+        self.rc = None
+        self.err = ''
+        cmd = self.build_nodetool_cmd(sub_command)
+        start = time.time()
+        with tempfile.TemporaryFile() as err_file:
+            try:
+                proc = subprocess.Popen(shlex.split(cmd),
+                                        stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE,
+                                        stderr=err_file,
+                                        close_fds=True)
+            except (OSError, IOError) as excep:
+                self.module.fail_json(rc=excep.errno, stdout='', stderr='',
+                                      msg=str(excep), cmd=self.clean_nodetool_cmd(cmd))
+            proc.stdin.close()
+            try:
+                for line in iter(proc.stdout.readline, b''):
+                    yield line.decode('utf-8', 'replace')
+            finally:
+                proc.stdout.close()
+                self.rc = proc.wait()
+                err_file.seek(0)
+                self.err = err_file.read().decode('utf-8', 'replace')
+                record_subprocess_timing(self.module, "nodetool", sub_command.strip(), start, self.rc)
+
+    def clean_nodetool_cmd(self, cmd):
+        """
+        Returns cmd with the JMX password masked, for error messages
+        """
+        if self.username is not None and self.password_file is None:
+            cmd = cmd.replace(" --password '{0}'".format(self.password), " --password '********'")
+        return cmd
+
+    def build_nodetool_cmd(self, sub_command):
         if self.nodetool_path is not None and len(self.nodetool_path) > 0:
             if not self.nodetool_path.endswith('/'):  # replace with os.path.join
                 self.nodetool_path += '/'
@@ -50,9 +107,10 @@ class NodeToolCmd(object):
                 cmd += " --password '{0}'".format(self.password)
         # The thing we want nodetool to execute
         cmd += " {0}".format(sub_command)
+        self.sub_commands[cmd] = sub_command.strip()
         if self.debug:
             self.module.debug(cmd)
-        return self.execute_command(cmd)
+        return cmd
 
 
 class NodeToolCommandSimple(NodeToolCmd):
@@ -223,3 +281,13 @@ class NodeToolCommandKeyspaceTableNumJobs(NodeToolCmd):
 
     def run_command(self):
         return self.nodetool_cmd(self.cmd)
+
+
+def nodetool_for_host(module, host):
+    """
+    Returns a NodeToolCmd that runs nodetool against host rather than
+    the host option, i.e. against other nodes of the cluster over JMX
+    """
+    n = NodeToolCmd(module)
+    n.host = host
+    return n
@@ -0,0 +1,282 @@
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+import contextlib
+import errno
+import fcntl
+import json
+import os
+import shlex
+import signal
+import subprocess
+import tempfile
+import time
+
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_parsers import parse_compactionstats
+
+
+# operation: (nodetool stop type, compaction types in nodetool compactionstats)
+JOB_OPERATIONS = {
+    'compact': ('COMPACTION', ['Compaction']),
+    'cleanup': ('CLEANUP', ['Cleanup']),
+    'verify': ('VERIFY', ['Verify']),
+    'upgradesstables': ('UPGRADE_SSTABLES', ['Upgrade sstables']),
+    'garbagecollect': ('GARBAGE_COLLECT', ['Remove deleted data', 'Garbage collect']),
+}
+
+OUTPUT_TAIL_BYTES = 4096
+
+
+def nodetool_job_argument_spec():
+    """
+    Returns a dict containing the options for the modules in this
+    collection that can run their nodetool command as a detached job
+    """
+    return dict(
+        state=dict(type='str', choices=['started', 'status', 'cancelled'], default=None),
+        job_file=dict(type='path', default=None),
+    )
+
+
+def write_job_file(job_file, job):
+    '''
+    Writes the job record atomically. Does not use the module as the
+    detached process outlives it.
+    '''
+    (fd, tmp_path) = tempfile.mkstemp(dir=os.path.dirname(job_file) or ".")
+    with os.fdopen(fd, 'w') as f:
+        f.write(json.dumps(job, indent=2, sort_keys=True))
+    os.rename(tmp_path, job_file)
+
+
+@contextlib.contextmanager
+def job_file_lock(job_file):
+    '''
+    Holds an exclusive lock for the read-modify-write of the job record by
+    the module and the detached process. The lock is taken on a separate
+    file as the job file is replaced on every write.
+    '''
+    with open("{0}.lock".format(job_file), 'a') as lock:
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+
+def read_job_file(job_file):
+    if not os.path.exists(job_file):
+        return None
+    with open(job_file) as f:
+        return json.load(f)
+
+
+def pid_alive(pid):
+    '''
+    Returns whether the nodetool process pid is still running
+    '''
+    try:
+        os.kill(pid, 0)
+    except OSError as excep:
+        if excep.errno != errno.EPERM:
+            return False
+    cmdline = "/proc/{0}/cmdline".format(pid)
+    if os.path.exists("/proc/self"):  # guards against a reused pid
+        try:
+            with open(cmdline, 'rb') as f:
+                return b"nodetool" in f.read()
+        except IOError:
+            return False
+    return True
+
+
+def output_tail(output_file):
+    try:
+        with open(output_file, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(f.tell() - OUTPUT_TAIL_BYTES, 0))
+            return f.read().decode('utf-8', 'replace')
+    except IOError:
+        return ''
+
+
+def run_detached(cmd, job, job_file, write_fd):
+    '''
+    Runs in the detached process. Starts nodetool, passes the job record
+    back to the module through write_fd and records the return code in
+    the job file once nodetool exits.
+    '''
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    with open(job['output_file'], 'wb') as out:
+        try:
+            proc = subprocess.Popen(shlex.split(cmd), stdin=devnull, stdout=out,
+                                    stderr=subprocess.STDOUT, close_fds=True)
+        except OSError as excep:
+            os.write(write_fd, json.dumps(dict(error=str(excep))).encode('utf-8'))
+            return
+        job['pid'] = proc.pid
+        with job_file_lock(job_file):
+            write_job_file(job_file, job)
+        os.write(write_fd, json.dumps(job).encode('utf-8'))
+        os.close(write_fd)
+        rc = proc.wait()
+    with job_file_lock(job_file):
+        job = read_job_file(job_file) or job  # keeps cancelled
+        job['rc'] = rc
+        job['end_time'] = round(time.time(), 3)
+        write_job_file(job_file, job)
+
+
+def start_job(module, n, operation, sub_command, job_file):
+    '''
+    Starts nodetool sub_command in a process detached from the module with
+    a double fork so it survives the end of the task and the connection.
+    Returns the job record.
+    '''
+    cmd = n.build_nodetool_cmd(sub_command)
+    job = dict(operation=operation,
+               command=sub_command,
+               host=n.host,
+               start_time=round(time.time(), 3),
+               end_time=None,
+               rc=None,
+               cancelled=False,
+               output_file="{0}.out".format(job_file))
+    (read_fd, write_fd) = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        os.setsid()
+        if os.fork() != 0:
+            os._exit(0)
+        try:
+            run_detached(cmd, job, job_file, write_fd)
+        finally:
+            os._exit(0)
+    os.close(write_fd)
+    os.waitpid(pid, 0)
+    data = b""
+    while True:
+        chunk = os.read(read_fd, 4096)
+        if not chunk:
+            break
+        data += chunk
+    os.close(read_fd)
+    try:
+        started = json.loads(data.decode('utf-8'))
+    except ValueError:
+        module.fail_json(msg="Unable to start nodetool {0}".format(operation))
+    if 'error' in started:
+        module.fail_json(msg="Unable to start nodetool {0}: {1}".format(operation, started['error']))
+    return started
+
+
+def job_status(job):
+    '''
+    Adds running and elapsed to the job record and the tail of its output
+    '''
+    job['running'] = job['rc'] is None and pid_alive(job['pid'])
+    end_time = job['end_time'] or time.time()
+    job['elapsed'] = round(end_time - job['start_time'], 1)
+    job['output'] = output_tail(job['output_file'])
+    return job
+
+
+def job_progress(n, operation):
+    '''
+    Returns the progress of the operation from nodetool compactionstats, i.e.
+
+    { "active": 2, "completed_bytes": 1048576, "total_bytes": 4194304,
+      "progress": 25.0, "remaining_time_seconds": 35 }
+    '''
+    (rc, out, err) = n.nodetool_cmd("compactionstats")
+    if rc != 0:
+        return None
+    stats = parse_compactionstats(out)
+    active = [c for c in stats['active_compactions'] if c['compaction_type'] in JOB_OPERATIONS[operation][1]]
+    completed = sum(c['completed'] or 0 for c in active if c['unit'] == "bytes")
+    total = sum(c['total'] or 0 for c in active if c['unit'] == "bytes")
+    progress = dict(active=len(active),
+                    completed_bytes=completed,
+                    total_bytes=total,
+                    progress=None,
+                    remaining_time_seconds=stats['remaining_time_seconds'])
+    if total > 0:
+        progress['progress'] = round(completed * 100.0 / total, 2)
+    return progress
+
+
+def run_nodetool_job(module, n, operation, sub_command):
+    '''
+    Starts, reports on or cancels nodetool sub_command as a detached job
+    according to the state option and exits the module.
+
+        - started runs the command unless the job is already running.
+        - status returns the job and its progress from nodetool compactionstats.
+        - cancelled runs nodetool stop for the operation type and ends the
+          nodetool process of the job.
+    '''
+    state = module.params['state']
+    job_file = module.params['job_file']
+    if job_file is None:
+        job_file = "/var/tmp/cassandra_{0}.job".format(operation)
+    result = dict(changed=False, job_file=job_file)
+
+    try:
+        job = read_job_file(job_file)
+    except (IOError, ValueError) as excep:
+        module.fail_json(msg="Unable to read {0}: {1}".format(job_file, excep), **result)
+    if job is not None:
+        job = job_status(job)
+
+    if state == "started":
+        if job is not None and job['running']:
+            result['msg'] = "nodetool {0} is already running".format(operation)
+        elif module.check_mode:
+            result['changed'] = True
+            result['msg'] = "nodetool {0} started (check mode)".format(operation)
+        else:
+            job = job_status(start_job(module, n, operation, sub_command, job_file))
+            result['changed'] = True
+            result['msg'] = "nodetool {0} started".format(operation)
+    elif job is None:
+        module.fail_json(msg="No nodetool {0} job found in {1}".format(operation, job_file), **result)
+    elif state == "cancelled":
+        if not job['running']:
+            result['msg'] = "nodetool {0} is not running".format(operation)
+        elif module.check_mode:
+            result['changed'] = True
+            result['msg'] = "nodetool {0} cancelled (check mode)".format(operation)
+        else:
+            (rc, out, err) = n.nodetool_cmd("stop -- {0}".format(JOB_OPERATIONS[operation][0]))
+            if rc != 0:
+                result['msg'] = "nodetool error: {0}".format(err)
+                result['rc'] = rc
+                module.fail_json(**result)
+            for i in range(10):
+                if not pid_alive(job['pid']):
+                    break
+                time.sleep(1)
+            else:
+                os.kill(job['pid'], signal.SIGTERM)
+            with job_file_lock(job_file):
+                job = read_job_file(job_file)
+                job['cancelled'] = True
+                write_job_file(job_file, job)
+            job = job_status(job)
+            result['changed'] = True
+            result['msg'] = "nodetool {0} cancelled".format(operation)
+    elif job['running']:
+        result['msg'] = "nodetool {0} is running".format(operation)
+    elif job['rc'] is None:
+        result['msg'] = "nodetool {0} ended without recording its return code".format(operation)
+    else:
+        result['msg'] = "nodetool {0} finished with rc {1}".format(operation, job['rc'])
+
+    result['job'] = job
+    if job is not None and job['running']:
+        result['progress'] = job_progress(n, operation)
+    if state == "status" and job['rc'] not in (None, 0) and not job['cancelled']:
+        module.fail_json(**result)
+    module.exit_json(**result)
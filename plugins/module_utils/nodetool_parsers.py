@@ -0,0 +1,716 @@
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+import re
+
+
+PENDING_REGEX = re.compile(r"^pending tasks:\s*(\d+)")
+
+PENDING_TABLE_REGEX = re.compile(r"^-\s+(\S+):\s+(\d+)\s*$")
+
+REMAINING_TIME_REGEX = re.compile(r"^Active compaction remaining time\s*:\s*(\d+)h(\d+)m(\d+)s")
+
+
+def to_number(value):
+    try:
+        return int(value)
+    except ValueError:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+
+
+def parse_compactionstats(stdout):
+    '''
+    Parses the nodetool compactionstats stdout, i.e.
+
+    pending tasks: 5
+    - myapp.users: 3
+    - myapp.orders: 2
+
+    id                                   compaction type keyspace table completed total  unit  progress
+    4e5b6c30-7f2e-11ee-b962-0242ac120002 Compaction      myapp    users 1234      567890 bytes 0.22%
+    Active compaction remaining time :   0h00m05s
+
+    Returns a dict in the format of the compactionstats return value.
+    The compaction type may contain spaces so the columns of an active
+    compaction are read from both ends.
+    '''
+    pending = 0
+    pending_tables = {}
+    active_compactions = []
+    remaining_time_seconds = None
+    in_active = False
+    for line in stdout.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        match = PENDING_REGEX.match(line)
+        if match is not None:
+            pending = int(match.group(1))
+            continue
+        match = PENDING_TABLE_REGEX.match(line)
+        if match is not None:
+            pending_tables[match.group(1)] = int(match.group(2))
+            continue
+        match = REMAINING_TIME_REGEX.match(line)
+        if match is not None:
+            (h, m, s) = [int(g) for g in match.groups()]
+            remaining_time_seconds = h * 3600 + m * 60 + s
+            in_active = False
+            continue
+        if "compaction type" in line and line.startswith("id"):
+            in_active = True
+            continue
+        fields = line.split()
+        if in_active and len(fields) >= 8:
+            progress = fields[-1].rstrip("%")
+            active_compactions.append(dict(id=fields[0],
+                                           compaction_type=" ".join(fields[1:-6]),
+                                           keyspace=fields[-6],
+                                           table=fields[-5],
+                                           completed=to_number(fields[-4]),
+                                           total=to_number(fields[-3]),
+                                           unit=fields[-2],
+                                           progress=to_number(progress)))
+
+    remaining_bytes = 0
+    for c in active_compactions:
+        if c['unit'] == "bytes" and c['completed'] is not None and c['total'] is not None:
+            remaining_bytes += max(c['total'] - c['completed'], 0)
+
+    return dict(pending=pending,
+                pending_tables=pending_tables,
+                active_compactions=active_compactions,
+                active_count=len(active_compactions),
+                remaining_bytes=remaining_bytes,
+                remaining_time_seconds=remaining_time_seconds)
+
+
+COLUMNS = {
+    "Read Latency": "read_latency",
+    "Write Latency": "write_latency",
+    "Range Latency": "range_latency",
+    "CAS Read Latency": "cas_read_latency",
+    "CAS Write Latency": "cas_write_latency",
+    "View Write Latency": "view_write_latency",
+    "SSTables": "sstables",
+    "Partition Size": "partition_size",
+    "Cell Count": "cell_count",
+}
+
+# Longest labels first so "CAS Read Latency" is not read as "Read Latency"
+COLUMN_REGEX = re.compile("|".join(re.escape(c) for c in sorted(COLUMNS, key=len, reverse=True)))
+
+PERCENTILES = {
+    "50%": "p50",
+    "75%": "p75",
+    "95%": "p95",
+    "98%": "p98",
+    "99%": "p99",
+    "Min": "min",
+    "Max": "max",
+}
+
+
+def parse_histograms(stdout):
+    '''
+    Parses the nodetool proxyhistograms or tablehistograms stdout, i.e.
+
+    proxy histograms
+    Percentile       Read Latency      Write Latency      Range Latency   CAS Read Latency  CAS Write Latency View Write Latency
+                         (micros)           (micros)           (micros)           (micros)           (micros)           (micros)
+    50%                    315.85             379.02            1358.10               0.00               0.00               0.00
+    ...
+    Max                   3379.39            2346.80            2816.16               0.00               0.00               0.00
+
+    Returns a dict in the following format...
+        {
+            "read_latency": { "p50": 315.85, ..., "max": 3379.39 },
+            "write_latency": { "p50": 379.02, ..., "max": 2346.8 },
+            ...
+        }
+    '''
+    columns = None
+    histograms = {}
+    for line in stdout.splitlines():
+        if line.startswith("Percentile"):
+            columns = [COLUMNS[c] for c in COLUMN_REGEX.findall(line)]
+            histograms = dict((c, {}) for c in columns)
+            continue
+        fields = line.split()
+        if columns is None or not fields or fields[0] not in PERCENTILES:
+            continue
+        values = fields[1:]
+        if len(values) != len(columns):
+            continue
+        for (column, value) in zip(columns, values):
+            histograms[column][PERCENTILES[fields[0]]] = to_number(value)
+    return histograms
+
+
+MODE_REGEX = re.compile(r"^Mode:\s*(\S+)")
+
+SESSION_REGEX = re.compile(r"^(\S.*?)\s+([0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})\s*$")
+
+PEER_REGEX = re.compile(r"^\s+(?:\S*/)?(\d[\w.:\[\]]*|\[[\w:]+\](?::\d+)?)\s*$")
+
+STREAM_REGEX = re.compile(r"^\s+(Receiving|Sending) (\d+) files, (\d+) bytes total\. "
+                          r"Already (?:received|sent) (\d+) files(?: \([\d.]+%\))?, (\d+) bytes total")
+
+READ_REPAIR_FIELDS = {
+    "Attempted": "attempted",
+    "Mismatch (Blocking)": "mismatch_blocking",
+    "Mismatch (Background)": "mismatch_background",
+}
+
+MESSAGE_POOL_FIELDS = ["active", "pending", "completed", "dropped"]
+
+
+def parse_netstats(stdout):
+    '''
+    Parses the nodetool netstats stdout, i.e.
+
+    Mode: NORMAL
+    Rebuild 0b3bc9e0-7f2e-11ee-b962-0242ac120002
+        /10.0.0.2
+            Receiving 12 files, 123456789 bytes total. Already received 3 files (25.00%), 30000000 bytes total
+                /var/lib/cassandra/data/myapp/users/nb-1-big-Data.db 1000/2000 bytes (50%) received from idx:0/10.0.0.2
+    Read Repair Statistics:
+    Attempted: 0
+    Mismatch (Blocking): 0
+    Mismatch (Background): 0
+    Pool Name                    Active   Pending      Completed   Dropped
+    Large messages                  n/a         0              0         0
+
+    Returns a dict in the following format...
+        {
+            "mode": "NORMAL",
+            "sessions": [ { "plan_id": "0b3bc9e0-...", "operation": "Rebuild",
+                            "peers": [ { "peer": "10.0.0.2",
+                                         "receiving": { "files_total": 12, "bytes_total": 123456789,
+                                                        "files_done": 3, "bytes_done": 30000000 } } ] } ],
+            "bytes_total": 123456789, "bytes_done": 30000000, "bytes_remaining": 93456789,
+            "no_active_streams": False,
+            "read_repair": { "attempted": 0, "mismatch_blocking": 0, "mismatch_background": 0 },
+            "message_pools": { "Large messages": { "active": None, "pending": 0, "completed": 0, "dropped": 0 } }
+        }
+    '''
+    mode = None
+    sessions = []
+    session = None
+    peer = None
+    read_repair = {}
+    message_pools = {}
+    in_pools = False
+    for line in stdout.splitlines():
+        if not line.strip():
+            continue
+        match = MODE_REGEX.match(line)
+        if match is not None:
+            mode = match.group(1)
+            continue
+        if line.startswith("Pool Name"):
+            in_pools = True
+            continue
+        if in_pools:
+            fields = line.split()
+            if len(fields) > len(MESSAGE_POOL_FIELDS):
+                name = " ".join(fields[:-len(MESSAGE_POOL_FIELDS)])
+                message_pools[name] = dict(zip(MESSAGE_POOL_FIELDS,
+                                               [to_number(v) for v in fields[-len(MESSAGE_POOL_FIELDS):]]))
+            continue
+        if ":" in line and line.split(":", 1)[0].strip() in READ_REPAIR_FIELDS:
+            (label, value) = line.split(":", 1)
+            read_repair[READ_REPAIR_FIELDS[label.strip()]] = to_number(value.strip())
+            continue
+        match = SESSION_REGEX.match(line)
+        if match is not None:
+            session = dict(operation=match.group(1), plan_id=match.group(2), peers=[])
+            sessions.append(session)
+            peer = None
+            continue
+        match = STREAM_REGEX.match(line)
+        if match is not None and peer is not None:
+            direction = "receiving" if match.group(1) == "Receiving" else "sending"
+            peer[direction] = dict(files_total=int(match.group(2)),
+                                   bytes_total=int(match.group(3)),
+                                   files_done=int(match.group(4)),
+                                   bytes_done=int(match.group(5)))
+            continue
+        match = PEER_REGEX.match(line)
+        if match is not None and session is not None:
+            peer = dict(peer=match.group(1))
+            session['peers'].append(peer)
+
+    bytes_total = 0
+    bytes_done = 0
+    for s in sessions:
+        for p in s['peers']:
+            for direction in ("receiving", "sending"):
+                if direction in p:
+                    bytes_total += p[direction]['bytes_total']
+                    bytes_done += min(p[direction]['bytes_done'], p[direction]['bytes_total'])
+
+    return dict(mode=mode,
+                sessions=sessions,
+                bytes_total=bytes_total,
+                bytes_done=bytes_done,
+                bytes_remaining=bytes_total - bytes_done,
+                no_active_streams=not sessions or (bytes_total > 0 and bytes_total == bytes_done),
+                read_repair=read_repair,
+                message_pools=message_pools)
+
+
+POOL_FIELDS = ["active", "pending", "completed", "blocked", "all_time_blocked"]
+
+LATENCY_FIELDS = ["p50", "p95", "p99", "max"]
+
+
+def parse_tpstats(stdout):
+    '''
+    Parses the nodetool tpstats stdout, i.e.
+
+    Pool Name                         Active   Pending      Completed   Blocked  All time blocked
+    MutationStage                          0         0           2044         0                 0
+    ReadStage                              0         0            147         0                 0
+
+    Message type           Dropped                  Latency waiting in queue (micros)
+                                                 50%               95%               99%               Max
+    READ                         0                  0.00              0.00              0.00              0.00
+    MUTATION                     0                  0.00              0.00              0.00              0.00
+
+    Returns a dict in the format of the tpstats return value.
+    '''
+    thread_pools = {}
+    dropped_messages = {}
+    message_latency = {}
+    section = None
+    for line in stdout.splitlines():
+        if not line.strip():
+            continue
+        if line.startswith("Pool Name"):
+            section = "pools"
+            continue
+        if line.startswith("Message type"):
+            section = "dropped"
+            continue
+        if line[0].isspace():
+            continue  # Latency percentile header
+        fields = line.split()
+        if section == "pools" and len(fields) > len(POOL_FIELDS):
+            name = " ".join(fields[:-len(POOL_FIELDS)])
+            values = [to_number(v) for v in fields[-len(POOL_FIELDS):]]
+            thread_pools[name] = dict(zip(POOL_FIELDS, values))
+        elif section == "dropped" and len(fields) >= 2:
+            dropped_messages[fields[0]] = to_number(fields[1])
+            if len(fields) == 2 + len(LATENCY_FIELDS):
+                message_latency[fields[0]] = dict(zip(LATENCY_FIELDS,
+                                                      [to_number(v) for v in fields[2:]]))
+
+    totals = dict((f, 0) for f in ["active", "pending", "blocked", "all_time_blocked"])
+    for pool in thread_pools.values():
+        for f in totals:
+            totals[f] += pool[f] or 0
+    totals['dropped'] = sum(d or 0 for d in dropped_messages.values())
+
+    tpstats = dict(thread_pools=thread_pools,
+                   dropped_messages=dropped_messages,
+                   totals=totals)
+    if message_latency:
+        tpstats['message_latency'] = message_latency
+    return tpstats
+
+
+TABLE_FIELDS = {
+    "SSTable count": "sstable_count",
+    "Space used (live)": "space_used_live",
+    "Space used (total)": "space_used_total",
+    "Space used by snapshots (total)": "space_used_by_snapshots",
+    "Number of partitions (estimate)": "number_of_partitions",
+    "Local read count": "local_read_count",
+    "Local read latency": "local_read_latency_ms",
+    "Local write count": "local_write_count",
+    "Local write latency": "local_write_latency_ms",
+    "Pending flushes": "pending_flushes",
+    "Percent repaired": "percent_repaired",
+    "Compacted partition minimum bytes": "partition_size_min",
+    "Compacted partition maximum bytes": "partition_size_max",
+    "Compacted partition mean bytes": "partition_size_mean",
+    "Average live cells per slice (last five minutes)": "avg_live_cells_per_slice",
+    "Maximum live cells per slice (last five minutes)": "max_live_cells_per_slice",
+    "Average tombstones per slice (last five minutes)": "avg_tombstones_per_slice",
+    "Maximum tombstones per slice (last five minutes)": "max_tombstones_per_slice",
+    "Bloom filter false positives": "bloom_filter_false_positives",
+    "Bloom filter false ratio": "bloom_filter_false_ratio",
+    "SSTable Compression Ratio": "sstable_compression_ratio",
+    "Dropped Mutations": "dropped_mutations",
+    "Droppable tombstone ratio": "droppable_tombstone_ratio",
+}
+
+
+def parse_value(value):
+    value = value.strip()
+    if value.endswith(" ms"):
+        value = value[:-3]
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        value = float(value)
+    except ValueError:
+        return value
+    if value != value:  # NaN
+        return None
+    return value
+
+
+def parse_tablestats(lines):
+    '''
+    Parses nodetool tablestats output one line at a time and yields a
+    record per table, i.e.
+
+    Keyspace : myapp
+            Read Count: 310
+            ...
+                    Table: users
+                    SSTable count: 4
+                    Space used (live): 1048576
+                    ...
+                    Local read latency: 0.250 ms
+                    ...
+
+    ----------------
+
+    Only the fields in TABLE_FIELDS are kept.
+    '''
+    keyspace = None
+    record = None
+    for line in lines:
+        line = line.strip()
+        if line.startswith("----"):
+            if record is not None:
+                yield record
+            record = None
+            continue
+        if ":" not in line:
+            continue
+        (label, value) = line.split(":", 1)
+        label = label.strip()
+        if label == "Keyspace":
+            if record is not None:
+                yield record
+            record = None
+            keyspace = value.strip()
+        elif label in ("Table", "Table (index)"):
+            if record is not None:
+                yield record
+            record = dict(keyspace=keyspace, table=value.strip())
+        elif record is not None and label in TABLE_FIELDS:
+            record[TABLE_FIELDS[label]] = parse_value(value)
+    if record is not None:
+        yield record
+
+
+SIZE_UNITS = {
+    "bytes": 1,
+    "KB": 1000, "MB": 1000 ** 2, "GB": 1000 ** 3, "TB": 1000 ** 4,
+    "KiB": 1024, "MiB": 1024 ** 2, "GiB": 1024 ** 3, "TiB": 1024 ** 4,
+}
+
+
+def parse_size(value):
+    '''
+    Returns a size as printed by nodetool, i.e. 145.17 KiB, in bytes
+    '''
+    fields = value.split()
+    if len(fields) != 2 or fields[1] not in SIZE_UNITS:
+        return None
+    number = to_number(fields[0])
+    if number is None or number != number:
+        return None
+    return int(number * SIZE_UNITS[fields[1]])
+
+
+CACHE_FIELDS = {
+    "entries": "entries",
+    "size": "size_bytes",
+    "capacity": "capacity_bytes",
+    "hits": "hits",
+    "misses": "misses",
+    "requests": "requests",
+    "recent hit rate": "recent_hit_rate",
+    "save period in seconds": "save_period_seconds",
+    "microseconds miss latency": "miss_latency_micros",
+}
+
+
+def parse_cache(value):
+    '''
+    Parses a cache line of nodetool info, i.e.
+
+    entries 10, size 896 bytes, capacity 24 MiB, 48 hits, 62 requests, 0.774 recent hit rate, 14400 save period in seconds
+
+    NaN is returned as None.
+    '''
+    cache = {}
+    for part in value.split(","):
+        part = part.strip()
+        (first, rest) = (part.split(" ", 1) + [""])[:2]
+        if first in ("entries", "size", "capacity"):
+            (label, number) = (first, rest)
+        else:
+            (label, number) = (rest, first)
+        if label not in CACHE_FIELDS:
+            continue
+        if label in ("size", "capacity"):
+            cache[CACHE_FIELDS[label]] = parse_size(number)
+        else:
+            number = to_number(number)
+            if number is not None and number != number:  # NaN
+                number = None
+            cache[CACHE_FIELDS[label]] = number
+    return cache
+
+
+INFO_FIELDS = {
+    "ID": "id",
+    "Gossip active": "gossip_active",
+    "Thrift active": "thrift_active",
+    "Native Transport active": "native_transport_active",
+    "Load": "load_bytes",
+    "Uncompressed load": "uncompressed_load_bytes",
+    "Generation No": "generation_no",
+    "Uptime (seconds)": "uptime_seconds",
+    "Heap Memory (MB)": "heap_memory_mb",
+    "Off Heap Memory (MB)": "off_heap_memory_mb",
+    "Data Center": "data_center",
+    "Rack": "rack",
+    "Exceptions": "exceptions",
+    "Key Cache": "key_cache",
+    "Row Cache": "row_cache",
+    "Counter Cache": "counter_cache",
+    "Chunk Cache": "chunk_cache",
+    "Network Cache": "network_cache",
+    "Percent Repaired": "percent_repaired",
+    "Bootstrap state": "bootstrap_state",
+    "Bootstrap failed": "bootstrap_failed",
+    "Decommissioning": "decommissioning",
+    "Decommission failed": "decommission_failed",
+}
+
+
+def parse_info(stdout):
+    '''
+    Parses the nodetool info stdout, i.e.
+
+    ID                     : f4ee490c-df8e-4a8d-9236-320903697fbf
+    Gossip active          : true
+    Native Transport active: true
+    Load                   : 145.17 KiB
+    Generation No          : 1638800353
+    Uptime (seconds)       : 225798
+    Heap Memory (MB)       : 258.26 / 495.00
+    Off Heap Memory (MB)   : 0.00
+    Data Center            : datacenter1
+    Rack                   : rack1
+    Exceptions             : 10
+    Key Cache              : entries 10, size 896 bytes, capacity 24 MiB, 48 hits, 62 requests, 0.774 recent hit rate, 14400 save period in seconds
+    Row Cache              : entries 0, size 0 bytes, capacity 0 bytes, 0 hits, 0 requests, NaN recent hit rate, 0 save period in seconds
+    Counter Cache          : entries 0, size 0 bytes, capacity 12 MiB, 0 hits, 0 requests, NaN recent hit rate, 7200 save period in seconds
+    Chunk Cache            : entries 21, size 1.31 MiB, capacity 91 MiB, 60 misses, 306 requests, 0.804 recent hit rate, NaN microseconds miss latency
+    Percent Repaired       : 100.0%
+    Token                  : -6148914691236517206
+
+    Returns a dict in the following format...
+        {
+            "id": "f4ee490c-df8e-4a8d-9236-320903697fbf", "gossip_active": True,
+            "native_transport_active": True, "load_bytes": 148654, "generation_no": 1638800353,
+            "uptime_seconds": 225798, "heap_memory_mb": { "used": 258.26, "total": 495.0 },
+            "off_heap_memory_mb": 0.0, "data_center": "datacenter1", "rack": "rack1", "exceptions": 10,
+            "key_cache": { "entries": 10, "size_bytes": 896, "capacity_bytes": 25165824, "hits": 48,
+                           "requests": 62, "recent_hit_rate": 0.774, "save_period_seconds": 14400 },
+            ...
+            "percent_repaired": 100.0, "tokens": [ "-6148914691236517206" ]
+        }
+
+    Labels nodetool adds in other versions are kept when listed in INFO_FIELDS.
+    '''
+    info = dict(tokens=[])
+    for line in stdout.splitlines():
+        if ":" not in line:
+            continue
+        (label, value) = line.split(":", 1)
+        label = label.strip()
+        value = value.strip()
+        if label == "Token":
+            if not value.startswith("("):  # (invoke with -T/--tokens to see all 16 tokens)
+                info['tokens'].append(value)
+            continue
+        if label not in INFO_FIELDS:
+            continue
+        key = INFO_FIELDS[label]
+        if key.endswith("_cache"):
+            info[key] = parse_cache(value)
+        elif key.endswith("_bytes"):
+            info[key] = parse_size(value)
+        elif key == "heap_memory_mb":
+            (used, total) = (value.split("/") + [""])[:2]
+            info[key] = dict(used=to_number(used.strip()), total=to_number(total.strip()))
+        elif key == "percent_repaired":
+            info[key] = to_number(value.rstrip("%"))
+        elif value in ("true", "false"):
+            info[key] = value == "true"
+        elif key in ("id", "data_center", "rack", "bootstrap_state"):
+            info[key] = value
+        else:
+            number = to_number(value)
+            info[key] = number if number is not None else value
+    return info
+
+
+GCSTATS_FIELDS = ["interval_ms", "max_gc_elapsed_ms", "total_gc_elapsed_ms", "stdev_gc_elapsed_ms",
+                  "gc_reclaimed_bytes", "collections", "direct_memory_bytes"]
+
+
+def parse_gcstats(stdout):
+    '''
+    Parses the nodetool gcstats stdout, i.e.
+
+           Interval (ms) Max GC Elapsed (ms)Total GC Elapsed (ms)Stdev GC Elapsed (ms)   GC Reclaimed (MB)         Collections      Direct Memory Bytes
+                  225798                  31                 212                   6          2069625704                  17                       -1
+
+    The header columns run into each other so the values are read by
+    position. nodetool labels the reclaimed value MB but prints bytes.
+    The values cover the time since the previous call of gcstats by any
+    client as Cassandra resets them on each call.
+    '''
+    for line in reversed(stdout.splitlines()):
+        fields = line.split()
+        if len(fields) >= len(GCSTATS_FIELDS) and to_number(fields[0]) is not None:
+            values = [to_number(v) for v in fields]
+            gcstats = dict(zip(GCSTATS_FIELDS, values))
+            if gcstats['direct_memory_bytes'] is not None and gcstats['direct_memory_bytes'] < 0:
+                gcstats['direct_memory_bytes'] = None  # not available
+            return gcstats
+    return None
+
+
+TOKEN_RANGE_REGEX = re.compile(r"TokenRange\(start_token:(-?\d+), end_token:(-?\d+), endpoints:\[([^\]]*)\]")
+
+ENDPOINT_DETAILS_REGEX = re.compile(r"EndpointDetails\(host:([^,]+), datacenter:([^,]+), rack:([^)]+)\)")
+
+
+def parse_describering(stdout):
+    '''
+    Parses the nodetool describering stdout, i.e.
+
+    Schema Version:1b7de2a5-5d1b-3c3b-a1f4-4fbd0a6e1b76
+    TokenRange:
+        TokenRange(start_token:-3074457345618258603, end_token:3074457345618258602,
+            endpoints:[127.0.0.2, 127.0.0.1], rpc_endpoints:[...],
+            endpoint_details:[EndpointDetails(host:127.0.0.2, datacenter:dc1, rack:rack1), ...])
+
+    where each TokenRange is printed on one line.
+
+    Returns a list of dicts in the following format, with the endpoints in
+    the order nodetool prints them, the primary replica first...
+        [ { "start": -3074457345618258603, "end": 3074457345618258602,
+            "endpoints": [ "127.0.0.2", "127.0.0.1" ],
+            "datacenters": { "127.0.0.2": "dc1", "127.0.0.1": "dc1" } } ]
+    '''
+    ranges = []
+    for line in stdout.splitlines():
+        match = TOKEN_RANGE_REGEX.search(line)
+        if match is None:
+            continue
+        endpoints = [e.strip() for e in match.group(3).split(",") if e.strip()]
+        datacenters = dict((host.strip(), dc.strip()) for (host, dc, rack) in ENDPOINT_DETAILS_REGEX.findall(line))
+        ranges.append(dict(start=int(match.group(1)),
+                           end=int(match.group(2)),
+                           endpoints=endpoints,
+                           datacenters=datacenters))
+    return ranges
+
+
+STATUS_NODE_REGEX = re.compile(r"^([UD][NLJM])\s+(\S+)\s+(\?|\S+ \S+)\s+(\d+)\s+(\S+)\s+([0-9a-f-]{36})\s+(\S+)\s*$")
+
+
+def parse_status(stdout):
+    '''
+    Parses the nodetool status stdout, i.e.
+
+    Datacenter: dc1
+    ===============
+    Status=Up/Down
+    |/ State=Normal/Leaving/Joining/Moving
+    --  Address    Load        Tokens  Owns (effective)  Host ID                               Rack
+    UN  127.0.0.1  145.17 KiB  16      100.0%            f4ee490c-df8e-4a8d-9236-320903697fbf  rack1
+
+    Returns a list of dicts in the following format...
+        [ { "datacenter": "dc1", "state": "UN", "address": "127.0.0.1", "load_bytes": 148654,
+            "tokens": 16, "owns": 100.0, "host_id": "f4ee490c-df8e-4a8d-9236-320903697fbf",
+            "rack": "rack1" } ]
+    '''
+    nodes = []
+    datacenter = None
+    for line in stdout.splitlines():
+        line = line.strip()
+        if line.startswith("Datacenter:"):
+            datacenter = line.split(":", 1)[1].strip()
+            continue
+        match = STATUS_NODE_REGEX.match(line)
+        if match is None:
+            continue
+        (state, address, load, tokens, owns, host_id, rack) = match.groups()
+        nodes.append(dict(datacenter=datacenter,
+                          state=state,
+                          address=address,
+                          load_bytes=parse_size(load),
+                          tokens=int(tokens),
+                          owns=to_number(owns.rstrip("%")),
+                          host_id=host_id,
+                          rack=rack))
+    return nodes
+
+
+SNAPSHOT_ROW_REGEX = re.compile(r"^(\S+)\s+(\S+)\s+(\S+)\s+(\S+ \S+)\s+(\S+ \S+)(?:\s+(\S+))?(?:\s+(\S+))?\s*$")
+
+
+def parse_listsnapshots(stdout):
+    '''
+    Parses the nodetool listsnapshots stdout, i.e.
+
+    Snapshot Details:
+    Snapshot name Keyspace name Column family name True size Size on disk Creation time            Expiration time
+    nightly       myapp         users              1.2 MiB   5.5 MiB      2026-10-18T22:00:01.123Z
+
+    Total TrueDiskSpaceUsed: 1.2 MiB
+
+    Creation and expiration time are only printed from Cassandra 4.1.
+    Returns a list of dicts in the following format...
+        [ { "tag": "nightly", "keyspace": "myapp", "table": "users", "true_size_bytes": 1258291,
+            "size_on_disk_bytes": 5767168, "creation_time": "2026-10-18T22:00:01.123Z",
+            "expiration_time": None } ]
+    '''
+    snapshots = []
+    for line in stdout.splitlines():
+        line = line.strip()
+        if not line or line.startswith("Snapshot name") or line.startswith("Total"):
+            continue
+        match = SNAPSHOT_ROW_REGEX.match(line)
+        if match is None:
+            continue
+        true_size = parse_size(match.group(4))
+        size_on_disk = parse_size(match.group(5))
+        if true_size is None or size_on_disk is None:
+            continue
+        snapshots.append(dict(tag=match.group(1),
+                              keyspace=match.group(2),
+                              table=match.group(3),
+                              true_size_bytes=true_size,
+                              size_on_disk_bytes=size_on_disk,
+                              creation_time=match.group(6),
+                              expiration_time=match.group(7)))
+    return snapshots
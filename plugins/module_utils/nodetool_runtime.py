@@ -0,0 +1,330 @@
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+import re
+import threading
+
+
+TIMEOUT_TYPES = ['read', 'range', 'write', 'counterwrite', 'cascontention', 'truncate',
+                 'internodeconnect', 'internodeuser', 'internodestreaminguser', 'misc']
+
+CONCURRENCY_STAGES = [
+    "AntiEntropyStage",
+    "CounterMutationStage",
+    "GossipStage",
+    "ImmediateStage",
+    "InternalResponseStage",
+    "MigrationStage",
+    "MiscStage",
+    "MutationStage",
+    "ReadStage",
+    "RequestResponseStage",
+    "TracingStage",
+    "ViewMutationStage"
+]
+
+RUNTIME_GROUPS = ['throughput', 'timeouts', 'concurrency', 'hints', 'batchlog', 'trace', 'status']
+
+NUMBER_REGEX = re.compile(r"-?\d+(?:\.\d+)?(?:[eE]-?\d+)?")
+
+
+def parse_number(stdout):
+    '''
+    Returns the last number in the output of a nodetool get command, i.e.
+
+    Current compaction throughput: 64 MB/s
+    Current concurrent compactors in the system is:
+    4
+
+    Values printed with a fraction, i.e. 200.0 Mb/s on 4.1, are returned
+    as int when the fraction is 0.
+    '''
+    numbers = NUMBER_REGEX.findall(stdout)
+    if not numbers:
+        return None
+    value = float(numbers[-1])
+    if value == int(value) and "e" not in numbers[-1].lower():
+        return int(value)
+    return value
+
+
+def parse_float(stdout):
+    value = parse_number(stdout)
+    if value is None:
+        return None
+    return float(value)
+
+
+def parse_status(stdout):
+    '''
+    Returns True for running and False for not running, i.e.
+
+    Hinted handoff is not running
+    '''
+    stdout = stdout.strip()
+    if stdout.endswith("not running"):
+        return False
+    if stdout.endswith("running"):
+        return True
+    return None
+
+
+def parse_concurrency(stdout):
+    '''
+    Parses the output of nodetool getconcurrency, i.e.
+
+    Stage                      CorePoolSize  MaximumPoolSize
+    MutationStage              32            32
+    ReadStage                  32            32
+
+    Returns the maximum pool size per stage.
+    '''
+    concurrency = {}
+    for line in stdout.splitlines():
+        fields = line.split()
+        if len(fields) == 3 and fields[2].isdigit():
+            concurrency[fields[0]] = int(fields[2])
+    return concurrency
+
+
+def runtime_getters(cassandra_version, groups):
+    '''
+    Returns a list of (path, group, get command, parser) for the runtime
+    settings of the given groups. path is the list of keys the parsed
+    value is stored under in the runtime dict.
+    '''
+    get_flag = " -d" if cassandra_version == "4.1" else ""
+    getters = [
+        (['compaction_throughput'], 'throughput', "getcompactionthroughput", parse_number),
+        (['stream_throughput'], 'throughput', "getstreamthroughput" + get_flag, parse_number),
+        (['interdc_stream_throughput'], 'throughput', "getinterdcstreamthroughput" + get_flag, parse_number),
+    ]
+    for timeout_type in TIMEOUT_TYPES:
+        getters.append((['timeouts', timeout_type], 'timeouts', "gettimeout {0}".format(timeout_type), parse_number))
+    getters += [
+        (['concurrency'], 'concurrency', "getconcurrency", parse_concurrency),
+        (['concurrent_compactors'], 'concurrency', "getconcurrentcompactors", parse_number),
+        (['concurrent_view_builders'], 'concurrency', "getconcurrentviewbuilders", parse_number),
+        (['max_hint_window'], 'hints', "getmaxhintwindow", parse_number),
+        (['batchlog_replay_throttle'], 'batchlog', "getbatchlogreplaythrottle", parse_number),
+        (['trace_probability'], 'trace', "gettraceprobability", parse_float),
+    ]
+    for status in ['binary', 'gossip', 'handoff', 'backup']:
+        getters.append((['status', status], 'status', "status{0}".format(status), parse_status))
+    return [g for g in getters if g[1] in groups]
+
+
+def run_nodetool_commands(n, sub_commands, parallel):
+    '''
+    Runs nodetool sub commands with up to parallel commands at a time.
+    Each nodetool call starts its own JVM so running them side by side
+    takes roughly as long as the slowest one. Returns a dict of
+    sub command: (rc, out, err).
+    '''
+    cmds = [(s, n.build_nodetool_cmd(s)) for s in sub_commands]
+    results = {}
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                if not cmds:
+                    return
+                (sub_command, cmd) = cmds.pop(0)
+            try:
+                response = n.execute_command(cmd)
+            except Exception as excep:
+                response = (1, '', str(excep))
+            with lock:
+                results[sub_command] = response
+
+    threads = [threading.Thread(target=worker) for i in range(max(min(parallel, len(cmds)), 1))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def runtime_set_command(path, value):
+    '''
+    Returns the nodetool command that sets the runtime setting at path
+    '''
+    if path[0] == 'timeouts':
+        return "settimeout {0} {1}".format(path[1], value)
+    if path[0] == 'concurrency':
+        return "setconcurrency -- {0} {1}".format(path[1], value)
+    set_cmds = {
+        'compaction_throughput': "setcompactionthroughput {0}",
+        'stream_throughput': "setstreamthroughput {0}",
+        'interdc_stream_throughput': "setinterdcstreamthroughput {0}",
+        'concurrent_compactors': "setconcurrentcompactors -- {0}",
+        'concurrent_view_builders': "setconcurrentviewbuilders -- {0}",
+        'max_hint_window': "setmaxhintwindow -- {0}",
+        'batchlog_replay_throttle': "setbatchlogreplaythrottle {0}",
+        'trace_probability': "settraceprobability {0}",
+    }
+    return set_cmds[path[0]].format(value)
+
+
+def get_runtime(n, groups, parallel, paths=None):
+    '''
+    Reads the runtime settings of the given groups and returns
+    (runtime, errors). runtime is a nested dict of the normalized values,
+    i.e. { "compaction_throughput": 64, "timeouts": { "read": 5000 } },
+    and errors a dict of get command: error for commands that failed or
+    could not be parsed, i.e. ones the Cassandra version does not have.
+    When paths is given only the settings at or above these paths are read.
+    '''
+    getters = runtime_getters(n.module.params['cassandra_version'], groups)
+    if paths is not None:
+        getters = [g for g in getters if [p for p in paths if p[:len(g[0])] == g[0]]]
+    responses = run_nodetool_commands(n, [g[2] for g in getters], parallel)
+    runtime = {}
+    errors = {}
+    for (path, group, cmd, parser) in getters:
+        (rc, out, err) = responses[cmd]
+        value = None
+        if rc != 0:
+            errors[cmd] = (err or out).strip()
+        else:
+            value = parser(out)
+            if value is None or value == {}:
+                errors[cmd] = "Unable to parse output: {0}".format(out.strip())
+                value = None
+        parent = runtime
+        for key in path[:-1]:
+            parent = parent.setdefault(key, {})
+        parent[path[-1]] = value
+    return (runtime, errors)
+
+
+RUNTIME_SETTINGS = [
+    'compaction_throughput',
+    'stream_throughput',
+    'interdc_stream_throughput',
+    'timeouts',
+    'concurrency',
+    'concurrent_compactors',
+    'concurrent_view_builders',
+    'max_hint_window',
+    'batchlog_replay_throttle',
+    'trace_probability',
+]
+
+
+def runtime_settings_argument_spec():
+    """
+    Returns a dict containing the options of the runtime settings that
+    can be set with nodetool
+    """
+    return dict(
+        compaction_throughput=dict(type='int'),
+        stream_throughput=dict(type='int'),
+        interdc_stream_throughput=dict(type='int'),
+        timeouts=dict(type='dict', options=dict((t, dict(type='int')) for t in TIMEOUT_TYPES)),
+        concurrency=dict(type='dict'),
+        concurrent_compactors=dict(type='int'),
+        concurrent_view_builders=dict(type='int'),
+        max_hint_window=dict(type='int'),
+        batchlog_replay_throttle=dict(type='int'),
+        trace_probability=dict(type='float'),
+    )
+
+
+def desired_runtime_settings(module, params):
+    '''
+    Returns a list of (path, value) for the runtime settings in params,
+    i.e. [ (['compaction_throughput'], 256), (['timeouts', 'write'], 5000) ]
+    '''
+    desired = []
+    for name in RUNTIME_SETTINGS:
+        value = params.get(name)
+        if value is None:
+            continue
+        if name == 'timeouts':
+            for timeout_type in TIMEOUT_TYPES:
+                if value.get(timeout_type) is not None:
+                    desired.append(([name, timeout_type], value[timeout_type]))
+        elif name == 'concurrency':
+            for stage in sorted(value):
+                if stage not in CONCURRENCY_STAGES:
+                    module.fail_json(msg="Unknown concurrency stage: {0}".format(stage))
+                try:
+                    desired.append(([name, stage], int(value[stage])))
+                except (TypeError, ValueError):
+                    module.fail_json(msg="The concurrency of {0} must be an int".format(stage))
+        elif name == 'trace_probability':
+            if not 0 <= value <= 1:
+                module.fail_json(msg="trace_probability must be between 0 and 1")
+            desired.append(([name], value))
+        else:
+            desired.append(([name], value))
+    return desired
+
+
+def lookup_runtime_setting(runtime, path):
+    value = runtime
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def read_runtime_settings(module, n, desired, parallel):
+    '''
+    Reads the current values of the desired (path, value) settings once.
+    Returns settings, the before and after value of each setting keyed by
+    its dotted name and whether it must change. Fails the module when a
+    current value cannot be read.
+    '''
+    (runtime, errors) = get_runtime(n, RUNTIME_GROUPS, parallel, [path for (path, value) in desired])
+
+    settings = {}
+    for (path, value) in desired:
+        name = ".".join(path)
+        current = lookup_runtime_setting(runtime, path)
+        if current is None:
+            module.fail_json(msg="Unable to read the current value of {0}".format(name),
+                             errors=errors, rc=1)
+        if path[0] == 'trace_probability':
+            changed = abs(current - value) > 1e-9
+        else:
+            changed = current != value
+        settings[name] = dict(before=current, after=value, changed=changed)
+    return settings
+
+
+def set_runtime_settings(module, n, settings, parallel):
+    '''
+    Runs the set commands of the settings returned by read_runtime_settings
+    that must change. Nothing is set in check mode. Returns the set
+    commands that failed and marks their settings as unchanged.
+    '''
+    changes = {}
+    for name in settings:
+        if settings[name]['changed']:
+            changes[runtime_set_command(name.split("."), settings[name]['after'])] = name
+
+    failed = {}
+    if changes and not module.check_mode:
+        responses = run_nodetool_commands(n, list(changes), parallel)
+        for (cmd, (rc, out, err)) in responses.items():
+            if rc != 0:
+                failed[cmd] = (err or out).strip()
+                settings[changes[cmd]]['after'] = settings[changes[cmd]]['before']
+                settings[changes[cmd]]['changed'] = False
+    return failed
+
+
+def apply_runtime_settings(module, n, desired, parallel):
+    '''
+    Reads the current values of the desired (path, value) settings once
+    and runs the set commands of those that differ. Nothing is set in
+    check mode. Returns (settings, errors) where settings holds the
+    before and after value of each setting keyed by its dotted name and
+    errors the set commands that failed. Fails the module when a current
+    value cannot be read.
+    '''
+    settings = read_runtime_settings(module, n, desired, parallel)
+    return (settings, set_runtime_settings(module, n, settings, parallel))
@@ -0,0 +1,312 @@
+#!/usr/bin/python
+
+# 2026 Rhys Campbell <rhyscampbell@bluewin.ch>
+# https://github.com/rhysmeister
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+DOCUMENTATION = '''
+---
+module: cassandra_cache
+author: Rhys Campbell (@rhysmeister)
+short_description: Sets the key, row and counter cache capacity and advises on the key cache capacity.
+requirements:
+  - nodetool
+description:
+  - Reads the capacity, size and recent hit rate of each cache from nodetool info and runs \
+    nodetool setcachecapacity only when a given capacity differs from the current one.
+  - Runs nodetool setcachekeystosave with the given number of keys to save. nodetool does not report \
+    the current values so the command is run whenever they are given.
+  - With I(advise=true) the module recommends a key cache capacity from the fill level and hit rate of the \
+    key cache. A full key cache with a hit rate below I(target_hit_rate) is evicting keys that are read again \
+    so twice the capacity is recommended, up to I(max_key_cache_capacity). A key cache less than half full with \
+    a hit rate at the target can be shrunk to one and a half times its size.
+  - With I(sample_seconds) the caches are read again after that many seconds and the hit rate over this \
+    window is returned, i.e. to measure the effect of a resize. The window hit rate is used for the advice.
+  - The values are set at runtime only and are lost when Cassandra restarts.
+
+extends_documentation_fragment:
+  - community.cassandra.nodetool_module_options
+
+options:
+  key_cache_capacity:
+    description:
+      - The key cache capacity in MB.
+    type: int
+  row_cache_capacity:
+    description:
+      - The row cache capacity in MB.
+    type: int
+  counter_cache_capacity:
+    description:
+      - The counter cache capacity in MB.
+    type: int
+  key_cache_keys_to_save:
+    description:
+      - The number of key cache keys to save. 0 saves all keys.
+      - The three keys to save options must be given together.
+    type: int
+  row_cache_keys_to_save:
+    description:
+      - The number of row cache keys to save. 0 saves all keys.
+    type: int
+  counter_cache_keys_to_save:
+    description:
+      - The number of counter cache keys to save. 0 saves all keys.
+    type: int
+  advise:
+    description:
+      - Return a recommended key cache capacity in advice.
+    type: bool
+    default: false
+  target_hit_rate:
+    description:
+      - The key cache hit rate the advice aims for.
+    type: float
+    default: 0.85
+  max_key_cache_capacity:
+    description:
+      - The largest key cache capacity in MB the advice recommends.
+      - Defaults to a tenth of the heap.
+    type: int
+  sample_seconds:
+    description:
+      - Read the caches again after this many seconds and return the hit rate over this window.
+    type: int
+'''
+
+EXAMPLES = '''
+- name: Set the key cache capacity
+  community.cassandra.cassandra_cache:
+    key_cache_capacity: 200
+
+- name: Ask for a key cache capacity based on 5 minutes of reads
+  community.cassandra.cassandra_cache:
+    advise: true
+    sample_seconds: 300
+  register: cache
+
+- name: Apply the recommended capacity and measure the hit rate afterwards
+  community.cassandra.cassandra_cache:
+    key_cache_capacity: "{{ cache.advice.recommended_capacity }}"
+    sample_seconds: 300
+  when: cache.advice.recommended_capacity != cache.advice.capacity
+
+- name: Save all keys of the key cache and none of the other caches
+  community.cassandra.cassandra_cache:
+    key_cache_keys_to_save: 0
+    row_cache_keys_to_save: 0
+    counter_cache_keys_to_save: 0
+'''
+
+RETURN = '''
+msg:
+  description: A message indicating what has happened.
+  returned: always
+  type: str
+caches:
+  description: The key, row and counter cache values of nodetool info before any change.
+  returned: on success
+  type: dict
+  sample: >
+    { "key_cache": { "entries": 10, "size_bytes": 896, "capacity_bytes": 25165824, "hits": 48,
+                     "requests": 62, "recent_hit_rate": 0.774, "save_period_seconds": 14400 } }
+capacity:
+  description: The capacity of each cache in MB before and after.
+  returned: on success
+  type: dict
+  sample: >
+    { "key_cache": { "before": 24, "after": 200, "changed": true },
+      "row_cache": { "before": 0, "after": 0, "changed": false } }
+sample:
+  description:
+    - The hits, requests and hit rate of each cache over the sample window.
+    - hit_rate is null when there were no requests.
+  returned: when sample_seconds is set
+  type: dict
+  sample: >
+    { "seconds": 300, "key_cache": { "hits": 15320, "requests": 16011, "hit_rate": 0.957 } }
+advice:
+  description: The recommended key cache capacity in MB and the reason for it.
+  returned: when advise is true
+  type: dict
+  sample: >
+    { "capacity": 24, "recommended_capacity": 48, "max_capacity": 49, "fill": 0.99,
+      "hit_rate": 0.61, "reason": "The key cache is full and its hit rate is below 0.85" }
+rc:
+  description: Return code of the last executed command.
+  returned: on failure
+  type: int
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+import time
+__metaclass__ = type
+
+
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_cmd_objects import NodeToolCmd
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_common_options import cassandra_common_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_parsers import parse_info
+
+
+CACHES = ["key", "row", "counter"]
+MB = 1024 * 1024
+
+
+def get_caches(module, n, result):
+    (rc, out, err) = n.nodetool_cmd("info")
+    if rc != 0:
+        result['msg'] = "nodetool error: {0}".format(err)
+        result['rc'] = rc
+        module.fail_json(**result)
+    info = parse_info(out)
+    caches = {}
+    for cache in CACHES:
+        name = "{0}_cache".format(cache)
+        if info.get(name, {}).get('capacity_bytes') is None:
+            result['msg'] = "Unable to get the {0} cache from nodetool info".format(cache)
+            module.fail_json(**result)
+        caches[name] = info[name]
+    return (caches, info.get('heap_memory_mb', {}))
+
+
+def window_hit_rates(before, after, seconds):
+    '''
+    Returns the hits, requests and hit rate of each cache between two
+    reads of nodetool info
+    '''
+    sample = dict(seconds=seconds)
+    for name in sorted(before):
+        hits = (after[name].get('hits') or 0) - (before[name].get('hits') or 0)
+        requests = (after[name].get('requests') or 0) - (before[name].get('requests') or 0)
+        hit_rate = None
+        if requests > 0:
+            hit_rate = round(float(hits) / requests, 3)
+        sample[name] = dict(hits=hits, requests=requests, hit_rate=hit_rate)
+    return sample
+
+
+def key_cache_advice(key_cache, hit_rate, target_hit_rate, max_capacity):
+    '''
+    Returns the recommended key cache capacity in MB from its fill level
+    and hit rate
+    '''
+    capacity = key_cache['capacity_bytes'] // MB
+    fill = None
+    if key_cache['capacity_bytes'] > 0:
+        fill = round(float(key_cache['size_bytes']) / key_cache['capacity_bytes'], 3)
+    advice = dict(capacity=capacity,
+                  recommended_capacity=capacity,
+                  max_capacity=max_capacity,
+                  fill=fill,
+                  hit_rate=hit_rate)
+    if capacity == 0:
+        advice['recommended_capacity'] = min(100, max_capacity)
+        advice['reason'] = "The key cache is disabled"
+    elif hit_rate is None:
+        advice['reason'] = "There were no key cache requests"
+    elif fill >= 0.9 and hit_rate < target_hit_rate:
+        if capacity >= max_capacity:
+            advice['reason'] = "The key cache is full and its hit rate is below {0} but it is at the maximum capacity".format(target_hit_rate)
+        else:
+            advice['recommended_capacity'] = min(capacity * 2, max_capacity)
+            advice['reason'] = "The key cache is full and its hit rate is below {0}".format(target_hit_rate)
+    elif fill < 0.5 and hit_rate >= target_hit_rate:
+        advice['recommended_capacity'] = max(int(key_cache['size_bytes'] * 1.5 / MB) + 1, 1)
+        advice['reason'] = "The key cache is less than half full and its hit rate is at least {0}".format(target_hit_rate)
+    else:
+        advice['reason'] = "The key cache capacity fits the workload"
+    return advice
+
+
+def main():
+    argument_spec = cassandra_common_argument_spec()
+    argument_spec.update(
+        key_cache_capacity=dict(type='int', no_log=False),
+        row_cache_capacity=dict(type='int'),
+        counter_cache_capacity=dict(type='int'),
+        key_cache_keys_to_save=dict(type='int', no_log=False),
+        row_cache_keys_to_save=dict(type='int', no_log=False),
+        counter_cache_keys_to_save=dict(type='int', no_log=False),
+        advise=dict(type='bool', default=False),
+        target_hit_rate=dict(type='float', default=0.85),
+        max_key_cache_capacity=dict(type='int', no_log=False),
+        sample_seconds=dict(type='int'),
+    )
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+        required_together=[['key_cache_keys_to_save', 'row_cache_keys_to_save', 'counter_cache_keys_to_save']],
+    )
+
+    sample_seconds = module.params['sample_seconds']
+    target_hit_rate = module.params['target_hit_rate']
+    capacities = dict(("{0}_cache".format(c), module.params["{0}_cache_capacity".format(c)]) for c in CACHES)
+    keys_to_save = [module.params["{0}_cache_keys_to_save".format(c)] for c in CACHES]
+
+    for (name, value) in capacities.items():
+        if value is not None and value < 0:
+            module.fail_json(msg="The {0} capacity must be 0 or more".format(name.replace("_", " ")))
+    if sample_seconds is not None and sample_seconds < 1:
+        module.fail_json(msg="sample_seconds must be 1 or more")
+    if not 0 < target_hit_rate <= 1:
+        module.fail_json(msg="target_hit_rate must be greater than 0 and at most 1")
+
+    result = dict(changed=False)
+    n = NodeToolCmd(module)
+    (caches, heap) = get_caches(module, n, result)
+    result['caches'] = caches
+
+    capacity = {}
+    for name in sorted(caches):
+        before = caches[name]['capacity_bytes'] // MB
+        after = capacities[name] if capacities[name] is not None else before
+        capacity[name] = dict(before=before, after=after, changed=before != after)
+    result['capacity'] = capacity
+    changed = []
+
+    if [c for c in capacity.values() if c['changed']]:
+        cmd = "setcachecapacity {0} {1} {2}".format(*[capacity["{0}_cache".format(c)]['after'] for c in CACHES])
+        if not module.check_mode:
+            (rc, out, err) = n.nodetool_cmd(cmd)
+            if rc != 0:
+                result['msg'] = "nodetool error: {0}".format(err)
+                result['rc'] = rc
+                module.fail_json(**result)
+        changed.append("capacity")
+
+    if keys_to_save[0] is not None:
+        if not module.check_mode:
+            (rc, out, err) = n.nodetool_cmd("setcachekeystosave {0} {1} {2}".format(*keys_to_save))
+            if rc != 0:
+                result['msg'] = "nodetool error: {0}".format(err)
+                result['rc'] = rc
+                result['changed'] = len(changed) > 0
+                module.fail_json(**result)
+        changed.append("keys to save")
+
+    key_hit_rate = caches['key_cache'].get('recent_hit_rate')
+    if sample_seconds is not None:
+        time.sleep(sample_seconds)
+        (sampled, heap) = get_caches(module, n, result)
+        result['sample'] = window_hit_rates(caches, sampled, sample_seconds)
+        key_hit_rate = result['sample']['key_cache']['hit_rate']
+
+    if module.params['advise']:
+        max_capacity = module.params['max_key_cache_capacity']
+        if max_capacity is None:
+            max_capacity = int((heap.get('total') or 0) / 10)
+        result['advice'] = key_cache_advice(caches['key_cache'], key_hit_rate, target_hit_rate, max_capacity)
+
+    result['changed'] = len(changed) > 0
+    if changed:
+        result['msg'] = "Set the cache {0}".format(" and ".join(changed))
+    else:
+        result['msg'] = "The caches already have the desired values"
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,320 @@
+#!/usr/bin/python
+
+# 2026 Rhys Campbell <rhyscampbell@bluewin.ch>
+# https://github.com/rhysmeister
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+DOCUMENTATION = '''
+---
+module: cassandra_cleanup_cluster
+author: Rhys Campbell (@rhysmeister)
+short_description: Runs cleanup on every node of a datacenter, one node per rack at a time.
+requirements:
+  - nodetool
+description:
+  - Runs nodetool cleanup on every node of a datacenter from a single task, i.e. after nodes were added.
+  - The nodes are read from nodetool status on I(host) and cleaned rack by rack. Up to I(parallel) nodes \
+    are cleaned at the same time and never more than one node of a rack.
+  - Each node is reached with nodetool over JMX on its address from nodetool status so remote JMX access \
+    must be enabled. Run the task once, i.e. with run_once or on the controller with I(nodetool_path) set.
+  - Before a node is cleaned its free disk space in I(free_bytes) must be at least I(min_free_ratio) times \
+    its load. Nodes without enough free space, and nodes that are down, are skipped.
+  - The load of each node is read with nodetool info before and after the cleanup to return the reclaimed bytes.
+  - In check mode the plan and the disk space checks are returned and no node is cleaned.
+
+extends_documentation_fragment:
+  - community.cassandra.nodetool_module_options
+
+options:
+  datacenter:
+    description:
+      - The datacenter to clean.
+      - Defaults to the datacenter of I(host).
+    type: str
+  nodes:
+    description:
+      - Only clean these nodes of the datacenter.
+    type: list
+    elements: str
+  keyspace:
+    description:
+      - Optional keyspace.
+    type: str
+  table:
+    description:
+      - Optional table name or list of table names.
+    type: raw
+  num_jobs:
+    description:
+      - Number of job threads on each node.
+    type: int
+    default: 2
+    aliases:
+      - j
+  parallel:
+    description:
+      - The number of nodes cleaned at the same time.
+      - Only one node of each rack is cleaned at a time whatever the value.
+    type: int
+    default: 1
+  free_bytes:
+    description:
+      - The free bytes on the data disk of each node keyed by its address, i.e. from the ansible_mounts fact of each node.
+      - No disk space check is made when not given.
+    type: dict
+  min_free_ratio:
+    description:
+      - The free bytes of a node must be at least its load times this ratio for it to be cleaned.
+    type: float
+    default: 0.5
+'''
+
+EXAMPLES = '''
+- name: Clean all nodes of dc1, two racks at a time
+  community.cassandra.cassandra_cleanup_cluster:
+    datacenter: dc1
+    parallel: 2
+  run_once: true
+
+- name: Clean one keyspace, checking the free space of /var/lib/cassandra on each node first
+  community.cassandra.cassandra_cleanup_cluster:
+    datacenter: dc1
+    keyspace: myapp
+    free_bytes: "{{ dict(ansible_play_hosts | map('extract', hostvars, 'ansible_host') |
+                    zip(ansible_play_hosts | map('extract', hostvars, 'cassandra_data_free'))) }}"
+  run_once: true
+'''
+
+RETURN = '''
+msg:
+  description: A message indicating what has happened.
+  returned: always
+  type: str
+plan:
+  description: The racks of the datacenter and their nodes in the order they are cleaned.
+  returned: on success
+  type: list
+  sample: >
+    [ { "rack": "rack1", "nodes": [ "10.0.0.1", "10.0.0.4" ] },
+      { "rack": "rack2", "nodes": [ "10.0.0.2", "10.0.0.5" ] } ]
+nodes:
+  description:
+    - The outcome of each node, one of cleaned, failed, skipped or planned.
+    - load_before and load_after are the load of nodetool info in bytes.
+  returned: on success
+  type: dict
+  sample: >
+    { "10.0.0.1": { "rack": "rack1", "status": "cleaned", "duration": 1843.2,
+                    "load_before": 412316860416, "load_after": 274877906944,
+                    "reclaimed_bytes": 137438953472 } }
+reclaimed_bytes:
+  description: The bytes reclaimed on all nodes.
+  returned: on success
+  type: int
+rc:
+  description: Return code of the last executed command.
+  returned: on failure
+  type: int
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+import threading
+import time
+__metaclass__ = type
+
+
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_cmd_objects import NodeToolCmd
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_cmd_objects import nodetool_for_host
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_common_options import cassandra_common_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_parsers import parse_info
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_parsers import parse_status
+
+
+def plan_cleanup(nodes):
+    '''
+    Groups the nodes by rack, i.e.
+
+    [ { "rack": "rack1", "nodes": [ "10.0.0.1", "10.0.0.4" ] } ]
+    '''
+    racks = {}
+    for node in nodes:
+        racks.setdefault(node['rack'], []).append(node['address'])
+    return [dict(rack=rack, nodes=sorted(racks[rack])) for rack in sorted(racks)]
+
+
+def cleanup_command(module):
+    cmd = "cleanup -j {0}".format(module.params['num_jobs'])
+    if module.params['keyspace'] is not None:
+        cmd += " -- {0}".format(module.params['keyspace'])
+        table = module.params['table']
+        if isinstance(table, list):
+            cmd += " {0}".format(" ".join(table))
+        elif table is not None:
+            cmd += " {0}".format(table)
+    return cmd
+
+
+def get_load(n):
+    (rc, out, err) = n.nodetool_cmd("info")
+    if rc != 0:
+        return None
+    return parse_info(out).get('load_bytes')
+
+
+def main():
+    argument_spec = cassandra_common_argument_spec()
+    argument_spec.update(
+        datacenter=dict(type='str'),
+        nodes=dict(type='list', elements='str'),
+        keyspace=dict(type='str', no_log=False),
+        table=dict(type='raw'),
+        num_jobs=dict(type='int', default=2, aliases=['j']),
+        parallel=dict(type='int', default=1),
+        free_bytes=dict(type='dict'),
+        min_free_ratio=dict(type='float', default=0.5),
+    )
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+    )
+
+    parallel = module.params['parallel']
+    free_bytes = module.params['free_bytes']
+    min_free_ratio = module.params['min_free_ratio']
+    if parallel < 1:
+        module.fail_json(msg="parallel must be 1 or more")
+    if min_free_ratio < 0:
+        module.fail_json(msg="min_free_ratio must be 0 or more")
+    if module.params['table'] is not None and module.params['keyspace'] is None:
+        module.fail_json(msg="table requires keyspace")
+
+    result = dict(changed=False)
+    n = NodeToolCmd(module)
+
+    datacenter = module.params['datacenter']
+    if datacenter is None:
+        (rc, out, err) = n.nodetool_cmd("info")
+        if rc != 0:
+            result['msg'] = "nodetool error: {0}".format(err)
+            result['rc'] = rc
+            module.fail_json(**result)
+        datacenter = parse_info(out).get('data_center')
+
+    (rc, out, err) = n.nodetool_cmd("status")
+    if rc != 0:
+        result['msg'] = "nodetool error: {0}".format(err)
+        result['rc'] = rc
+        module.fail_json(**result)
+    nodes = [node for node in parse_status(out) if node['datacenter'] == datacenter]
+    if module.params['nodes'] is not None:
+        unknown = set(module.params['nodes']) - set(node['address'] for node in nodes)
+        if unknown:
+            module.fail_json(msg="Nodes not in datacenter {0}: {1}".format(datacenter, ", ".join(sorted(unknown))))
+        nodes = [node for node in nodes if node['address'] in module.params['nodes']]
+    if not nodes:
+        module.fail_json(msg="No nodes found in datacenter {0}".format(datacenter))
+
+    plan = plan_cleanup(nodes)
+    result['plan'] = plan
+    outcome = {}
+    pending = []
+    for node in nodes:
+        outcome[node['address']] = dict(rack=node['rack'], status="planned")
+    for rack in plan:
+        for address in rack['nodes']:
+            pending.append((rack['rack'], address))
+    states = dict((node['address'], node['state']) for node in nodes)
+    loads = dict((node['address'], node['load_bytes']) for node in nodes)
+
+    def disk_check(address):
+        '''
+        Returns why the node cannot be cleaned or None
+        '''
+        if states[address] != "UN":
+            return "The node is {0}".format(states[address])
+        if free_bytes is None:
+            return None
+        if address not in free_bytes:
+            return "No free bytes given for the node"
+        required = int((loads[address] or 0) * min_free_ratio)
+        outcome[address]['free_bytes'] = int(free_bytes[address])
+        outcome[address]['required_free_bytes'] = required
+        if int(free_bytes[address]) < required:
+            return "{0} free bytes is less than the required {1}".format(int(free_bytes[address]), required)
+        return None
+
+    cmd = cleanup_command(module)
+    condition = threading.Condition()
+    busy_racks = set()
+
+    def clean(address):
+        node_n = nodetool_for_host(module, address)
+        load_before = get_load(node_n)
+        start = time.time()
+        (rc, out, err) = node_n.nodetool_cmd(cmd)
+        node = dict(duration=round(time.time() - start, 1), load_before=load_before)
+        if rc != 0:
+            node['status'] = "failed"
+            node['msg'] = "nodetool error: {0}".format((err or out).strip())
+            node['rc'] = rc
+            return node
+        node['status'] = "cleaned"
+        node['load_after'] = get_load(node_n)
+        if load_before is not None and node['load_after'] is not None:
+            node['reclaimed_bytes'] = load_before - node['load_after']
+        return node
+
+    def worker():
+        while True:
+            with condition:
+                while True:
+                    if not pending:
+                        return
+                    ready = [p for p in pending if p[0] not in busy_racks]
+                    if ready:
+                        break
+                    condition.wait()
+                (rack, address) = ready[0]
+                pending.remove(ready[0])
+                reason = disk_check(address)
+                if reason is not None:
+                    outcome[address].update(status="skipped", msg=reason)
+                    continue
+                if module.check_mode:
+                    continue
+                busy_racks.add(rack)
+            try:
+                node = clean(address)
+            except Exception as excep:
+                node = dict(status="failed", msg=str(excep))
+            with condition:
+                outcome[address].update(node)
+                busy_racks.discard(rack)
+                condition.notify_all()
+
+    threads = [threading.Thread(target=worker) for i in range(min(parallel, len(plan)))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    result['nodes'] = outcome
+    result['reclaimed_bytes'] = sum(node.get('reclaimed_bytes', 0) for node in outcome.values())
+    statuses = [node['status'] for node in outcome.values()]
+    result['changed'] = "cleaned" in statuses
+    if "failed" in statuses or "skipped" in statuses:
+        result['msg'] = "Cleanup failed on {0} and skipped {1} of {2} nodes in {3}".format(
+            statuses.count("failed"), statuses.count("skipped"), len(statuses), datacenter)
+        module.fail_json(**result)
+    if module.check_mode:
+        result['msg'] = "{0} nodes in {1} would be cleaned".format(len(statuses), datacenter)
+    else:
+        result['msg'] = "Cleaned {0} nodes in {1}".format(len(statuses), datacenter)
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
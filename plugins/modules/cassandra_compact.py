@@ -19,6 +19,7 @@ description:
 
 extends_documentation_fragment:
   - community.cassandra.nodetool_module_options
+  - community.cassandra.nodetool_job_options
 
 options:
   compact:
@@ -36,6 +37,18 @@ EXAMPLES = '''
 - name: Stop compaction on the node
   community.cassandra.cassandra_compact:
     compaction: no
+
+- name: Start nodetool compact in the background
+  community.cassandra.cassandra_compact:
+    state: started
+
+- name: Wait for nodetool compact to finish
+  community.cassandra.cassandra_compact:
+    state: status
+  register: job
+  until: not job.job.running
+  retries: 360
+  delay: 60
 '''
 
 RETURN = '''
@@ -43,6 +56,23 @@ cassandra_compact:
   description: The return state of the executed command.
   returned: success
   type: str
+job:
+  description:
+    - The job record of the detached command with its pid, start and end time, return code \
+      and the tail of its output.
+  returned: when state is set
+  type: dict
+  sample: >
+    { "operation": "compact", "command": "compact", "pid": 31337, "start_time": 1792398068.3,
+      "end_time": null, "rc": null, "cancelled": false, "running": true, "elapsed": 842.1,
+      "output_file": "/var/tmp/cassandra_compact.job.out", "output": "" }
+progress:
+  description: The progress of the operation from nodetool compactionstats.
+  returned: when state is set and the job is running
+  type: dict
+  sample: >
+    { "active": 2, "completed_bytes": 1048576, "total_bytes": 4194304,
+      "progress": 25.0, "remaining_time_seconds": 35 }
 '''
 
 from ansible.module_utils.basic import AnsibleModule
@@ -51,6 +81,8 @@ __metaclass__ = type
 
 from ansible_collections.community.cassandra.plugins.module_utils.nodetool_cmd_objects import NodeTool3PairCommand
 from ansible_collections.community.cassandra.plugins.module_utils.cassandra_common_options import cassandra_common_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_jobs import nodetool_job_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_jobs import run_nodetool_job
 
 
 def main():
@@ -58,6 +90,7 @@ def main():
     argument_spec.update(
         compact=dict(default=True, type='bool')
     )
+    argument_spec.update(nodetool_job_argument_spec())
     module = AnsibleModule(
         argument_spec=argument_spec,
         supports_check_mode=True,
@@ -69,6 +102,8 @@ def main():
     status_inactive = 'pending tasks: 0'
 
     n = NodeTool3PairCommand(module, status_cmd, enable_cmd, disable_cmd)
+    if module.params['state'] is not None:
+        run_nodetool_job(module, n, 'compact', n.enable_cmd)
 
     rc = None
     out = ''
@@ -0,0 +1,180 @@
+#!/usr/bin/python
+
+# 2026 Rhys Campbell <rhyscampbell@bluewin.ch>
+# https://github.com/rhysmeister
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+DOCUMENTATION = '''
+---
+module: cassandra_compactionstats
+author: Rhys Campbell (@rhysmeister)
+short_description: Returns the compaction backlog and can wait for it to drain.
+requirements:
+  - nodetool
+description:
+  - Returns the pending compaction tasks, per table where nodetool reports them, \
+    and each active compaction from nodetool compactionstats.
+  - With two or more samples the progress rate and estimated time to completion are returned.
+  - Optionally polls until conditions on these values are met, i.e. C(pending <= 10).
+
+extends_documentation_fragment:
+  - community.cassandra.nodetool_module_options
+  - community.cassandra.wait_until_options
+
+options:
+  rate_interval:
+    description:
+      - Take a second sample after this many seconds to calculate the progress rate.
+      - Ignored when I(wait_until) is set as the rate is then calculated from the first and last poll.
+    type: int
+    default: 0
+'''
+
+EXAMPLES = '''
+- name: Get the compaction backlog
+  community.cassandra.cassandra_compactionstats:
+  register: compactionstats
+
+- name: Get the compaction backlog and progress rate
+  community.cassandra.cassandra_compactionstats:
+    rate_interval: 10
+  register: compactionstats
+
+- name: Skip nodes with a heavy backlog
+  ansible.builtin.meta: end_host
+  when: compactionstats.compactionstats.pending > 100
+
+- name: Wait for the backlog to drain after a bulk load
+  community.cassandra.cassandra_compactionstats:
+    wait_until:
+      - pending <= 5
+    wait_timeout: 3600
+    max_poll_interval: 120
+'''
+
+RETURN = '''
+msg:
+  description: A message indicating what has happened.
+  returned: always
+  type: str
+compactionstats:
+  description:
+    - The compaction backlog.
+    - remaining_bytes is the sum of total - completed of the active compactions counting bytes.
+    - remaining_time_seconds is the estimate of Cassandra based on the compaction throughput setting.
+  returned: on success
+  type: dict
+  sample: >
+    { "pending": 5, "pending_tables": { "myapp.users": 3, "myapp.orders": 2 },
+      "active_compactions": [ { "id": "4e5b6c30-7f2e-11ee-b962-0242ac120002", "compaction_type": "Compaction",
+                                "keyspace": "myapp", "table": "users", "completed": 1234, "total": 567890,
+                                "unit": "bytes", "progress": 0.22 } ],
+      "active_count": 1, "remaining_bytes": 566656, "remaining_time_seconds": 5 }
+progress:
+  description:
+    - The progress between the first and last sample.
+    - bytes_per_second only counts compactions present in both samples.
+    - pending_per_second is negative when the backlog grows.
+    - The ETAs are null when there is no progress.
+  returned: when two or more samples were taken
+  type: dict
+  sample: >
+    { "elapsed": 10.02, "bytes_per_second": 16777216.0, "eta_seconds": 0.03,
+      "pending_per_second": 0.1, "pending_eta_seconds": 50.0 }
+wait:
+  description:
+    - The outcome of I(wait_until).
+    - conditions holds the last value seen for each condition.
+  returned: when wait_until is set
+  type: dict
+  sample: >
+    { "met": true, "polls": 12, "elapsed": 540.2, "conditions": { "pending <= 5": 4 } }
+rc:
+  description: Return code of the last executed command.
+  returned: on failure
+  type: int
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+__metaclass__ = type
+
+
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_cmd_objects import NodeToolCommandSimple
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_common_options import cassandra_common_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_wait_until import wait_until_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_wait_until import run_wait
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_parsers import parse_compactionstats
+
+
+def compaction_progress(first, last, elapsed):
+    '''
+    Returns the progress rate and ETA between two samples
+    '''
+    if elapsed <= 0:
+        return None
+    first_completed = dict((c['id'], c['completed']) for c in first['active_compactions']
+                           if c['unit'] == "bytes" and c['completed'] is not None)
+    compacted = 0
+    for c in last['active_compactions']:
+        if c['id'] in first_completed and c['completed'] is not None:
+            compacted += max(c['completed'] - first_completed[c['id']], 0)
+    bytes_per_second = round(compacted / elapsed, 2)
+    eta_seconds = None
+    if bytes_per_second > 0:
+        eta_seconds = round(last['remaining_bytes'] / bytes_per_second, 2)
+
+    pending_per_second = round((first['pending'] - last['pending']) / elapsed, 4)
+    pending_eta_seconds = None
+    if pending_per_second > 0:
+        pending_eta_seconds = round(last['pending'] / pending_per_second, 2)
+
+    return dict(elapsed=round(elapsed, 2),
+                bytes_per_second=bytes_per_second,
+                eta_seconds=eta_seconds,
+                pending_per_second=pending_per_second,
+                pending_eta_seconds=pending_eta_seconds)
+
+
+def main():
+    argument_spec = cassandra_common_argument_spec()
+    argument_spec.update(wait_until_argument_spec())
+    argument_spec.update(
+        rate_interval=dict(type='int', default=0),
+    )
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+    )
+
+    debug = module.params['debug']
+
+    result = dict(changed=False)
+    n = NodeToolCommandSimple(module, "compactionstats")
+
+    def get_compactionstats():
+        (rc, out, err) = n.run_command()
+        if rc != 0:
+            result['msg'] = "nodetool error: {0}".format(err)
+            result['rc'] = rc
+            module.fail_json(**result)
+        if debug:
+            result['stdout'] = out
+            if err:
+                result['stderr'] = err
+        result['compactionstats'] = parse_compactionstats(out)
+        return result['compactionstats']
+
+    run_wait(module, get_compactionstats, result, optional=["pending_tables"], progress=compaction_progress)
+    if 'wait' in result:
+        result['msg'] = "Compaction conditions met after {0} polls".format(result['wait']['polls'])
+    else:
+        result['msg'] = "{0} pending compaction tasks".format(result['compactionstats']['pending'])
+
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
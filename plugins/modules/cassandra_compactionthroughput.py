@@ -16,6 +16,12 @@ requirements:
   - nodetool
 description:
     - Sets the compaction throughput.
+    - With I(controller=true) the module instead adjusts the compaction throughput for I(duration) seconds. \
+      Every I(sample_interval) seconds it reads the pending compactions from nodetool compactionstats \
+      and the p99 read latency from nodetool proxyhistograms. It raises the throughput by I(step_up) \
+      while there is a backlog and the latency is below I(latency_target) by at least I(headroom) percent \
+      and lowers it by I(step_down) when the latency exceeds I(latency_target).
+    - The controller is meant to run as an async task, i.e. after a bulk load.
 
 extends_documentation_fragment:
   - community.cassandra.nodetool_module_options
@@ -24,14 +30,85 @@ options:
   value:
     description:
       - MB value to set compaction throughput to.
+      - Required unless I(controller=true). The controller starts from this value when it is set.
     type: int
-    required: True
+  controller:
+    description:
+      - Adjust the compaction throughput to the compaction backlog and read latency.
+    type: bool
+    default: false
+  min_value:
+    description:
+      - The lowest compaction throughput the controller sets in MB.
+    type: int
+    default: 16
+  max_value:
+    description:
+      - The highest compaction throughput the controller sets in MB.
+    type: int
+    default: 256
+  step_up:
+    description:
+      - The MB the controller raises the compaction throughput by.
+    type: int
+    default: 16
+  step_down:
+    description:
+      - The MB the controller lowers the compaction throughput by.
+    type: int
+    default: 32
+  latency_target:
+    description:
+      - The p99 coordinator read latency in microseconds the controller keeps below.
+    type: float
+    default: 10000
+  headroom:
+    description:
+      - The percentage the p99 read latency must be below I(latency_target) for the controller to raise the throughput.
+    type: int
+    default: 20
+  sample_interval:
+    description:
+      - The number of seconds between controller decisions.
+    type: int
+    default: 30
+  duration:
+    description:
+      - The maximum number of seconds the controller runs for.
+    type: int
+    default: 3600
+  stop_when_drained:
+    description:
+      - Stop the controller once there are no pending compactions.
+    type: bool
+    default: true
+  restore:
+    description:
+      - Set the compaction throughput back to its value before the controller started when it stops, \
+        also when it stops because a nodetool command failed.
+    type: bool
+    default: true
+  decision_log:
+    description:
+      - Append each controller decision as a line of json to this file, i.e. to follow an async task.
+    type: path
 '''
 
 EXAMPLES = '''
 - name: Set compactionthroughput with module
   cassandra_compactionthroughput:
     value: 32
+
+- name: Clear the compaction debt of a bulk load as fast as the read latency allows
+  community.cassandra.cassandra_compactionthroughput:
+    controller: true
+    min_value: 32
+    max_value: 512
+    latency_target: 5000
+    duration: 7200
+    decision_log: /var/log/cassandra/compactionthroughput_controller.log
+  async: 7500
+  poll: 60
 '''
 
 RETURN = '''
@@ -39,26 +116,183 @@ community.cassandra.cassandra_compactionthroughput:
   description: The return state of the executed command.
   returned: success
   type: str
+msg:
+  description: Why the controller stopped.
+  returned: when controller is true
+  type: str
+decisions:
+  description:
+    - Each controller decision.
+    - action is one of raise, lower, hold or stop.
+  returned: when controller is true
+  type: list
+  sample: >
+    [ { "elapsed": 0.0, "pending": 120, "p99_read_latency": 2816.16, "throughput": 64,
+        "new_throughput": 80, "action": "raise", "reason": "p99 read latency has headroom" } ]
+final_throughput:
+  description: The compaction throughput when the controller stopped, before any restore.
+  returned: when controller is true
+  type: int
 '''
 
 from ansible.module_utils.basic import AnsibleModule
+import json
+import re
+import time
 __metaclass__ = type
 
 
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_cmd_objects import NodeToolCmd
 from ansible_collections.community.cassandra.plugins.module_utils.nodetool_cmd_objects import NodeToolGetSetCommand
 from ansible_collections.community.cassandra.plugins.module_utils.cassandra_common_options import cassandra_common_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_parsers import parse_compactionstats
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_parsers import parse_histograms
+
+
+def controller_decision(module, throughput, pending, p99):
+    '''
+    Returns (new throughput, action, reason) for one controller sample
+    '''
+    p = module.params
+    if p99 is None:
+        return (throughput, "hold", "no p99 read latency available")
+    if p99 > p['latency_target']:
+        new_throughput = max(throughput - p['step_down'], p['min_value'])
+        if new_throughput < throughput:
+            return (new_throughput, "lower", "p99 read latency above target")
+        return (throughput, "hold", "p99 read latency above target at min_value")
+    if pending == 0:
+        if p['stop_when_drained']:
+            return (throughput, "stop", "no pending compactions")
+        return (throughput, "hold", "no pending compactions")
+    if p99 <= p['latency_target'] * (100 - p['headroom']) / 100.0:
+        new_throughput = min(throughput + p['step_up'], p['max_value'])
+        if new_throughput > throughput:
+            return (new_throughput, "raise", "p99 read latency has headroom")
+        return (throughput, "hold", "at max_value")
+    return (throughput, "hold", "p99 read latency within headroom of target")
+
+
+def run_controller(module):
+    '''
+    Samples the compaction backlog and read latency every sample_interval
+    seconds and adjusts the compaction throughput until duration expires
+    or the backlog has drained.
+    '''
+    p = module.params
+    n = NodeToolCmd(module)
+    result = dict(changed=False, decisions=[])
+
+    state = dict(original=None, current=None, restored=False)
+
+    def nodetool(cmd):
+        (rc, out, err) = n.nodetool_cmd(cmd)
+        if rc != 0:
+            result['msg'] = "{0} command failed: {1}".format(cmd.split()[0], err)
+            result['rc'] = rc
+            restore_original()
+            module.fail_json(**result)
+        return out
+
+    def set_throughput(value):
+        if not module.check_mode:
+            nodetool("setcompactionthroughput {0}".format(value))
+            state['current'] = value
+        result['changed'] = True
+
+    def restore_original():
+        '''
+        Sets the original throughput again, once, if the controller has
+        changed it. Called before the module fails too.
+        '''
+        if not p['restore'] or state['restored'] or state['current'] in (None, state['original']):
+            return
+        state['restored'] = True
+        (rc, out, err) = n.nodetool_cmd("setcompactionthroughput {0}".format(state['original']))
+        if rc != 0:
+            result['msg'] = "{0}, restoring the original throughput failed: {1}".format(result.get('msg'), err)
+            result['rc'] = rc
+            module.fail_json(**result)
+        state['current'] = state['original']
+
+    match = re.search(r"(\d+)", nodetool("getcompactionthroughput"))
+    if match is None:
+        module.fail_json(msg="Unable to read the compaction throughput", **result)
+    original = int(match.group(1))
+    state['original'] = original
+    throughput = original
+    try:
+        if p['value'] is not None and p['value'] != throughput:
+            throughput = min(max(p['value'], p['min_value']), p['max_value'])
+            set_throughput(throughput)
+
+        start = time.time()
+        deadline = start + p['duration']
+        result['msg'] = "duration expired"
+        while True:
+            pending = parse_compactionstats(nodetool("compactionstats"))['pending']
+            p99 = parse_histograms(nodetool("proxyhistograms")).get('read_latency', {}).get('p99')
+            (new_throughput, action, reason) = controller_decision(module, throughput, pending, p99)
+            decision = dict(elapsed=round(time.time() - start, 1),
+                            pending=pending,
+                            p99_read_latency=p99,
+                            throughput=throughput,
+                            new_throughput=new_throughput,
+                            action=action,
+                            reason=reason)
+            result['decisions'].append(decision)
+            module.log("compaction throughput controller: {0}".format(json.dumps(decision, sort_keys=True)))
+            if p['decision_log'] is not None:
+                with open(p['decision_log'], 'a') as f:
+                    f.write(json.dumps(decision, sort_keys=True) + "\n")
+            if new_throughput != throughput:
+                set_throughput(new_throughput)
+                throughput = new_throughput
+            if action == "stop":
+                result['msg'] = reason
+                break
+            if module.check_mode:
+                result['msg'] = "first decision only (check mode)"
+                break
+            now = time.time()
+            if now + p['sample_interval'] > deadline:
+                break
+            time.sleep(p['sample_interval'])
+
+        result['final_throughput'] = throughput
+    finally:
+        restore_original()
+    module.exit_json(**result)
 
 
 def main():
     argument_spec = cassandra_common_argument_spec()
     argument_spec.update(
-        value=dict(type='int', required=True)
+        value=dict(type='int'),
+        controller=dict(type='bool', default=False),
+        min_value=dict(type='int', default=16),
+        max_value=dict(type='int', default=256),
+        step_up=dict(type='int', default=16),
+        step_down=dict(type='int', default=32),
+        latency_target=dict(type='float', default=10000),
+        headroom=dict(type='int', default=20),
+        sample_interval=dict(type='int', default=30),
+        duration=dict(type='int', default=3600),
+        stop_when_drained=dict(type='bool', default=True),
+        restore=dict(type='bool', default=True),
+        decision_log=dict(type='path', default=None),
     )
     module = AnsibleModule(
         argument_spec=argument_spec,
         supports_check_mode=True,
+        required_if=[('controller', False, ['value'])],
     )
 
+    if module.params['controller']:
+        if module.params['min_value'] < 1 or module.params['min_value'] > module.params['max_value']:
+            module.fail_json(msg="min_value must be between 1 and max_value")
+        run_controller(module)
+
     set_cmd = "setcompactionthroughput {0}".format(module.params['value'])
     get_cmd = "getcompactionthroughput"
     value = module.params['value']
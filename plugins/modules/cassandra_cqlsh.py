@@ -94,6 +94,12 @@ options:
       - show additional debug info.
     type: bool
     default: false
+  subprocess_timings:
+    description:
+      - Return the wall time of the cqlsh call in C(subprocess_timings).
+      - Used by the community.cassandra.cassandra_profile callback.
+    type: bool
+    default: false
   ssl:
     description:
       - Use SSL.
@@ -189,13 +195,23 @@ rc:
   description: Return code from cqlsh.
   returned: when debug is set to true
   type: int
+subprocess_timings:
+  description: The wall time of the cqlsh call.
+  returned: when subprocess_timings is set to true
+  type: list
+  sample: >
+    [ { "tool": "cqlsh", "command": "cqlsh", "start": 1700000000.12, "elapsed": 1.532, "rc": 0 } ]
 '''
 
 from ansible.module_utils.basic import AnsibleModule
 import json
+import time
 __metaclass__ = type
 
 
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_timings import record_subprocess_timing
+
+
 def add_arg_to_cmd(cmd_list, param_name, param_value, is_bool=False):
     """
     @cmd_list - List of cmd args.
@@ -272,6 +288,7 @@ def main():
         request_timeout=dict(type='int', default=10),
         tty=dict(type='bool', default=False),
         debug=dict(type='bool', default=False),
+        subprocess_timings=dict(type='bool', default=False),
         ssl=dict(type='bool', default=False),
         no_compact=dict(type='bool', default=False),
         cqlsh_cmd=dict(type='str', default='cqlsh'),
@@ -319,7 +336,9 @@ def main():
     result = {}
     cmd = " ".join(str(item) for item in args)
 
+    start = time.time()
     (rc, out, err) = module.run_command(cmd, check_rc=False)
+    record_subprocess_timing(module, "cqlsh", "cqlsh", start, rc)
 
     if module.params['debug']:
         result['out'] = out
@@ -0,0 +1,340 @@
+#!/usr/bin/python
+
+# 2026 Rhys Campbell <rhyscampbell@bluewin.ch>
+# https://github.com/rhysmeister
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+DOCUMENTATION = '''
+---
+module: cassandra_fullquerylog_replay
+author: Rhys Campbell (@rhysmeister)
+short_description: "Replays the full query log against a cluster and measures it."
+requirements:
+  - fqltool
+description:
+  - "Replays a full query log captured with M(community.cassandra.cassandra_fullquerylog) against one or more target hosts \
+     with fqltool replay."
+  - "Reports throughput, latency and error metrics for the replay."
+  - "Metrics can be saved to a file and compared with those of a previous run, i.e. before and after an upgrade."
+  - "fqltool replay has no rate control, queries are replayed as fast as the targets accept them."
+  - "Throughput is the number of replayed statements divided by the wall time of the replay. \
+     The statements are counted with fqltool dump unless fqltool reports a count itself."
+  - "Latency percentiles are only returned when fqltool prints timer metrics."
+  - "Supported from Cassandra 4.0 onwards."
+
+extends_documentation_fragment:
+  - community.cassandra.fqltool_module_options
+
+options:
+  target_hosts:
+    description:
+      - The hosts to replay the full query log against.
+    type: list
+    elements: str
+    required: true
+    aliases:
+      - target
+  keyspace:
+    description:
+      - Only replay queries against this keyspace.
+    type: str
+  replay_ddl_statements:
+    description:
+      - Replay DDL statements as well. By default they are skipped.
+    type: bool
+    default: false
+  results_dir:
+    description:
+      - Directory where fqltool stores the result sets of the replay for use with fqltool compare.
+    type: path
+  count_queries:
+    description:
+      - Count the statements to replay with fqltool dump when fqltool replay does not report a count.
+      - Disable to skip the extra read of the log. Throughput is then not reported.
+    type: bool
+    default: true
+  metrics_file:
+    description:
+      - Write the metrics of this run as json to this file.
+    type: path
+  baseline_file:
+    description:
+      - A metrics_file from a previous run to compare this run with.
+    type: path
+'''
+
+EXAMPLES = '''
+- name: Replay production traffic against the canary cluster before the upgrade
+  community.cassandra.cassandra_fullquerylog_replay:
+    log_dir: /var/log/cassandra/fql
+    target_hosts:
+      - canary1.example.com
+      - canary2.example.com
+    keyspace: myapp
+    metrics_file: /tmp/replay_before.json
+
+- name: Replay it again after the upgrade and compare
+  community.cassandra.cassandra_fullquerylog_replay:
+    log_dir: /var/log/cassandra/fql
+    target_hosts:
+      - canary1.example.com
+      - canary2.example.com
+    keyspace: myapp
+    metrics_file: /tmp/replay_after.json
+    baseline_file: /tmp/replay_before.json
+  register: replay
+
+- name: Fail if throughput dropped by more than 10%
+  assert:
+    that: replay.comparison.throughput.change_percent > -10
+'''
+
+RETURN = '''
+msg:
+  description: A short description of what the module did.
+  returned: always
+  type: str
+replay_metrics:
+  description: The metrics of the replay.
+  returned: success
+  type: dict
+  sample: >
+    { "queries": 120000, "duration_seconds": 61.2, "throughput": 1960.78, "errors": 3,
+      "latency": { "min": 0.21, "mean": 1.3, "p50": 1.1, "p75": 1.4, "p95": 2.2, "p98": 3.0,
+                   "p99": 4.1, "p999": 9.8, "max": 40.2 } }
+comparison:
+  description:
+    - The change of each metric compared with I(baseline_file).
+    - change_percent is null when the baseline value is 0.
+  returned: when baseline_file is set
+  type: dict
+  sample: >
+    { "throughput": { "baseline": 1960.78, "current": 1801.2, "change": -159.58, "change_percent": -8.14 } }
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+import json
+import re
+import time
+__metaclass__ = type
+
+
+from ansible_collections.community.cassandra.plugins.module_utils.fqltool_cmd_objects import FqlToolCmd
+from ansible_collections.community.cassandra.plugins.module_utils.fqltool_cmd_objects import fqltool_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.fqltool_cmd_objects import query_table
+from ansible_collections.community.cassandra.plugins.module_utils.fqltool_cmd_objects import write_report_file
+
+
+DDL_REGEX = re.compile(r"^\s*(CREATE|ALTER|DROP|TRUNCATE)\b", re.IGNORECASE)
+
+TIMER_REGEX = re.compile(r"^\s*(count|min|max|mean|median|75%|95%|98%|99%|99\.9%)\s*(?:=|<=)\s*"
+                         r"([\d.]+)\s*(\w+)?\s*$")
+
+ERROR_REGEX = re.compile(r"\b(ERROR|Exception|Error:)")
+
+TIMER_FIELDS = {
+    "min": "min",
+    "max": "max",
+    "mean": "mean",
+    "median": "p50",
+    "75%": "p75",
+    "95%": "p95",
+    "98%": "p98",
+    "99%": "p99",
+    "99.9%": "p999",
+}
+
+UNITS_TO_MS = {
+    "nanoseconds": 0.000001,
+    "microseconds": 0.001,
+    "milliseconds": 1.0,
+    "seconds": 1000.0,
+}
+
+
+def parse_replay_output(output):
+    """
+    Parses the output of fqltool replay. Timer metrics in the format of the
+    dropwizard console reporter are turned into latencies in milliseconds, i.e.
+
+    -- Timers ----------------------------------------------------------------------
+    query
+                 count = 1000
+                   min = 0.41 milliseconds
+                  mean = 1.20 milliseconds
+                99.9% <= 9.00 milliseconds
+
+    Other lines naming an error or exception are counted as errors.
+
+    Returns a dict of the form
+    { "queries": 1000, "errors": 0, "latency": { "min": 0.41, "mean": 1.2, "p999": 9.0 } }
+    queries is None and latency is empty if fqltool did not print them.
+    """
+    queries = None
+    errors = 0
+    latency = {}
+    for line in output.splitlines():
+        match = TIMER_REGEX.match(line)
+        if match is not None:
+            (field, value, unit) = match.groups()
+            if field == "count":
+                queries = int(float(value))
+            else:
+                latency[TIMER_FIELDS[field]] = round(float(value) * UNITS_TO_MS.get(unit, 1.0), 3)
+        elif ERROR_REGEX.search(line):
+            errors += 1
+    return dict(queries=queries, errors=errors, latency=latency)
+
+
+def count_replay_queries(n, keyspace, replay_ddl_statements):
+    """
+    Counts the statements fqltool replay will execute by applying its
+    keyspace and DDL filters to the output of fqltool dump.
+    """
+    count = 0
+    for record in n.stream_dump():
+        for query in record['queries']:
+            if not replay_ddl_statements and DDL_REGEX.match(query):
+                continue
+            if keyspace is not None:
+                (query_keyspace, table) = query_table(query, record['keyspace'])
+                if query_keyspace != keyspace:
+                    continue
+            count += 1
+    return count
+
+
+def compare_metrics(baseline, current):
+    """
+    Returns the change of each numeric metric between two replay runs.
+    Latencies are flattened to latency_<field>.
+    """
+    def flatten(metrics):
+        flat = {}
+        for k, v in metrics.items():
+            if k == "latency":
+                for lk, lv in v.items():
+                    flat["latency_{0}".format(lk)] = lv
+            elif isinstance(v, (int, float)) and not isinstance(v, bool):
+                flat[k] = v
+        return flat
+
+    flat_baseline = flatten(baseline)
+    flat_current = flatten(current)
+    comparison = {}
+    for k in sorted(set(flat_baseline) & set(flat_current)):
+        b = flat_baseline[k]
+        c = flat_current[k]
+        if b is None or c is None:
+            continue
+        change_percent = None
+        if b != 0:
+            change_percent = round((c - b) * 100.0 / b, 2)
+        comparison[k] = dict(baseline=b,
+                             current=c,
+                             change=round(c - b, 3),
+                             change_percent=change_percent)
+    return comparison
+
+
+def main():
+    argument_spec = fqltool_argument_spec()
+    argument_spec.update(
+        target_hosts=dict(type='list', elements='str', required=True, aliases=['target']),
+        keyspace=dict(type='str', default=None, no_log=False),
+        replay_ddl_statements=dict(type='bool', default=False),
+        results_dir=dict(type='path', default=None),
+        count_queries=dict(type='bool', default=True),
+        metrics_file=dict(type='path', default=None),
+        baseline_file=dict(type='path', default=None),
+    )
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+    )
+
+    keyspace = module.params['keyspace']
+    replay_ddl_statements = module.params['replay_ddl_statements']
+    baseline_file = module.params['baseline_file']
+    metrics_file = module.params['metrics_file']
+
+    args = []
+    for host in module.params['target_hosts']:
+        args += ["--target", host]
+    if keyspace is not None:
+        args += ["--keyspace", keyspace]
+    if replay_ddl_statements:
+        args.append("--replay-ddl-statements")
+    if module.params['results_dir'] is not None:
+        args += ["--results", module.params['results_dir']]
+
+    n = FqlToolCmd(module)
+    result = dict(changed=False)
+    if module.params['debug']:
+        result['cmd'] = " ".join(n.fqltool_cmd("replay", args))
+
+    baseline = None
+    if baseline_file is not None:
+        try:
+            with open(baseline_file) as f:
+                baseline = json.load(f)
+        except (IOError, OSError, ValueError) as excep:
+            module.fail_json(msg="Unable to read baseline_file: {0}".format(excep), **result)
+
+    if module.check_mode:
+        result['changed'] = True
+        result['msg'] = "The full query log would be replayed (check mode)"
+        module.exit_json(**result)
+
+    try:
+        start = time.time()
+        (rc, out, err) = n.run_command("replay", args)
+        duration = time.time() - start
+    except OSError as excep:
+        module.fail_json(msg="Unable to run fqltool: {0}".format(excep), **result)
+    result['changed'] = True
+    if module.params['debug']:
+        if out:
+            result['stdout'] = out
+        if err:
+            result['stderr'] = err
+    if rc != 0:
+        module.fail_json(msg="fqltool replay failed", rc=rc, stderr=err, **result)
+
+    parsed = parse_replay_output(out + "\n" + err)
+    queries = parsed['queries']
+    if queries is None and module.params['count_queries']:
+        try:
+            queries = count_replay_queries(n, keyspace, replay_ddl_statements)
+        except OSError as excep:
+            module.fail_json(msg="Unable to run fqltool: {0}".format(excep), **result)
+        if n.rc != 0:
+            module.fail_json(msg="fqltool dump failed", rc=n.rc, stderr=n.err, **result)
+
+    replay_metrics = dict(
+        queries=queries,
+        duration_seconds=round(duration, 3),
+        throughput=None,
+        errors=parsed['errors'],
+        latency=parsed['latency'],
+    )
+    if queries is not None and duration > 0:
+        replay_metrics['throughput'] = round(queries / duration, 2)
+    result['replay_metrics'] = replay_metrics
+
+    if baseline is not None:
+        result['comparison'] = compare_metrics(baseline, replay_metrics)
+
+    if metrics_file is not None:
+        write_report_file(module, metrics_file, json.dumps(replay_metrics, indent=2, sort_keys=True))
+        result['metrics_file'] = metrics_file
+
+    result['msg'] = "Replayed the full query log against {0}".format(", ".join(module.params['target_hosts']))
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,277 @@
+#!/usr/bin/python
+
+# 2026 Rhys Campbell <rhyscampbell@bluewin.ch>
+# https://github.com/rhysmeister
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+DOCUMENTATION = '''
+---
+module: cassandra_fullquerylog_report
+author: Rhys Campbell (@rhysmeister)
+short_description: "Summarises the full query log."
+requirements:
+  - fqltool
+description:
+  - "Reads the full query log with fqltool dump and summarises it."
+  - "Statements are normalised by replacing literals with ? so queries of the same shape are counted together."
+  - "Reports call counts, the top query shapes, the distribution per keyspace and table and QPS per time bucket."
+  - "The fqltool output is read line by line so memory use does not grow with the size of the log."
+  - "Use M(community.cassandra.cassandra_fullquerylog) to enable the full query log."
+  - "Supported from Cassandra 4.0 onwards."
+
+extends_documentation_fragment:
+  - community.cassandra.fqltool_module_options
+
+options:
+  top:
+    description:
+      - The number of query shapes to return.
+    type: int
+    default: 10
+  bucket_seconds:
+    description:
+      - The width of the time buckets used to report QPS.
+      - The width is doubled when the log spans more than I(max_buckets) buckets.
+    type: int
+    default: 60
+  max_buckets:
+    description:
+      - The maximum number of QPS buckets to track.
+      - Buckets are folded into buckets of twice the width once there are more than this.
+      - The width used is returned in C(bucket_seconds).
+    type: int
+    default: 1440
+  max_shapes:
+    description:
+      - The maximum number of distinct query shapes and tables to track.
+      - Any further shapes or tables are counted under <other>.
+    type: int
+    default: 10000
+  report_file:
+    description:
+      - Write the report as json to this file.
+      - The module reports changed when the file content changes.
+    type: path
+  roll_cycle:
+    description:
+      - The roll cycle the full query log was written with.
+    type: str
+    choices:
+      - MINUTELY
+      - HOURLY
+      - DAILY
+'''
+
+EXAMPLES = '''
+- name: Summarise the full query log
+  community.cassandra.cassandra_fullquerylog_report:
+    log_dir: /var/log/cassandra/fql
+  register: fql
+
+- name: Summarise the full query log into a json report with 5 minute buckets
+  community.cassandra.cassandra_fullquerylog_report:
+    log_dir: /var/log/cassandra/fql
+    top: 25
+    bucket_seconds: 300
+    report_file: /tmp/fql_report.json
+'''
+
+RETURN = '''
+msg:
+  description: A short description of what the module did.
+  returned: always
+  type: str
+fullquerylog_report:
+  description: The summary of the full query log.
+  returned: success
+  type: dict
+  sample: >
+    { "records": 3, "statements": 4, "first_query_time": 1585755357062, "last_query_time": 1585755418102,
+      "types": { "single-query": 2, "batch": 1 },
+      "top_queries": [ { "query": "SELECT * FROM ks.users WHERE id = ?", "count": 2 } ],
+      "keyspaces": { "ks": 4 }, "tables": { "ks.users": 4 },
+      "bucket_seconds": 60, "qps": [ { "time": 1585755300, "count": 4, "qps": 0.07 } ] }
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+import json
+import re
+__metaclass__ = type
+
+
+from ansible_collections.community.cassandra.plugins.module_utils.fqltool_cmd_objects import FqlToolCmd
+from ansible_collections.community.cassandra.plugins.module_utils.fqltool_cmd_objects import fqltool_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.fqltool_cmd_objects import query_table
+from ansible_collections.community.cassandra.plugins.module_utils.fqltool_cmd_objects import write_report_file
+
+
+OTHER = "<other>"
+
+LITERAL_REGEXES = [
+    re.compile(r"'(?:[^']|'')*'"),  # strings
+    re.compile(r"\$\$.*?\$\$", re.DOTALL),  # dollar quoted strings
+    re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"),  # uuids
+    re.compile(r"\b0[xX][0-9a-fA-F]*\b"),  # blobs
+    re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b"),  # numbers
+    re.compile(r"\b(?:true|false)\b", re.IGNORECASE),  # booleans
+]
+
+IN_LIST_REGEX = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)+\s*\)", re.IGNORECASE)
+
+
+def normalize_query(query):
+    """
+    Replaces the literals in a statement with ? and collapses whitespace
+    so statements that differ only in their values share one shape, i.e.
+    SELECT * FROM ks.users WHERE id IN (1, 2, 3) AND name = 'bob';
+    becomes
+    SELECT * FROM ks.users WHERE id IN (?) AND name = ?
+    """
+    for regex in LITERAL_REGEXES:
+        query = regex.sub("?", query)
+    query = IN_LIST_REGEX.sub("IN (?)", query)
+    return " ".join(query.split()).rstrip(";").strip()
+
+
+class FullQueryLogReport(object):
+
+    """
+    Aggregates parsed full query log records. Memory is bounded by
+    max_shapes and max_buckets rather than by the number of records.
+    Adds the following methods;
+        - add
+        - report
+    """
+
+    def __init__(self, bucket_seconds, max_shapes, max_buckets):
+        self.bucket_seconds = bucket_seconds
+        self.max_shapes = max_shapes
+        self.max_buckets = max_buckets
+        self.records = 0
+        self.statements = 0
+        self.first_query_time = None
+        self.last_query_time = None
+        self.types = {}
+        self.shapes = {}
+        self.keyspaces = {}
+        self.tables = {}
+        self.buckets = {}
+
+    def _count(self, counter, key, bounded=True):
+        if key not in counter and bounded and len(counter) >= self.max_shapes:
+            key = OTHER
+        counter[key] = counter.get(key, 0) + 1
+
+    def _fold_buckets(self):
+        """
+        Doubles the bucket width and merges the existing buckets into the
+        wider ones until there are no more than max_buckets of them
+        """
+        while len(self.buckets) > self.max_buckets:
+            self.bucket_seconds *= 2
+            buckets = {}
+            for (bucket, count) in self.buckets.items():
+                bucket = bucket // self.bucket_seconds * self.bucket_seconds
+                buckets[bucket] = buckets.get(bucket, 0) + count
+            self.buckets = buckets
+
+    def add(self, record):
+        self.records += 1
+        self._count(self.types, record['type'], False)
+        start_time = record['start_time']
+        if start_time is not None:
+            if self.first_query_time is None or start_time < self.first_query_time:
+                self.first_query_time = start_time
+            if self.last_query_time is None or start_time > self.last_query_time:
+                self.last_query_time = start_time
+        for query in record['queries']:
+            self.statements += 1
+            self._count(self.shapes, normalize_query(query))
+            (keyspace, table) = query_table(query, record['keyspace'])
+            self._count(self.keyspaces, keyspace or "<none>")
+            if table is not None:
+                self._count(self.tables, "{0}.{1}".format(keyspace or "<none>", table))
+            if start_time is not None:
+                bucket = start_time // 1000 // self.bucket_seconds * self.bucket_seconds
+                self._count(self.buckets, bucket, False)
+                if len(self.buckets) > self.max_buckets:
+                    self._fold_buckets()
+
+    def report(self, top):
+        top_queries = sorted(self.shapes.items(), key=lambda s: (-s[1], s[0]))[:top]
+        return dict(
+            records=self.records,
+            statements=self.statements,
+            first_query_time=self.first_query_time,
+            last_query_time=self.last_query_time,
+            types=self.types,
+            top_queries=[dict(query=q, count=c) for (q, c) in top_queries],
+            distinct_queries=len([s for s in self.shapes if s != OTHER]),
+            keyspaces=self.keyspaces,
+            tables=self.tables,
+            bucket_seconds=self.bucket_seconds,
+            qps=[dict(time=b,
+                      count=self.buckets[b],
+                      qps=round(float(self.buckets[b]) / self.bucket_seconds, 2))
+                 for b in sorted(self.buckets)],
+        )
+
+
+def main():
+    argument_spec = fqltool_argument_spec()
+    argument_spec.update(
+        top=dict(type='int', default=10),
+        bucket_seconds=dict(type='int', default=60),
+        max_shapes=dict(type='int', default=10000),
+        max_buckets=dict(type='int', default=1440),
+        report_file=dict(type='path', default=None),
+        roll_cycle=dict(type='str', choices=['MINUTELY', 'HOURLY', 'DAILY'], default=None),
+    )
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+    )
+
+    if module.params['bucket_seconds'] < 1:
+        module.fail_json(msg="bucket_seconds must be greater than zero")
+    if module.params['max_buckets'] < 1:
+        module.fail_json(msg="max_buckets must be greater than zero")
+
+    result = dict(changed=False)
+    n = FqlToolCmd(module)
+    if module.params['debug']:
+        result['cmd'] = " ".join(n.fqltool_cmd("dump"))
+
+    report = FullQueryLogReport(module.params['bucket_seconds'],
+                                module.params['max_shapes'],
+                                module.params['max_buckets'])
+    try:
+        for record in n.stream_dump():
+            report.add(record)
+    except OSError as excep:
+        module.fail_json(msg="Unable to run fqltool: {0}".format(excep), **result)
+
+    if n.rc != 0:
+        module.fail_json(msg="fqltool dump failed", rc=n.rc, stderr=n.err, **result)
+    if module.params['debug'] and n.err:
+        result['stderr'] = n.err
+
+    fullquerylog_report = report.report(module.params['top'])
+    result['fullquerylog_report'] = fullquerylog_report
+
+    report_file = module.params['report_file']
+    if report_file is not None:
+        content = json.dumps(fullquerylog_report, indent=2, sort_keys=True)
+        result['changed'] = write_report_file(module, report_file, content)
+        result['report_file'] = report_file
+
+    result['msg'] = "Summarised {0} statements in {1} records".format(fullquerylog_report['statements'],
+                                                                      fullquerylog_report['records'])
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
@@ -19,6 +19,7 @@ description:
 
 extends_documentation_fragment:
   - community.cassandra.nodetool_module_options
+  - community.cassandra.nodetool_job_options
 
 options:
   keyspace:
@@ -51,6 +52,18 @@ EXAMPLES = '''
   community.cassandra.cassandra_garbagecollect:
     keyspace: mykeyspace
     tables: mytable
+
+- name: Start nodetool garbagecollect in the background
+  community.cassandra.cassandra_garbagecollect:
+    state: started
+
+- name: Wait for nodetool garbagecollect to finish
+  community.cassandra.cassandra_garbagecollect:
+    state: status
+  register: job
+  until: not job.job.running
+  retries: 360
+  delay: 60
 '''
 
 RETURN = '''
@@ -58,6 +71,23 @@ msg:
   description: A brief description of what happened.
   returned: success
   type: str
+job:
+  description:
+    - The job record of the detached command with its pid, start and end time, return code \
+      and the tail of its output.
+  returned: when state is set
+  type: dict
+  sample: >
+    { "operation": "garbagecollect", "command": "garbagecollect", "pid": 31337, "start_time": 1792398068.3,
+      "end_time": null, "rc": null, "cancelled": false, "running": true, "elapsed": 842.1,
+      "output_file": "/var/tmp/cassandra_garbagecollect.job.out", "output": "" }
+progress:
+  description: The progress of the operation from nodetool compactionstats.
+  returned: when state is set and the job is running
+  type: dict
+  sample: >
+    { "active": 2, "completed_bytes": 1048576, "total_bytes": 4194304,
+      "progress": 25.0, "remaining_time_seconds": 35 }
 '''
 
 
@@ -67,6 +97,8 @@ __metaclass__ = type
 
 from ansible_collections.community.cassandra.plugins.module_utils.nodetool_cmd_objects import NodeToolCmd
 from ansible_collections.community.cassandra.plugins.module_utils.cassandra_common_options import cassandra_common_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_jobs import nodetool_job_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_jobs import run_nodetool_job
 
 
 class NodeToolCommand(NodeToolCmd):
@@ -105,20 +137,26 @@ def main():
         granularity=dict(type='str', default="ROW", choices=["ROW", "CELL"]),
         jobs=dict(type='int', default=2)
     )
+    argument_spec.update(nodetool_job_argument_spec())
     module = AnsibleModule(
         argument_spec=argument_spec,
-        supports_check_mode=False,
+        supports_check_mode=True,
     )
 
     cmd = 'garbagecollect'
 
     n = NodeToolCommand(module, cmd)
+    if module.params['state'] is not None:
+        run_nodetool_job(module, n, 'garbagecollect', n.cmd)
 
     rc = None
     out = ''
     err = ''
     result = {}
 
+    if module.check_mode:
+        module.exit_json(changed=True, msg="nodetool garbagecollect would be executed (check mode)")
+
     (rc, out, err) = n.run_command()
     out = out.strip()
     err = err.strip()
@@ -0,0 +1,452 @@
+#!/usr/bin/python
+
+# 2026 Rhys Campbell <rhyscampbell@bluewin.ch>
+# https://github.com/rhysmeister
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+DOCUMENTATION = '''
+---
+module: cassandra_gcstats
+author: Rhys Campbell (@rhysmeister)
+short_description: Returns garbage collection statistics from nodetool gcstats and the GC log.
+requirements:
+  - nodetool
+description:
+  - Returns the statistics of nodetool gcstats. Cassandra resets them on each call so they \
+    cover the time since the previous call of gcstats by any client.
+  - Optionally reads the GC log of the node from the offset saved in I(state_file) by the previous run \
+    and returns the pause percentiles, the allocation and promotion rate and the fraction of time spent in \
+    GC pauses since then. Only the new part of the log is read, line by line.
+  - The GC log must be written with the unified logging of Java 11 or later, i.e. C(-Xlog:gc*) with \
+    the uptime or time decoration. G1 and ZGC logs are supported. The promotion rate needs the \
+    G1 C(gc+heap) messages, which the default Cassandra GC options include.
+  - When the log has been rotated or truncated since the previous run it is read from the start.
+  - The values are also returned as the fact I(fact_name) and can be used as a gate, i.e. with \
+    I(wait_until=gc_log.pause_ms.p99 < 200) during a rolling restart. Each poll covers the time since the previous poll.
+  - The offset is saved after each poll and is not saved in check mode.
+
+extends_documentation_fragment:
+  - community.cassandra.nodetool_module_options
+  - community.cassandra.wait_until_options
+
+options:
+  gcstats:
+    description:
+      - Run nodetool gcstats.
+    type: bool
+    default: true
+  gc_log:
+    description:
+      - The GC log to read, i.e. C(/var/log/cassandra/gc.log).
+    type: path
+  state_file:
+    description:
+      - The file the offset reached in each GC log is saved in.
+    type: path
+    default: /var/tmp/cassandra_gcstats.json
+  percentiles:
+    description:
+      - The pause time percentiles to return.
+    type: list
+    elements: float
+    default: [50, 90, 99, 99.9]
+  fact_name:
+    description:
+      - The name of the fact the statistics are returned as.
+      - Set to an empty string to not return a fact.
+    type: str
+    default: cassandra_gcstats
+'''
+
+EXAMPLES = '''
+- name: Get the gc statistics since the previous call
+  community.cassandra.cassandra_gcstats:
+
+- name: Get the gc pauses and rates from the GC log since the previous run
+  community.cassandra.cassandra_gcstats:
+    gc_log: /var/log/cassandra/gc.log
+  register: gc
+
+- name: Show the allocation rate in MB/s
+  ansible.builtin.debug:
+    msg: "{{ (gc.gc_log.allocation_rate_bytes_per_second / 1048576) | round(1) }} MB/s"
+
+- name: Wait until the restarted node has stopped pausing for long
+  community.cassandra.cassandra_gcstats:
+    gc_log: /var/log/cassandra/gc.log
+    wait_until:
+      - gc_log.pause_ms.p99 < 200
+      - gc_log.gc_time_fraction < 0.05
+    poll_interval: 30
+    wait_timeout: 900
+'''
+
+RETURN = '''
+msg:
+  description: A message indicating what has happened.
+  returned: always
+  type: str
+gcstats:
+  description:
+    - The nodetool gcstats values.
+    - gc_time_fraction is the total pause time divided by the interval.
+  returned: when gcstats is true
+  type: dict
+  sample: >
+    { "interval_ms": 225798, "max_gc_elapsed_ms": 31, "total_gc_elapsed_ms": 212,
+      "stdev_gc_elapsed_ms": 6, "gc_reclaimed_bytes": 2069625704, "collections": 17,
+      "direct_memory_bytes": null, "gc_time_fraction": 0.000939 }
+gc_log:
+  description:
+    - The statistics of the part of the GC log read.
+    - window_seconds is the time between the last event of the previous run, or the first event read, and the last event read.
+    - The pause percentiles are 0 when there were no pauses.
+    - The rates are null when they cannot be calculated, i.e. promotion with ZGC.
+  returned: when gc_log is set
+  type: dict
+  sample: >
+    { "path": "/var/log/cassandra/gc.log", "collector": "g1", "rotated": false,
+      "offset": 1836288, "bytes_read": 52311, "window_seconds": 300.2,
+      "pauses": 25, "full_pauses": 0,
+      "pause_ms": { "p50": 11.2, "p90": 18.0, "p99": 31.4, "p99.9": 31.4, "max": 31.4, "total": 301.5 },
+      "gc_time_fraction": 0.001004,
+      "allocated_bytes": 26843545600, "allocation_rate_bytes_per_second": 89419005.3,
+      "promoted_bytes": 104857600, "promotion_rate_bytes_per_second": 349292.5 }
+ansible_facts:
+  description: The gcstats and gc_log values as the fact I(fact_name).
+  returned: when fact_name is set
+  type: dict
+wait:
+  description:
+    - The outcome of I(wait_until).
+    - conditions holds the last value seen for each condition.
+  returned: when wait_until is set
+  type: dict
+rc:
+  description: Return code of the last executed command.
+  returned: on failure
+  type: int
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+import calendar
+import json
+import os
+import re
+import tempfile
+import time
+__metaclass__ = type
+
+
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_cmd_objects import NodeToolCommandSimple
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_common_options import cassandra_common_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_wait_until import wait_until_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_wait_until import run_wait
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_stats import percentile
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_parsers import parse_gcstats
+
+
+DECORATION_REGEX = re.compile(r"^\[([^\]]*)\]\s*")
+UPTIME_REGEX = re.compile(r"^(\d+(?:\.\d+)?)(s|ms)$")
+TIME_REGEX = re.compile(r"^(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d)(?:\.(\d+))?")
+GC_ID_REGEX = re.compile(r"GC\((\d+)\)\s+(.*)$")
+PAUSE_REGEX = re.compile(r"^(?:[YO]: )?(Pause .*?)\s+(\d+(?:\.\d+)?)ms$")
+HEAP_REGEX = re.compile(r"(\d+(?:\.\d+)?)([BKMGT])(?:\(\d+%\))?->(\d+(?:\.\d+)?)([BKMGT])")
+OLD_REGIONS_REGEX = re.compile(r"^Old regions: (\d+)->(\d+)")
+REGION_SIZE_REGEX = re.compile(r"Heap [Rr]egion [Ss]ize: (\d+)([BKMGT])")
+
+UNITS = {'B': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+
+def to_bytes(value, unit):
+    return int(float(value) * UNITS[unit])
+
+
+def event_time(decorations):
+    '''
+    Returns the time of a log line from its decorations, i.e.
+
+    [2026-10-19T10:00:00.123+0000][1234.567s][info][gc]
+
+    The uptime is used when present as it is not affected by clock changes.
+    '''
+    timestamp = None
+    for decoration in decorations:
+        match = UPTIME_REGEX.match(decoration)
+        if match is not None:
+            if match.group(2) == "ms":
+                return float(match.group(1)) / 1000
+            return float(match.group(1))
+        match = TIME_REGEX.match(decoration)
+        if match is not None and timestamp is None:
+            timestamp = calendar.timegm(time.strptime(match.group(1), "%Y-%m-%dT%H:%M:%S"))
+            if match.group(2):
+                timestamp += float("0." + match.group(2))
+    return timestamp
+
+
+class GCLogStats(object):
+
+    """
+    Accumulates the pauses and heap changes of the GC log lines fed to it,
+    i.e. for G1
+
+    [1234.567s][info][gc,heap] GC(12) Old regions: 100->102
+    [1234.567s][info][gc     ] GC(12) Pause Young (Normal) (G1 Evacuation Pause) 1024M->256M(4096M) 12.345ms
+
+    and for ZGC
+
+    [1234.567s][info][gc,phases] GC(3) Pause Mark Start 0.012ms
+    [1234.890s][info][gc       ] GC(3) Garbage Collection (Warmup) 1024M(10%)->256M(3%)
+
+    Adds the following methods;
+        - feed
+        - result
+    """
+
+    def __init__(self, region_size=None, collector=None, heap_after=None):
+        self.region_size = region_size
+        self.collector = collector
+        self.first_time = None
+        self.last_time = None
+        self.pauses = []
+        self.full_pauses = 0
+        self.allocated = 0
+        self.last_heap_after = heap_after
+        self.old_regions = {}
+        self.young_ids = set()
+
+    def feed(self, line):
+        decorations = []
+        match = DECORATION_REGEX.match(line)
+        while match is not None:
+            decorations.append(match.group(1).strip())
+            line = line[match.end():]
+            match = DECORATION_REGEX.match(line)
+        message = line.strip()
+
+        match = REGION_SIZE_REGEX.search(message)
+        if match is not None:
+            self.region_size = to_bytes(match.group(1), match.group(2))
+        if self.collector is None:
+            if "Using G1" in message:
+                self.collector = "g1"
+            elif "Using The Z Garbage Collector" in message:
+                self.collector = "zgc"
+
+        match = GC_ID_REGEX.search(message)
+        if match is None:
+            return
+        gc_id = int(match.group(1))
+        message = match.group(2)
+        t = event_time(decorations)
+        if t is not None:
+            if self.first_time is None:
+                self.first_time = t
+            self.last_time = t
+
+        match = OLD_REGIONS_REGEX.match(message)
+        if match is not None:
+            self.old_regions[gc_id] = (int(match.group(1)), int(match.group(2)))
+            return
+
+        heap = None
+        match = PAUSE_REGEX.match(message)
+        if match is not None:
+            name = match.group(1)
+            self.pauses.append(float(match.group(2)))
+            if name.startswith("Pause Full"):
+                self.full_pauses += 1
+            elif name.startswith("Pause Young"):
+                self.young_ids.add(gc_id)
+                if self.collector is None:
+                    self.collector = "g1"
+            heap = HEAP_REGEX.search(name)
+        elif "Collection (" in message:
+            if self.collector is None:
+                self.collector = "zgc"
+            heap = HEAP_REGEX.search(message)
+
+        if heap is not None:
+            before = to_bytes(heap.group(1), heap.group(2))
+            after = to_bytes(heap.group(3), heap.group(4))
+            # What was allocated since the previous collection left the heap
+            if self.last_heap_after is not None and before >= self.last_heap_after:
+                self.allocated += before - self.last_heap_after
+            self.last_heap_after = after
+
+    def result(self, percentiles, window_start):
+        pauses = sorted(self.pauses)
+        pause_ms = dict(("p{0:g}".format(p), percentile(pauses, p) if pauses else 0.0) for p in percentiles)
+        pause_ms['max'] = pauses[-1] if pauses else 0.0
+        pause_ms['total'] = round(sum(pauses), 3)
+
+        window = None
+        if window_start is None:
+            window_start = self.first_time
+        if window_start is not None and self.last_time is not None and self.last_time > window_start:
+            window = round(self.last_time - window_start, 3)
+
+        promoted = None
+        if self.collector != "zgc" and self.region_size is not None and self.young_ids:
+            promoted = 0
+            for gc_id in self.young_ids:
+                if gc_id in self.old_regions:
+                    (before, after) = self.old_regions[gc_id]
+                    promoted += max(after - before, 0) * self.region_size
+
+        def rate(value):
+            if value is None or window is None:
+                return None
+            return round(value / window, 1)
+
+        return dict(collector=self.collector or "unknown",
+                    window_seconds=window,
+                    pauses=len(pauses),
+                    full_pauses=self.full_pauses,
+                    pause_ms=pause_ms,
+                    gc_time_fraction=round(sum(pauses) / 1000 / window, 6) if window else None,
+                    allocated_bytes=self.allocated,
+                    allocation_rate_bytes_per_second=rate(self.allocated),
+                    promoted_bytes=promoted,
+                    promotion_rate_bytes_per_second=rate(promoted))
+
+
+def read_gc_log(module, path, saved, percentiles):
+    '''
+    Reads the complete lines of the GC log added since saved, the dict
+    kept in the state file for the log, i.e.
+
+    { "inode": 1048602, "offset": 1836288, "last_time": 1234.567,
+      "region_size": 4194304, "collector": "g1", "heap_after": 268435456 }
+
+    Returns (stats, new saved dict).
+    '''
+    try:
+        st = os.stat(path)
+    except OSError as excep:
+        module.fail_json(msg="Unable to read {0}: {1}".format(path, excep))
+    rotated = saved is not None and (saved['inode'] != st.st_ino or saved['offset'] > st.st_size)
+    if saved is None or rotated:
+        saved = dict(inode=st.st_ino, offset=0, last_time=None, region_size=None, collector=None, heap_after=None)
+
+    stats = GCLogStats(saved.get('region_size'), saved.get('collector'), saved.get('heap_after'))
+    offset = saved['offset']
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # still being written, read on the next run
+            offset += len(line)
+            stats.feed(line.decode('utf-8', 'replace'))
+
+    window_start = saved['last_time']
+    if window_start is not None and stats.first_time is not None and stats.first_time < window_start:
+        window_start = None  # the JVM restarted and the uptime began again
+    gc_log = stats.result(percentiles, window_start)
+    gc_log.update(path=path,
+                  rotated=rotated,
+                  offset=offset,
+                  bytes_read=offset - saved['offset'])
+    new_saved = dict(inode=st.st_ino,
+                     offset=offset,
+                     last_time=stats.last_time if stats.last_time is not None else saved['last_time'],
+                     region_size=stats.region_size,
+                     collector=stats.collector,
+                     heap_after=stats.last_heap_after)
+    return (gc_log, new_saved)
+
+
+def read_state_file(module, state_file):
+    if not os.path.exists(state_file):
+        return {}
+    try:
+        with open(state_file) as f:
+            return json.load(f)
+    except (IOError, ValueError) as excep:
+        module.fail_json(msg="Unable to read {0}: {1}".format(state_file, excep))
+
+
+def write_state_file(module, state_file, state):
+    (fd, tmp_path) = tempfile.mkstemp(dir=os.path.dirname(state_file) or ".")
+    with os.fdopen(fd, 'w') as f:
+        f.write(json.dumps(state, indent=2, sort_keys=True))
+    module.atomic_move(tmp_path, state_file)
+
+
+def main():
+    argument_spec = cassandra_common_argument_spec()
+    argument_spec.update(wait_until_argument_spec())
+    argument_spec.update(
+        gcstats=dict(type='bool', default=True),
+        gc_log=dict(type='path'),
+        state_file=dict(type='path', default='/var/tmp/cassandra_gcstats.json'),
+        percentiles=dict(type='list', elements='float', default=[50, 90, 99, 99.9]),
+        fact_name=dict(type='str', default='cassandra_gcstats'),
+    )
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+    )
+
+    debug = module.params['debug']
+    gc_log = module.params['gc_log']
+    state_file = module.params['state_file']
+    percentiles = module.params['percentiles']
+    fact_name = module.params['fact_name']
+
+    if not module.params['gcstats'] and gc_log is None:
+        module.fail_json(msg="Nothing to do, gcstats is false and no gc_log given")
+    for p in percentiles:
+        if not 0 < p <= 100:
+            module.fail_json(msg="percentiles must be greater than 0 and at most 100")
+
+    result = dict(changed=False)
+    n = None
+    if module.params['gcstats']:
+        n = NodeToolCommandSimple(module, "gcstats")
+    state = read_state_file(module, state_file) if gc_log is not None else {}
+
+    def get_gcstats():
+        facts = {}
+        if n is not None:
+            (rc, out, err) = n.run_command()
+            if rc != 0:
+                result['msg'] = "nodetool error: {0}".format(err)
+                result['rc'] = rc
+                module.fail_json(**result)
+            if debug:
+                result['stdout'] = out
+                if err:
+                    result['stderr'] = err
+            gcstats = parse_gcstats(out)
+            if gcstats is None:
+                result['msg'] = "Unable to parse the nodetool gcstats output"
+                result['stdout'] = out
+                module.fail_json(**result)
+            gcstats['gc_time_fraction'] = None
+            if gcstats['interval_ms']:
+                gcstats['gc_time_fraction'] = round(float(gcstats['total_gc_elapsed_ms']) / gcstats['interval_ms'], 6)
+            facts['gcstats'] = gcstats
+        if gc_log is not None:
+            (facts['gc_log'], state[gc_log]) = read_gc_log(module, gc_log, state.get(gc_log), percentiles)
+            if not module.check_mode:
+                write_state_file(module, state_file, state)
+        result.update(facts)
+        if fact_name:
+            result['ansible_facts'] = {fact_name: facts}
+        return facts
+
+    run_wait(module, get_gcstats, result)
+    if 'wait' in result:
+        result['msg'] = "GC conditions met after {0} polls".format(result['wait']['polls'])
+    else:
+        result['msg'] = "GC statistics returned"
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/python
+
+# 2026 Rhys Campbell <rhyscampbell@bluewin.ch>
+# https://github.com/rhysmeister
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+DOCUMENTATION = '''
+---
+module: cassandra_histograms
+author: Rhys Campbell (@rhysmeister)
+short_description: Returns latency and size histograms.
+requirements:
+  - nodetool
+description:
+  - Returns the percentiles of the coordinator latency histograms from nodetool proxyhistograms \
+    and of the per table histograms from nodetool tablehistograms.
+  - Percentiles are returned as p50, p75, p95, p98, p99, min and max.
+  - Latencies are in microseconds and partition sizes in bytes.
+  - Pass the histograms registered before a change as I(baseline) to get the difference, \
+    i.e. to measure the effect of M(community.cassandra.cassandra_concurrency) or \
+    M(community.cassandra.cassandra_compactionthroughput).
+
+extends_documentation_fragment:
+  - community.cassandra.nodetool_module_options
+
+options:
+  proxy:
+    description:
+      - Return the coordinator histograms from nodetool proxyhistograms.
+    type: bool
+    default: true
+  tables:
+    description:
+      - Return the histograms of these tables from nodetool tablehistograms.
+      - Tables are given as keyspace.table.
+    type: list
+    elements: str
+  baseline:
+    description:
+      - The histograms value registered from a previous run of this module.
+      - When given the module also returns the difference of each percentile.
+    type: dict
+'''
+
+EXAMPLES = '''
+- name: Get the coordinator histograms before the change
+  community.cassandra.cassandra_histograms:
+    tables:
+      - myapp.users
+  register: before
+
+- name: Raise the number of concurrent reads
+  community.cassandra.cassandra_concurrency:
+    concurrency_type: default
+    concurrency_stage: ReadStage
+    value: 64
+
+- name: Let the histograms settle
+  ansible.builtin.pause:
+    minutes: 10
+
+- name: Get the histograms after the change
+  community.cassandra.cassandra_histograms:
+    tables:
+      - myapp.users
+    baseline: "{{ before.histograms }}"
+  register: after
+
+- name: Show the change of the p99 read latency
+  ansible.builtin.debug:
+    var: after.diff.proxy.read_latency.p99
+'''
+
+RETURN = '''
+msg:
+  description: A message indicating what has happened.
+  returned: always
+  type: str
+histograms:
+  description:
+    - The percentiles of each histogram.
+    - proxy holds read_latency, write_latency, range_latency, cas_read_latency, \
+      cas_write_latency and view_write_latency as far as the Cassandra version reports them.
+    - Each table holds read_latency, write_latency, sstables, partition_size and cell_count.
+  returned: on success
+  type: dict
+  sample: >
+    { "proxy": { "read_latency": { "p50": 315.85, "p75": 454.83, "p95": 785.94, "p98": 1131.75,
+                                   "p99": 1358.1, "min": 42.51, "max": 3379.39 } },
+      "tables": { "myapp.users": { "partition_size": { "p50": 124, "p75": 149, "p95": 179, "p98": 179,
+                                                       "p99": 179, "min": 104, "max": 179 } } } }
+diff:
+  description:
+    - The difference of each percentile present in both I(baseline) and histograms.
+    - change_percent is null when the baseline value is 0.
+  returned: when baseline is set
+  type: dict
+  sample: >
+    { "proxy": { "read_latency": { "p99": { "baseline": 1358.1, "current": 1131.75,
+                                            "change": -226.35, "change_percent": -16.67 } } } }
+rc:
+  description: Return code of the last executed command.
+  returned: on failure
+  type: int
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+__metaclass__ = type
+
+
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_cmd_objects import NodeToolCmd
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_common_options import cassandra_common_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_parsers import parse_histograms
+
+
+def diff_histograms(baseline, current):
+    '''
+    Walks two histograms values and returns the difference of each
+    number present in both, i.e.
+
+    { "proxy": { "read_latency": { "p99": { "baseline": 1358.1, "current": 1131.75,
+                                            "change": -226.35, "change_percent": -16.67 } } } }
+    '''
+    diff = {}
+    for key in current:
+        if key not in baseline:
+            continue
+        b = baseline[key]
+        c = current[key]
+        if isinstance(c, dict) and isinstance(b, dict):
+            sub_diff = diff_histograms(b, c)
+            if sub_diff:
+                diff[key] = sub_diff
+        elif isinstance(c, (int, float)) and isinstance(b, (int, float)) \
+                and not isinstance(c, bool) and not isinstance(b, bool):
+            change_percent = None
+            if b != 0:
+                change_percent = round((c - b) * 100.0 / b, 2)
+            diff[key] = dict(baseline=b,
+                             current=c,
+                             change=round(c - b, 3),
+                             change_percent=change_percent)
+    return diff
+
+
+def main():
+    argument_spec = cassandra_common_argument_spec()
+    argument_spec.update(
+        proxy=dict(type='bool', default=True),
+        tables=dict(type='list', elements='str', default=None),
+        baseline=dict(type='dict', default=None),
+    )
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+    )
+
+    proxy = module.params['proxy']
+    tables = module.params['tables'] or []
+    baseline = module.params['baseline']
+    debug = module.params['debug']
+
+    for table in tables:
+        if len(table.split(".")) != 2:
+            module.fail_json(msg="Tables must be given as keyspace.table: {0}".format(table))
+    if not proxy and not tables:
+        module.fail_json(msg="Nothing to do, set proxy or tables")
+
+    result = dict(changed=False)
+    n = NodeToolCmd(module)
+
+    def run_histograms(cmd):
+        (rc, out, err) = n.nodetool_cmd(cmd)
+        if debug:
+            result.setdefault('stdout_list', []).append(out)
+        if rc != 0:
+            result['msg'] = "nodetool error: {0}".format(err)
+            result['rc'] = rc
+            module.fail_json(**result)
+        return parse_histograms(out)
+
+    histograms = {}
+    if proxy:
+        histograms['proxy'] = run_histograms("proxyhistograms")
+    if tables:
+        histograms['tables'] = {}
+        for table in tables:
+            (keyspace, table_name) = table.split(".")
+            cmd = "tablehistograms {0} {1}".format(keyspace, table_name)
+            histograms['tables'][table] = run_histograms(cmd)
+    result['histograms'] = histograms
+
+    if baseline is not None:
+        result['diff'] = diff_histograms(baseline, histograms)
+
+    result['msg'] = "Histograms returned"
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
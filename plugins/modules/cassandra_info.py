@@ -0,0 +1,136 @@
+#!/usr/bin/python
+
+# 2026 Rhys Campbell <rhyscampbell@bluewin.ch>
+# https://github.com/rhysmeister
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+DOCUMENTATION = '''
+---
+module: cassandra_info
+author: Rhys Campbell (@rhysmeister)
+short_description: Returns the output of nodetool info as typed values.
+requirements:
+  - nodetool
+description:
+  - Returns the load, heap and off heap memory, uptime, exceptions, every cache, the percent repaired \
+    and the tokens of the node from one call of nodetool info.
+  - Sizes are returned in bytes, rates as a fraction and NaN values as null.
+  - The values are also returned as the fact I(fact_name) so decisions about caches and the heap \
+    can be made in later tasks without running nodetool again.
+
+extends_documentation_fragment:
+  - community.cassandra.nodetool_module_options
+
+options:
+  tokens:
+    description:
+      - Return all tokens of the node rather than the first one, i.e. when num_tokens is greater than 1.
+    type: bool
+    default: false
+  fact_name:
+    description:
+      - The name of the fact the values are returned as.
+      - Set to an empty string to not return a fact.
+    type: str
+    default: cassandra_info
+'''
+
+EXAMPLES = '''
+- name: Get the node info
+  community.cassandra.cassandra_info:
+
+- name: Show the heap usage
+  ansible.builtin.debug:
+    msg: "{{ cassandra_info.heap_memory_mb.used }} of {{ cassandra_info.heap_memory_mb.total }} MB used"
+
+- name: Get all tokens of the node
+  community.cassandra.cassandra_info:
+    tokens: true
+  register: info
+'''
+
+RETURN = '''
+msg:
+  description: A message indicating what has happened.
+  returned: always
+  type: str
+info:
+  description:
+    - The values of nodetool info.
+    - Fields nodetool does not print in the Cassandra version used are not returned.
+  returned: on success
+  type: dict
+  sample: >
+    { "id": "f4ee490c-df8e-4a8d-9236-320903697fbf", "gossip_active": true,
+      "native_transport_active": true, "load_bytes": 148654, "generation_no": 1638800353,
+      "uptime_seconds": 225798, "heap_memory_mb": { "used": 258.26, "total": 495.0 },
+      "off_heap_memory_mb": 0.0, "data_center": "datacenter1", "rack": "rack1", "exceptions": 10,
+      "key_cache": { "entries": 10, "size_bytes": 896, "capacity_bytes": 25165824, "hits": 48,
+                     "requests": 62, "recent_hit_rate": 0.774, "save_period_seconds": 14400 },
+      "row_cache": { "entries": 0, "size_bytes": 0, "capacity_bytes": 0, "hits": 0,
+                     "requests": 0, "recent_hit_rate": null, "save_period_seconds": 0 },
+      "percent_repaired": 100.0, "tokens": [ "-6148914691236517206" ] }
+ansible_facts:
+  description: The info values as the fact I(fact_name).
+  returned: when fact_name is set
+  type: dict
+rc:
+  description: Return code of the last executed command.
+  returned: on failure
+  type: int
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+__metaclass__ = type
+
+
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_cmd_objects import NodeToolCommandSimple
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_common_options import cassandra_common_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_parsers import parse_info
+
+
+def main():
+    argument_spec = cassandra_common_argument_spec()
+    argument_spec.update(
+        tokens=dict(type='bool', default=False),
+        fact_name=dict(type='str', default='cassandra_info'),
+    )
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+    )
+
+    fact_name = module.params['fact_name']
+    cmd = "info"
+    if module.params['tokens']:
+        cmd = "info --tokens"
+
+    result = dict(changed=False)
+    n = NodeToolCommandSimple(module, cmd)
+    (rc, out, err) = n.run_command()
+    if module.params['debug']:
+        result['stdout'] = out
+        if err:
+            result['stderr'] = err
+    if rc != 0:
+        result['msg'] = "nodetool error: {0}".format(err)
+        result['rc'] = rc
+        module.fail_json(**result)
+
+    info = parse_info(out)
+    if 'id' not in info:
+        result['msg'] = "Unable to parse the nodetool info output"
+        result['stdout'] = out
+        module.fail_json(**result)
+    result['info'] = info
+    if fact_name:
+        result['ansible_facts'] = {fact_name: info}
+    result['msg'] = "Node info returned"
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
@@ -66,65 +66,37 @@ msg:
 '''
 
 from ansible.module_utils.basic import AnsibleModule
-import re
 __metaclass__ = type
 
 
 from ansible_collections.community.cassandra.plugins.module_utils.nodetool_cmd_objects import NodeToolCommandSimple
 from ansible_collections.community.cassandra.plugins.module_utils.cassandra_common_options import cassandra_common_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_parsers import parse_info
 
 
 def parse_cache_info(info, module, fake_counter):
     """
-    This function parses the output from the nodetool  info command
-    in order to return the cache info, i.e.
-    'ID                     : f4ee490c-df8e-4a8d-9236-320903697fbf
-    Gossip active          : true
-    Native Transport active: true
-    Load                   : 145.17 KiB
-    Generation No          : 1638800353
-    Uptime (seconds)       : 225798
-    Heap Memory (MB)       : 258.26 / 495.00
-    Off Heap Memory (MB)   : 0.00
-    Data Center            : datacenter1
-    Rack                   : rack1
-    Exceptions             : 10
-    Key Cache              : entries 10, size 896 bytes, capacity 24 MiB, 48 hits, 62 requests, 0.774 recent hit rate, 14400 save period in seconds
-    Row Cache              : entries 0, size 0 bytes, capacity 0 bytes, 0 hits, 0 requests, NaN recent hit rate, 0 save period in seconds
-    Counter Cache          : entries 0, size 0 bytes, capacity 12 MiB, 0 hits, 0 requests, NaN recent hit rate, 7200 save period in seconds
-    Percent Repaired       : 100.0%
-    Token                  : -6148914691236517206'
+    Returns the number of entries in each cache from the nodetool info
+    output parsed by parse_info, i.e.
 
     {
       "key_cache_entries": 10,
       "row_cache_entries": 0,
       "counter_cache_entries": 0
     }
-
-    TODO - This should be placed into common code and unit tested
     """
-    key_cache_entries = None
-    row_cache_entries = None
-    counter_cache_entries = None
-    try:
-        if fake_counter:
-            key_cache_entries = 100
-            row_cache_entries = 100
-            counter_cache_entries = 100
-        else:
-            p = re.compile(r"Key Cache .*: entries \d+")
-            key_cache_entries = int(p.search(info).group(0).split()[-1:][0])
-            p = re.compile(r"Row Cache .*: entries \d+")
-            row_cache_entries = int(p.search(info).group(0).split()[-1:][0])
-            p = re.compile(r"Counter Cache .*: entries \d+")
-            counter_cache_entries = int(p.search(info).group(0).split()[-1:][0])
-    except Exception as excep:
-        module.fail_json(msg="Error parsing info output: {0}".format(excep))
-    if key_cache_entries is None or row_cache_entries is None or counter_cache_entries is None:
-        module.fail_json(msg="Unable to get cache info")
-    return {"key_cache_entries": key_cache_entries,
-            "row_cache_entries": row_cache_entries,
-            "counter_cache_entries": counter_cache_entries}
+    if fake_counter:
+        return {"key_cache_entries": 100,
+                "row_cache_entries": 100,
+                "counter_cache_entries": 100}
+    parsed = parse_info(info)
+    cache_info = {}
+    for cache in ["key", "row", "counter"]:
+        entries = parsed.get("{0}_cache".format(cache), {}).get('entries')
+        if entries is None:
+            module.fail_json(msg="Unable to get cache info")
+        cache_info["{0}_cache_entries".format(cache)] = entries
+    return cache_info
 
 
 def main():
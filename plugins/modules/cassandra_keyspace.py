@@ -17,31 +17,11 @@ description:
       supported to migrate between replication strategies \
       i.e. NetworkTopologyStrategy -> SimpleStrategy."
 author: Rhys Campbell (@rhysmeister)
+extends_documentation_fragment:
+  - community.cassandra.cassandra_cql_options
+  - community.cassandra.session_daemon_options
+
 options:
-  login_user:
-    description: The Cassandra user to login with.
-    type: str
-  login_password:
-    description: The Cassandra password to login with.
-    type: str
-  ssl:
-    description: Uses SSL encryption if basic SSL encryption is enabled on Cassandra cluster (without client/server verification)
-    type: bool
-    default: False
-  ssl_cert_reqs:
-    description: SSL verification mode.
-    type: str
-    choices:
-      - 'CERT_NONE'
-      - 'CERT_OPTIONAL'
-      - 'CERT_REQUIRED'
-    default: 'CERT_NONE'
-  ssl_ca_certs:
-    description:
-        The SSL CA chain or certificate location to confirm supplied certificate validity
-        (required when ssl_cert_reqs is set to CERT_OPTIONAL or CERT_REQUIRED)
-    type: str
-    default: ''
   login_host:
     description:
       - The Cassandra hostname.
@@ -49,10 +29,6 @@ options:
       - Otherwise the value returned by socket.getfqdn() is used.
     type: list
     elements: str
-  login_port:
-    description: The Cassandra poret.
-    type: int
-    default: 9042
   name:
     description: The name of the keyspace to create or manage.
     type: str
@@ -85,6 +61,14 @@ options:
     type: dict
     aliases:
       - data_centers
+  coordinator_only:
+    description:
+      - Only connect to the hosts supplied in I(login_host).
+      - "Connection pools are restricted to these hosts with a whitelist load balancing \
+        policy and topology, status and token discovery is disabled."
+      - Connection time then remains constant regardless of the size of the cluster.
+    type: bool
+    default: false
   consistency_level:
     description:
       - Consistency level to perform cassandra queries with.
@@ -163,32 +147,41 @@ msg:
 __metaclass__ = type
 import re
 import socket
-import os.path
-
-try:
-    from cassandra.cluster import Cluster, AuthenticationFailed
-    from cassandra.cluster import EXEC_PROFILE_DEFAULT
-    from cassandra.cluster import ExecutionProfile
-    from cassandra.auth import PlainTextAuthProvider
-    from cassandra import ConsistencyLevel
-    HAS_CASSANDRA_DRIVER = True
-except Exception:
-    HAS_CASSANDRA_DRIVER = False
 
 from ansible.module_utils.basic import AnsibleModule
-
-try:
-    from ssl import SSLContext, PROTOCOL_TLS
-    import ssl as ssl_lib
-    HAS_SSL_LIBRARY = True
-except Exception:
-    HAS_SSL_LIBRARY = False
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_common_options import CONSISTENCY_LEVELS
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_cql import cassandra_cql_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_cql import check_ssl_options
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_cql import get_auth_provider
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_cql import get_read_and_write_sessions
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_cql import get_ssl_context
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_session_daemon import (
+    RemoteSession,
+    SessionDaemonError,
+    get_session_daemon_sessions,
+    session_daemon_argument_spec,
+)
 
 # =========================================
 # Cassandra module specific support methods
 # =========================================
 
 
+def import_cassandra_driver():
+    '''
+    Imports the cassandra driver into the module namespace.
+    This is deferred until a connection is needed so that argument
+    validation and early failures don't pay the driver import cost.
+    Returns False if the driver is not installed.
+    '''
+    global AuthenticationFailed
+    try:
+        from cassandra.cluster import AuthenticationFailed
+    except Exception:
+        return False
+    return True
+
+
 # Does the keyspace exists on the cluster? TODO Better to use cluster.metadata.keyspaces here?
 def keyspace_exists(session, keyspace):
     server_version = session.execute("SELECT release_version FROM system.local WHERE key='local'")[0]
@@ -205,6 +198,8 @@ def keyspace_exists(session, keyspace):
 
 
 def get_keyspace(cluster, keyspace):
+    if isinstance(cluster, RemoteSession):
+        return cluster.export_keyspace(keyspace)
     return cluster.metadata.keyspaces[keyspace].export_as_string()
 
 
@@ -275,78 +270,31 @@ def keyspace_is_changed(module, cluster, keyspace, replication_factor,
     return keyspace_definition_changed
 
 
-def get_read_and_write_sessions(login_host,
-                                login_port,
-                                auth_provider,
-                                ssl_context,
-                                consistency_level):
-    profile = ExecutionProfile(
-        consistency_level=ConsistencyLevel.name_to_value[consistency_level])
-    if consistency_level in ["ANY", "EACH_QUORUM"]:  # Not supported for reads
-        cluster_r = Cluster(login_host,
-                            port=login_port,
-                            auth_provider=auth_provider,
-                            ssl_context=ssl_context)  # Will be LOCAL_ONE
-    else:
-        cluster_r = Cluster(login_host,
-                            port=login_port,
-                            auth_provider=auth_provider,
-                            ssl_context=ssl_context,
-                            execution_profiles={EXEC_PROFILE_DEFAULT: profile})
-    if consistency_level in ["SERIAL", "LOCAL_SERIAL"]:  # Not supported for writes
-        cluster_w = Cluster(login_host,
-                            port=login_port,
-                            auth_provider=auth_provider,
-                            ssl_context=ssl_context)  # Will be LOCAL_ONE
-    else:
-        cluster_w = Cluster(login_host,
-                            port=login_port,
-                            auth_provider=auth_provider,
-                            ssl_context=ssl_context,
-                            execution_profiles={EXEC_PROFILE_DEFAULT: profile})
-    return (cluster_r, cluster_w)  # Return a tuple of sessions for C* (read, write)
-
 ############################################
 
 
 def main():
-    module = AnsibleModule(
-        argument_spec=dict(
-            login_user=dict(type='str'),
-            login_password=dict(type='str', no_log=True),
-            ssl=dict(type='bool', default=False),
-            ssl_cert_reqs=dict(type='str',
+    argument_spec = cassandra_cql_argument_spec()
+    argument_spec.update(
+        login_host=dict(type='list', elements='str', default=None),
+        name=dict(type='str', required=True),
+        state=dict(type='str', required=True, choices=['present', 'absent']),
+        replication_factor=dict(type='int', default=1),
+        durable_writes=dict(type='bool', default=True),
+        data_centres=dict(type='dict', aliases=['data_centers']),
+        coordinator_only=dict(type='bool', default=False),
+        consistency_level=dict(type='str',
                                required=False,
-                               default='CERT_NONE',
-                               choices=['CERT_NONE',
-                                        'CERT_OPTIONAL',
-                                        'CERT_REQUIRED']),
-            ssl_ca_certs=dict(type='str', default=''),
-            login_host=dict(type='list', elements='str', default=None),
-            login_port=dict(type='int', default=9042),
-            name=dict(type='str', required=True),
-            state=dict(type='str', required=True, choices=['present', 'absent']),
-            replication_factor=dict(type='int', default=1),
-            durable_writes=dict(type='bool', default=True),
-            data_centres=dict(type='dict', aliases=['data_centers']),
-            consistency_level=dict(type='str',
-                                   required=False,
-                                   default="LOCAL_ONE",
-                                   choices=ConsistencyLevel.name_to_value.keys())),
+                               default="LOCAL_ONE",
+                               choices=CONSISTENCY_LEVELS))
+    argument_spec.update(session_daemon_argument_spec())
+    module = AnsibleModule(
+        argument_spec=argument_spec,
         supports_check_mode=True
     )
 
-    if HAS_CASSANDRA_DRIVER is False:
-        msg = ("This module requires the cassandra-driver python"
-               " driver. You can probably install it with pip"
-               " install cassandra-driver.")
-        module.fail_json(msg=msg)
-
-    login_user = module.params['login_user']
-    login_password = module.params['login_password']
     login_host = module.params['login_host']
     login_port = module.params['login_port']
-    ssl = module.params['ssl']
     if login_host is None:
         login_host = []
         s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -363,24 +311,10 @@ def main():
     durable_writes = module.params['durable_writes']
     data_centres = module.params['data_centres']
     consistency_level = module.params['consistency_level']
+    coordinator_only = module.params['coordinator_only']
+    session_daemon = module.params['session_daemon']
 
-    if HAS_SSL_LIBRARY is False and ssl is True:
-        msg = ("This module requires the SSL python"
-               " library. You can probably install it with pip"
-               " install ssl.")
-        module.fail_json(msg=msg)
-
-    ssl_cert_reqs = module.params['ssl_cert_reqs']
-    ssl_ca_certs = module.params['ssl_ca_certs']
-
-    if ssl_cert_reqs in ('CERT_REQUIRED', 'CERT_OPTIONAL') and ssl_ca_certs == '':
-        msg = ("When verify mode is set to CERT_REQUIRED or CERT_OPTIONAL"
-               "ssl_ca_certs is also required to be set and not empty")
-        module.fail_json(msg=msg)
-
-    if ssl_cert_reqs in ('CERT_REQUIRED', 'CERT_OPTIONAL') and os.path.exists(ssl_ca_certs) is not True:
-        msg = ("ssl_ca_certs certificate: File not found")
-        module.fail_json(msg=msg)
+    check_ssl_options(module)
 
     result = dict(
         changed=False,
@@ -390,34 +324,39 @@ def main():
     # For now we won't change the replication strategy & options if the keyspace already exists
     # If and when we do we might only support updating the options rather than the replication class itself
 
-    try:
-        auth_provider = None
-        if login_user is not None:
-            auth_provider = PlainTextAuthProvider(
-                username=login_user,
-                password=login_password
-            )
-        ssl_context = None
-        if ssl is True:
-            ssl_context = SSLContext(PROTOCOL_TLS)
-            ssl_context.verify_mode = getattr(ssl_lib, module.params['ssl_cert_reqs'])
-            if ssl_cert_reqs in ('CERT_REQUIRED', 'CERT_OPTIONAL'):
-                ssl_context.load_verify_locations(module.params['ssl_ca_certs'])
-
-        sessions = get_read_and_write_sessions(login_host,
-                                               login_port,
-                                               auth_provider,
-                                               ssl_context,
-                                               consistency_level)
-
-        cluster = sessions[1]  # maintain cluster object for comptbility
-        session_r = sessions[0].connect()
-        session_w = sessions[1].connect()
-
-    except AuthenticationFailed as excep:
-        module.fail_json(msg="Authentication failed: {0}".format(excep))
-    except Exception as excep:
-        module.fail_json(msg="Error connecting to cluster: {0}".format(excep))
+    def connect():
+        # Runs inside the session daemon when session_daemon is set so
+        # the module itself never imports the driver
+        return get_read_and_write_sessions(login_host,
+                                           login_port,
+                                           get_auth_provider(module),
+                                           get_ssl_context(module),
+                                           consistency_level,
+                                           coordinator_only)
+
+    if session_daemon:
+        try:
+            (session_r, session_w) = get_session_daemon_sessions(module, connect)
+        except SessionDaemonError as excep:
+            module.fail_json(msg=str(excep))
+        except Exception as excep:
+            module.fail_json(msg="Error connecting to cluster: {0}".format(excep))
+        cluster = session_w  # export_keyspace is served by the daemon
+    else:
+        if import_cassandra_driver() is False:
+            msg = ("This module requires the cassandra-driver python"
+                   " driver. You can probably install it with pip"
+                   " install cassandra-driver.")
+            module.fail_json(msg=msg)
+        try:
+            sessions = connect()
+            cluster = sessions[1]  # maintain cluster object for comptbility
+            session_r = sessions[0].connect()
+            session_w = sessions[1].connect()
+        except AuthenticationFailed as excep:
+            module.fail_json(msg="Authentication failed: {0}".format(excep))
+        except Exception as excep:
+            module.fail_json(msg="Error connecting to cluster: {0}".format(excep))
 
     try:
         if keyspace_exists(session_r, keyspace):
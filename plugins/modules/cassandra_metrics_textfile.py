@@ -0,0 +1,407 @@
+#!/usr/bin/python
+
+# 2026 Rhys Campbell <rhyscampbell@bluewin.ch>
+# https://github.com/rhysmeister
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+DOCUMENTATION = '''
+---
+module: cassandra_metrics_textfile
+author: Rhys Campbell (@rhysmeister)
+short_description: Writes nodetool statistics as Prometheus metrics for the node_exporter textfile collector.
+requirements:
+  - nodetool
+description:
+  - Collects nodetool tpstats, compactionstats, info, gcstats and tablestats and writes them \
+    in the Prometheus text exposition format to I(path).
+  - The file is written to a temporary file in the same directory and moved into place \
+    so node_exporter never reads a partial file.
+  - The nodetool commands run I(parallel) at a time. Set I(cassandra_version) to save the nodetool version call.
+  - The tablestats output, which grows with the number of tables, is parsed line by line as nodetool \
+    prints it while the other commands run.
+  - A collector that fails is reported with cassandra_textfile_collector_success 0 and the file is still written.
+  - nodetool gcstats resets the GC statistics of the node so the gc metrics cover the time since the previous run.
+  - The community.cassandra.cassandra_metrics_textfile role runs this module from a systemd timer.
+
+extends_documentation_fragment:
+  - community.cassandra.nodetool_module_options
+
+options:
+  path:
+    description:
+      - The file to write, i.e. /var/lib/node_exporter/textfile_collector/cassandra.prom.
+      - node_exporter only reads files ending in .prom.
+    type: path
+    required: true
+  collect:
+    description:
+      - The nodetool commands to collect metrics from.
+    type: list
+    elements: str
+    choices:
+      - tpstats
+      - compactionstats
+      - info
+      - gcstats
+      - tablestats
+    default:
+      - tpstats
+      - compactionstats
+      - info
+      - gcstats
+      - tablestats
+  tablestats_keyspaces:
+    description:
+      - Only collect tablestats for these keyspaces or keyspace.table names.
+    type: list
+    elements: str
+  tablestats_fields:
+    description:
+      - The fields of M(community.cassandra.cassandra_tablestats) to export per table.
+      - Fields in milliseconds are exported in seconds, i.e. local_read_latency_ms as cassandra_table_local_read_latency_seconds.
+    type: list
+    elements: str
+    default:
+      - sstable_count
+      - space_used_live
+      - local_read_latency_ms
+      - local_write_latency_ms
+      - pending_flushes
+      - partition_size_max
+      - max_tombstones_per_slice
+  parallel:
+    description:
+      - The number of nodetool commands to run at the same time.
+    type: int
+    default: 5
+  mode:
+    description:
+      - The permissions of the written file.
+    type: str
+    default: '0644'
+'''
+
+EXAMPLES = '''
+- name: Write the metrics once
+  community.cassandra.cassandra_metrics_textfile:
+    path: /var/lib/node_exporter/textfile_collector/cassandra.prom
+    cassandra_version: "4.0"
+
+- name: Only export thread pool and compaction metrics
+  community.cassandra.cassandra_metrics_textfile:
+    path: /var/lib/node_exporter/textfile_collector/cassandra.prom
+    collect:
+      - tpstats
+      - compactionstats
+'''
+
+RETURN = '''
+msg:
+  description: A message indicating what has happened.
+  returned: always
+  type: str
+path:
+  description: The file the metrics were written to.
+  returned: always
+  type: str
+samples:
+  description: The number of samples written.
+  returned: always
+  type: int
+errors:
+  description: The collectors that failed and the nodetool error.
+  returned: always
+  type: dict
+  sample: >
+    { "gcstats": "nodetool: Failed to connect to '127.0.0.1:7199'" }
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+import os
+import tempfile
+import threading
+import time
+__metaclass__ = type
+
+
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_cmd_objects import NodeToolCmd
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_common_options import cassandra_common_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_runtime import run_nodetool_commands
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_parsers import TABLE_FIELDS
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_parsers import parse_tpstats
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_parsers import parse_compactionstats
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_parsers import parse_info
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_parsers import parse_gcstats
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_parsers import parse_tablestats
+
+
+COLLECTORS = ['tpstats', 'compactionstats', 'info', 'gcstats', 'tablestats']
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def format_value(value):
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def render_metrics(metrics):
+    '''
+    Renders a list of (name, type, help, samples) in the Prometheus text
+    exposition format where samples is a list of (labels, value), i.e.
+
+    # HELP cassandra_thread_pool_pending_tasks Pending tasks of the thread pool.
+    # TYPE cassandra_thread_pool_pending_tasks gauge
+    cassandra_thread_pool_pending_tasks{pool="MutationStage"} 0
+
+    Samples with a value of None and metrics without samples are left out.
+    Returns (text, number of samples).
+    '''
+    lines = []
+    count = 0
+    for (name, metric_type, help_text, samples) in metrics:
+        samples = [(labels, value) for (labels, value) in samples if value is not None]
+        if not samples:
+            continue
+        lines.append("# HELP {0} {1}".format(name, help_text))
+        lines.append("# TYPE {0} {1}".format(name, metric_type))
+        for (labels, value) in samples:
+            label_text = ""
+            if labels:
+                label_text = "{" + ",".join('{0}="{1}"'.format(k, escape_label(labels[k]))
+                                            for k in sorted(labels)) + "}"
+            lines.append("{0}{1} {2}".format(name, label_text, format_value(value)))
+            count += 1
+    return ("\n".join(lines) + "\n", count)
+
+
+def tpstats_metrics(tpstats):
+    pools = sorted(tpstats['thread_pools'].items())
+    metrics = []
+    for (field, name, metric_type, help_text) in [
+            ("active", "cassandra_thread_pool_active_tasks", "gauge", "Active tasks of the thread pool."),
+            ("pending", "cassandra_thread_pool_pending_tasks", "gauge", "Pending tasks of the thread pool."),
+            ("completed", "cassandra_thread_pool_completed_tasks_total", "counter", "Completed tasks of the thread pool."),
+            ("blocked", "cassandra_thread_pool_blocked_tasks", "gauge", "Currently blocked tasks of the thread pool."),
+            ("all_time_blocked", "cassandra_thread_pool_blocked_tasks_total", "counter", "All time blocked tasks of the thread pool.")]:
+        metrics.append((name, metric_type, help_text, [(dict(pool=p), v[field]) for (p, v) in pools]))
+    metrics.append(("cassandra_dropped_messages_total", "counter", "Dropped messages by message type.",
+                    [(dict(message_type=m), v) for (m, v) in sorted(tpstats['dropped_messages'].items())]))
+    return metrics
+
+
+def compactionstats_metrics(compactionstats):
+    pending_tables = []
+    for (table, pending) in sorted(compactionstats['pending_tables'].items()):
+        (keyspace, table_name) = (table.split(".", 1) + [""])[:2]
+        pending_tables.append((dict(keyspace=keyspace, table=table_name), pending))
+    return [
+        ("cassandra_compaction_pending_tasks", "gauge", "Pending compaction tasks.",
+         [({}, compactionstats['pending'])]),
+        ("cassandra_compaction_pending_tasks_by_table", "gauge", "Pending compaction tasks by table.",
+         pending_tables),
+        ("cassandra_compaction_active", "gauge", "Active compactions.",
+         [({}, compactionstats['active_count'])]),
+        ("cassandra_compaction_remaining_bytes", "gauge", "Bytes left to compact by the active compactions.",
+         [({}, compactionstats['remaining_bytes'])]),
+    ]
+
+
+def info_metrics(info):
+    mb = 1024 * 1024
+    heap = info.get('heap_memory_mb', {})
+    caches = sorted((k[:-len("_cache")], v) for (k, v) in info.items() if k.endswith("_cache"))
+    metrics = [
+        ("cassandra_info", "gauge", "Node information, always 1.",
+         [(dict(host_id=info.get('id', ''), data_center=info.get('data_center', ''), rack=info.get('rack', '')), 1)]),
+        ("cassandra_gossip_active", "gauge", "Whether gossip is running.",
+         [({}, info.get('gossip_active'))]),
+        ("cassandra_native_transport_active", "gauge", "Whether the native transport is running.",
+         [({}, info.get('native_transport_active'))]),
+        ("cassandra_load_bytes", "gauge", "Size of the data on disk.",
+         [({}, info.get('load_bytes'))]),
+        ("cassandra_uptime_seconds", "gauge", "Uptime of the node.",
+         [({}, info.get('uptime_seconds'))]),
+        ("cassandra_heap_used_bytes", "gauge", "Used heap memory.",
+         [({}, int(heap['used'] * mb) if heap.get('used') is not None else None)]),
+        ("cassandra_heap_max_bytes", "gauge", "Total heap memory.",
+         [({}, int(heap['total'] * mb) if heap.get('total') is not None else None)]),
+        ("cassandra_off_heap_used_bytes", "gauge", "Used off heap memory.",
+         [({}, int(info['off_heap_memory_mb'] * mb) if info.get('off_heap_memory_mb') is not None else None)]),
+        ("cassandra_exceptions_total", "counter", "Exceptions raised by the node.",
+         [({}, info.get('exceptions'))]),
+        ("cassandra_percent_repaired", "gauge", "Percentage of the data that is repaired.",
+         [({}, info.get('percent_repaired'))]),
+    ]
+    for (field, name, metric_type, help_text) in [
+            ("entries", "cassandra_cache_entries", "gauge", "Entries in the cache."),
+            ("size_bytes", "cassandra_cache_size_bytes", "gauge", "Size of the cache."),
+            ("capacity_bytes", "cassandra_cache_capacity_bytes", "gauge", "Capacity of the cache."),
+            ("hits", "cassandra_cache_hits_total", "counter", "Cache hits."),
+            ("misses", "cassandra_cache_misses_total", "counter", "Cache misses."),
+            ("requests", "cassandra_cache_requests_total", "counter", "Cache requests."),
+            ("recent_hit_rate", "cassandra_cache_recent_hit_rate", "gauge", "Recent hit rate of the cache.")]:
+        metrics.append((name, metric_type, help_text, [(dict(cache=c), v.get(field)) for (c, v) in caches]))
+    return metrics
+
+
+def gcstats_metrics(gcstats):
+    def seconds(key):
+        if gcstats.get(key) is None:
+            return None
+        return gcstats[key] / 1000.0
+    return [
+        ("cassandra_gc_interval_seconds", "gauge", "Time the gc statistics cover.",
+         [({}, seconds('interval_ms'))]),
+        ("cassandra_gc_max_pause_seconds", "gauge", "Longest gc pause in the interval.",
+         [({}, seconds('max_gc_elapsed_ms'))]),
+        ("cassandra_gc_pause_seconds", "gauge", "Total gc pause time in the interval.",
+         [({}, seconds('total_gc_elapsed_ms'))]),
+        ("cassandra_gc_pause_stddev_seconds", "gauge", "Standard deviation of the gc pauses in the interval.",
+         [({}, seconds('stdev_gc_elapsed_ms'))]),
+        ("cassandra_gc_reclaimed_bytes", "gauge", "Memory reclaimed by gc in the interval.",
+         [({}, gcstats.get('gc_reclaimed_bytes'))]),
+        ("cassandra_gc_collections", "gauge", "Number of collections in the interval.",
+         [({}, gcstats.get('collections'))]),
+        ("cassandra_direct_memory_bytes", "gauge", "Direct memory used.",
+         [({}, gcstats.get('direct_memory_bytes'))]),
+    ]
+
+
+def tablestats_metrics(tables, fields):
+    def seconds(value):
+        if value is None:
+            return None
+        return value / 1000.0
+    metrics = []
+    for field in fields:
+        if field.endswith("_ms"):
+            # Prometheus base units are seconds
+            name = "cassandra_table_{0}_seconds".format(field[:-3])
+            help_text = "The {0} value of nodetool tablestats in seconds.".format(field[:-3])
+            samples = [(dict(keyspace=t['keyspace'], table=t['table']), seconds(t.get(field))) for t in tables]
+        else:
+            name = "cassandra_table_{0}".format(field)
+            help_text = "The {0} value of nodetool tablestats.".format(field)
+            samples = [(dict(keyspace=t['keyspace'], table=t['table']), t.get(field)) for t in tables]
+        metrics.append((name, "gauge", help_text, samples))
+    return metrics
+
+
+def main():
+    argument_spec = cassandra_common_argument_spec()
+    argument_spec.update(
+        path=dict(type='path', required=True),
+        collect=dict(type='list', elements='str', choices=COLLECTORS, default=COLLECTORS),
+        tablestats_keyspaces=dict(type='list', elements='str', default=None),
+        tablestats_fields=dict(type='list', elements='str', default=['sstable_count',
+                                                                     'space_used_live',
+                                                                     'local_read_latency_ms',
+                                                                     'local_write_latency_ms',
+                                                                     'pending_flushes',
+                                                                     'partition_size_max',
+                                                                     'max_tombstones_per_slice']),
+        parallel=dict(type='int', default=5),
+        mode=dict(type='str', default='0644'),
+    )
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+    )
+
+    path = module.params['path']
+    collect = module.params['collect']
+    tablestats_fields = module.params['tablestats_fields']
+    parallel = module.params['parallel']
+    try:
+        mode = int(module.params['mode'], 8)
+    except ValueError:
+        module.fail_json(msg="mode must be an octal number, i.e. 0644")
+
+    unknown = [f for f in tablestats_fields if f not in TABLE_FIELDS.values()]
+    if unknown:
+        module.fail_json(msg="Unknown tablestats fields: {0}".format(", ".join(unknown)))
+    if parallel < 1:
+        module.fail_json(msg="parallel must be 1 or more")
+    if not os.path.isdir(os.path.dirname(path) or "."):
+        module.fail_json(msg="The directory of {0} does not exist".format(path))
+
+    start = time.time()
+    result = dict(changed=False, path=path)
+    n = NodeToolCmd(module)
+
+    commands = [c for c in collect if c != 'tablestats']
+    responses = {}
+    pool = threading.Thread(target=lambda: responses.update(run_nodetool_commands(n, commands, parallel)))
+    pool.start()
+    if 'tablestats' in collect:
+        # Streamed rather than buffered by the pool as its output grows with the number of tables
+        tablestats_n = NodeToolCmd(module)
+        cmd = " ".join(["tablestats"] + (module.params['tablestats_keyspaces'] or []))
+        tables = list(parse_tablestats(tablestats_n.stream_nodetool_cmd(cmd)))
+        responses['tablestats'] = (tablestats_n.rc, '', tablestats_n.err)
+    pool.join()
+
+    metrics = []
+    success = []
+    errors = {}
+    for collector in COLLECTORS:
+        if collector not in collect:
+            continue
+        (rc, out, err) = responses[collector]
+        if rc != 0:
+            errors[collector] = (err or out).strip()
+            success.append((dict(collector=collector), 0))
+            continue
+        if collector == 'tpstats':
+            metrics += tpstats_metrics(parse_tpstats(out))
+        elif collector == 'compactionstats':
+            metrics += compactionstats_metrics(parse_compactionstats(out))
+        elif collector == 'info':
+            metrics += info_metrics(parse_info(out))
+        elif collector == 'gcstats':
+            gcstats = parse_gcstats(out)
+            if gcstats is None:
+                errors[collector] = "Unable to parse output: {0}".format(out.strip())
+                success.append((dict(collector=collector), 0))
+                continue
+            metrics += gcstats_metrics(gcstats)
+        elif collector == 'tablestats':
+            metrics += tablestats_metrics(tables, tablestats_fields)
+        success.append((dict(collector=collector), 1))
+
+    metrics += [
+        ("cassandra_textfile_collector_success", "gauge", "Whether the nodetool command of the collector succeeded.",
+         success),
+        ("cassandra_textfile_duration_seconds", "gauge", "Time taken to collect the metrics.",
+         [({}, round(time.time() - start, 3))]),
+        ("cassandra_textfile_last_run_timestamp_seconds", "gauge", "Unix time the metrics were collected at.",
+         [({}, round(time.time(), 3))]),
+    ]
+    (text, samples) = render_metrics(metrics)
+    result['samples'] = samples
+    result['errors'] = errors
+
+    if not module.check_mode:
+        (fd, tmp_path) = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".cassandra_metrics")
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+        os.chmod(tmp_path, mode)
+        module.atomic_move(tmp_path, path)
+    result['changed'] = True
+    result['msg'] = "Wrote {0} samples".format(samples)
+    if errors:
+        result['msg'] += ", {0} collectors failed".format(len(errors))
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/python
+
+# 2026 Rhys Campbell <rhyscampbell@bluewin.ch>
+# https://github.com/rhysmeister
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+DOCUMENTATION = '''
+---
+module: cassandra_netstats
+author: Rhys Campbell (@rhysmeister)
+short_description: Returns streaming progress and can wait for streams to finish.
+requirements:
+  - nodetool
+description:
+  - Returns the streaming sessions from nodetool netstats with the files and bytes sent \
+    and received per peer, the read repair statistics and the message pool statistics.
+  - With two or more samples the transfer rate and estimated time to completion are returned.
+  - Optionally polls until conditions on these values are met, i.e. C(no_active_streams) \
+    after M(community.cassandra.cassandra_decommission) or M(community.cassandra.cassandra_removenode) \
+    has been started as an async task.
+
+extends_documentation_fragment:
+  - community.cassandra.nodetool_module_options
+  - community.cassandra.wait_until_options
+
+options:
+  rate_interval:
+    description:
+      - Take a second sample after this many seconds to calculate the transfer rate.
+      - Ignored when I(wait_until) is set as the rate is then calculated from the first and last poll.
+    type: int
+    default: 0
+'''
+
+EXAMPLES = '''
+- name: Get the streaming progress
+  community.cassandra.cassandra_netstats:
+  register: netstats
+
+- name: Decommission the node in the background
+  community.cassandra.cassandra_decommission:
+  async: 86400
+  poll: 0
+
+- name: Wait for the streams to finish
+  community.cassandra.cassandra_netstats:
+    wait_until:
+      - no_active_streams
+    wait_timeout: 86400
+    max_poll_interval: 300
+  register: netstats
+'''
+
+RETURN = '''
+msg:
+  description: A message indicating what has happened.
+  returned: always
+  type: str
+netstats:
+  description:
+    - The streaming sessions and message statistics.
+    - bytes_total, bytes_done and bytes_remaining are summed over all sessions and both directions.
+    - no_active_streams is true when there are no sessions or all their bytes have been transferred.
+  returned: on success
+  type: dict
+  sample: >
+    { "mode": "LEAVING",
+      "sessions": [ { "plan_id": "0b3bc9e0-7f2e-11ee-b962-0242ac120002", "operation": "Unbootstrap",
+                      "peers": [ { "peer": "10.0.0.2",
+                                   "sending": { "files_total": 12, "bytes_total": 123456789,
+                                                "files_done": 3, "bytes_done": 30000000 } } ] } ],
+      "bytes_total": 123456789, "bytes_done": 30000000, "bytes_remaining": 93456789,
+      "no_active_streams": false,
+      "read_repair": { "attempted": 0, "mismatch_blocking": 0, "mismatch_background": 0 },
+      "message_pools": { "Large messages": { "active": null, "pending": 0, "completed": 0, "dropped": 0 },
+                         "Small messages": { "active": null, "pending": 0, "completed": 123456, "dropped": 0 },
+                         "Gossip messages": { "active": null, "pending": 0, "completed": 12345, "dropped": 0 } } }
+progress:
+  description:
+    - The transfer progress between the first and last sample.
+    - eta_seconds is null when bytes remain but none were transferred.
+  returned: when two or more samples were taken
+  type: dict
+  sample: >
+    { "elapsed": 60.02, "bytes_per_second": 22369621.3, "eta_seconds": 4177.87 }
+wait:
+  description:
+    - The outcome of I(wait_until).
+    - conditions holds the last value seen for each condition.
+  returned: when wait_until is set
+  type: dict
+  sample: >
+    { "met": true, "polls": 40, "elapsed": 7200.4, "conditions": { "no_active_streams": true } }
+rc:
+  description: Return code of the last executed command.
+  returned: on failure
+  type: int
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+__metaclass__ = type
+
+
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_cmd_objects import NodeToolCommandSimple
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_common_options import cassandra_common_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_wait_until import wait_until_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_wait_until import run_wait
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_parsers import parse_netstats
+
+
+def stream_progress(first, last, elapsed):
+    '''
+    Returns the transfer rate and ETA between two samples. Bytes are
+    only compared for sessions present in both samples so sessions that
+    finished or started in between do not skew the rate.
+    '''
+    if elapsed <= 0:
+        return None
+
+    def session_bytes(netstats):
+        done = {}
+        for s in netstats['sessions']:
+            done[s['plan_id']] = sum(p[d]['bytes_done'] for p in s['peers']
+                                     for d in ("receiving", "sending") if d in p)
+        return done
+
+    first_done = session_bytes(first)
+    last_done = session_bytes(last)
+    transferred = 0
+    for plan_id in last_done:
+        if plan_id in first_done:
+            transferred += max(last_done[plan_id] - first_done[plan_id], 0)
+    bytes_per_second = round(transferred / elapsed, 2)
+    eta_seconds = None
+    if last['bytes_remaining'] == 0:
+        eta_seconds = 0
+    elif bytes_per_second > 0:
+        eta_seconds = round(last['bytes_remaining'] / bytes_per_second, 2)
+    return dict(elapsed=round(elapsed, 2),
+                bytes_per_second=bytes_per_second,
+                eta_seconds=eta_seconds)
+
+
+def main():
+    argument_spec = cassandra_common_argument_spec()
+    argument_spec.update(wait_until_argument_spec())
+    argument_spec.update(
+        rate_interval=dict(type='int', default=0),
+    )
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+    )
+
+    debug = module.params['debug']
+
+    result = dict(changed=False)
+    n = NodeToolCommandSimple(module, "netstats")
+
+    def get_netstats():
+        (rc, out, err) = n.run_command()
+        if rc != 0:
+            result['msg'] = "nodetool error: {0}".format(err)
+            result['rc'] = rc
+            module.fail_json(**result)
+        if debug:
+            result['stdout'] = out
+            if err:
+                result['stderr'] = err
+        result['netstats'] = parse_netstats(out)
+        return result['netstats']
+
+    run_wait(module, get_netstats, result, progress=stream_progress)
+    if 'wait' in result:
+        result['msg'] = "Streaming conditions met after {0} polls".format(result['wait']['polls'])
+    else:
+        result['msg'] = "{0} streaming sessions".format(len(result['netstats']['sessions']))
+
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,572 @@
+#!/usr/bin/python
+
+# 2026 Rhys Campbell <rhyscampbell@bluewin.ch>
+# https://github.com/rhysmeister
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+DOCUMENTATION = r'''
+---
+module: cassandra_prewarm
+author: Rhys Campbell (@rhysmeister)
+short_description: Warms the caches of a restarted node by reading its hot partitions.
+requirements:
+  - cassandra-driver
+  - vmtouch (optional)
+description:
+  - Reads a list of hot partition keys through the node given first in I(login_host) at LOCAL_ONE \
+    so its key, chunk and row caches are filled before it serves client traffic again, i.e. right after a restart.
+  - The reads are token aware. Keys the node is not a replica of are skipped as reading them would \
+    warm the caches of other nodes.
+  - The keys are given in I(keys) or read from I(keys_file). The file holds either one key per line \
+    or the output of nodetool toppartitions, of which the partitions of the READS sampler are used.
+  - Up to I(concurrency) reads are in flight and at most I(rate) reads are issued per second.
+  - The keys are read I(passes) times. The read latency of each pass shows how far the caches have converged.
+  - Keys that cannot be converted to the types of the partition key columns are skipped with a warning. \
+    timestamp keys are given as milliseconds since the epoch or as printed by nodetool toppartitions, \
+    i.e. C(2026-01-01T10:00:00.000Z).
+  - With I(page_cache=true) the index and data files of the newest SSTables of the table are also loaded \
+    into the page cache of the host, up to I(page_cache_max_mb). vmtouch is used when installed, \
+    otherwise posix_fadvise. This needs the module to run on the node.
+  - Nothing is read in check mode.
+
+extends_documentation_fragment:
+  - community.cassandra.cassandra_cql_options
+
+options:
+  login_host:
+    description:
+      - The node to warm. All reads are sent to the first host.
+    type: list
+    elements: str
+    default: ['127.0.0.1']
+  keyspace:
+    description: The keyspace of the table.
+    type: str
+    required: true
+  table:
+    description: The table to read.
+    type: str
+    required: true
+  keys:
+    description:
+      - The partition keys to read.
+      - A key of a table with a composite partition key is a list or a string with the parts \
+        separated by I(key_separator).
+    type: list
+    elements: raw
+  keys_file:
+    description:
+      - A file on the host with one partition key per line or the output of nodetool toppartitions.
+    type: path
+  key_separator:
+    description:
+      - The separator of the parts of a composite partition key, as printed by nodetool toppartitions.
+    type: str
+    default: ":"
+  rows_per_key:
+    description:
+      - The number of rows read from each partition. 0 reads the whole partition.
+    type: int
+    default: 1
+  concurrency:
+    description:
+      - The number of reads in flight at the same time.
+    type: int
+    default: 16
+  rate:
+    description:
+      - The maximum number of reads per second.
+    type: int
+    default: 500
+  passes:
+    description:
+      - The number of times the keys are read.
+    type: int
+    default: 2
+  page_cache:
+    description:
+      - Load the index and data files of the newest SSTables of the table into the page cache.
+    type: bool
+    default: false
+  data_file_directories:
+    description:
+      - The data directories of the node.
+    type: list
+    elements: path
+    default: ['/var/lib/cassandra/data']
+  page_cache_max_mb:
+    description:
+      - The maximum amount of SSTable files loaded into the page cache in MB.
+    type: int
+    default: 1024
+'''
+
+EXAMPLES = r'''
+- name: Find the hot partitions before the restart
+  ansible.builtin.shell: nodetool toppartitions myapp users 30000 -s 1000 -k 1000 > /var/tmp/users.hot
+
+- name: Restart Cassandra
+  ansible.builtin.service:
+    name: cassandra
+    state: restarted
+
+- name: Warm the caches of the node
+  community.cassandra.cassandra_prewarm:
+    login_host: "{{ ansible_default_ipv4.address }}"
+    keyspace: myapp
+    table: users
+    keys_file: /var/tmp/users.hot
+    page_cache: true
+  register: prewarm
+
+- name: Warm a few known keys of a table with a composite partition key
+  community.cassandra.cassandra_prewarm:
+    keyspace: myapp
+    table: events
+    keys:
+      - ["tenant1", 2026]
+      - "tenant2:2026"
+    passes: 1
+'''
+
+RETURN = r'''
+msg:
+  description: A message indicating what has happened.
+  returned: always
+  type: str
+keys:
+  description:
+    - The number of keys given, read, skipped because the node is not a replica, failed and invalid.
+    - Invalid keys could not be converted to the types of the partition key columns.
+  returned: on success
+  type: dict
+  sample: >
+    { "total": 1000, "warmed": 348, "skipped": 652, "failed": 0, "invalid": 0 }
+passes:
+  description: The read latency of each pass in milliseconds.
+  returned: when keys were read
+  type: list
+  sample: >
+    [ { "reads": 348, "seconds": 1.2, "p50_ms": 2.1, "p99_ms": 14.8, "max_ms": 30.2 },
+      { "reads": 348, "seconds": 0.7, "p50_ms": 0.6, "p99_ms": 1.9, "max_ms": 2.4 } ]
+page_cache:
+  description: The SSTable files loaded into the page cache and how.
+  returned: when page_cache is true
+  type: dict
+  sample: >
+    { "method": "vmtouch", "files": 12, "bytes": 734003200 }
+errors:
+  description: The first read errors.
+  returned: when reads failed
+  type: list
+'''
+
+__metaclass__ = type
+import datetime
+import decimal
+import glob
+import os
+import re
+import socket
+import time
+import uuid
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.six import string_types
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_cql import cassandra_cql_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_cql import check_ssl_options
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_cql import get_auth_provider
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_cql import get_ssl_context
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_stats import percentile
+
+
+def import_cassandra_driver():
+    '''
+    Imports the cassandra driver into the module namespace.
+    Returns False if the driver is not installed.
+    '''
+    global Cluster, EXEC_PROFILE_DEFAULT, ExecutionProfile, \
+        AuthenticationFailed, ConsistencyLevel, WhiteListRoundRobinPolicy
+    try:
+        from cassandra.cluster import Cluster
+        from cassandra.cluster import EXEC_PROFILE_DEFAULT
+        from cassandra.cluster import ExecutionProfile
+        from cassandra import AuthenticationFailed
+        from cassandra import ConsistencyLevel
+        from cassandra.policies import WhiteListRoundRobinPolicy
+    except Exception:
+        return False
+    return True
+
+
+def parse_keys_file(text):
+    '''
+    Returns the keys of a file with one key per line or of the output of
+    nodetool toppartitions, i.e.
+
+    READS Sampler:
+      Cardinality: ~2 capacity: 256
+      Top 10 partitions:
+            Partition     Count       +/-
+            user1            54         0
+    WRITES Sampler:
+    ...
+    '''
+    lines = text.splitlines()
+    if not [line for line in lines if line.strip().endswith("Sampler:")]:
+        return [line.strip() for line in lines if line.strip() and not line.startswith("#")]
+    keys = []
+    reads = False
+    partitions = False
+    for line in lines:
+        line = line.strip()
+        if line.endswith("Sampler:"):
+            reads = line.startswith("READS")
+            partitions = False
+        elif line.startswith("Partition") and "Count" in line:
+            partitions = True
+        elif reads and partitions and line:
+            fields = line.rsplit(None, 2)
+            if len(fields) == 3 and fields[1].isdigit():
+                keys.append(fields[0])
+    return keys
+
+
+INT_TYPES = ['int', 'bigint', 'smallint', 'tinyint', 'varint', 'counter']
+FLOAT_TYPES = ['float', 'double']
+# The driver binds these from their string form
+TEXT_TYPES = ['text', 'varchar', 'ascii', 'inet', 'date', 'time']
+KEY_TYPES = INT_TYPES + FLOAT_TYPES + TEXT_TYPES + ['decimal', 'uuid', 'timeuuid', 'boolean', 'blob', 'timestamp']
+
+TIMESTAMP_RE = re.compile(r'^(\d{4})-(\d{2})-(\d{2})(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:\.(\d{1,6}))?)?)?'
+                          r'(Z|[+-]\d{2}:?\d{2})?$')
+
+
+def parse_timestamp(value):
+    '''
+    Returns the UTC datetime of a timestamp given as milliseconds since the
+    epoch or as an ISO 8601 string, i.e. 2026-01-01T10:00:00.000Z
+    '''
+    if value.lstrip('-').isdigit():
+        return datetime.datetime(1970, 1, 1) + datetime.timedelta(milliseconds=int(value))
+    match = TIMESTAMP_RE.match(value.strip())
+    if match is None:
+        raise ValueError("{0} is not a timestamp".format(value))
+    (year, month, day, hour, minute, second, fraction, zone) = match.groups()
+    timestamp = datetime.datetime(int(year), int(month), int(day),
+                                  int(hour or 0), int(minute or 0), int(second or 0),
+                                  int((fraction or "0").ljust(6, "0")))
+    if zone not in (None, "Z"):
+        zone = zone.replace(":", "")
+        offset = datetime.timedelta(hours=int(zone[1:3]), minutes=int(zone[3:5]))
+        timestamp = timestamp - offset if zone[0] == "+" else timestamp + offset
+    return timestamp
+
+
+def convert_key_part(value, cql_type):
+    '''
+    Converts a key part given as a string to the value the driver binds
+    for the cql type of the partition key column
+    '''
+    if not isinstance(value, string_types):
+        return value
+    if cql_type in INT_TYPES:
+        return int(value)
+    if cql_type in FLOAT_TYPES:
+        return float(value)
+    if cql_type == 'decimal':
+        try:
+            return decimal.Decimal(value)
+        except decimal.InvalidOperation:
+            raise ValueError("{0} is not a decimal".format(value))
+    if cql_type in ('uuid', 'timeuuid'):
+        return uuid.UUID(value)
+    if cql_type == 'boolean':
+        return value.lower() == "true"
+    if cql_type == 'blob':
+        return bytearray.fromhex(value[2:] if value.startswith("0x") else value)
+    if cql_type == 'timestamp':
+        return parse_timestamp(value)
+    return value
+
+
+def convert_keys(keys, key_types, key_separator):
+    '''
+    Returns the keys as tuples of values to bind, one per partition key
+    column, and the keys that could not be converted with the reason
+    '''
+    for cql_type in key_types:
+        if cql_type not in KEY_TYPES:
+            raise ValueError("Partition key columns of type {0} are not supported".format(cql_type))
+    converted = []
+    invalid = []
+    for key in keys:
+        if isinstance(key, (list, tuple)):
+            parts = list(key)
+        elif len(key_types) > 1:
+            parts = str(key).split(key_separator)
+        else:
+            parts = [key]
+        try:
+            if len(parts) != len(key_types):
+                raise ValueError("The key {0} does not have {1} parts".format(key, len(key_types)))
+            converted.append(tuple(convert_key_part(p, t) for (p, t) in zip(parts, key_types)))
+        except (TypeError, ValueError) as excep:
+            invalid.append("{0}: {1}".format(key, excep))
+    return (converted, invalid)
+
+
+def read_pass(session, statement, keys, concurrency, rate, errors):
+    '''
+    Reads all keys with up to concurrency reads in flight and at most rate
+    reads per second. Returns the latency statistics of the pass.
+
+    The reads are counted and timed when their result is taken in this
+    thread. The driver sets the result before it runs the callbacks so
+    counting in callbacks can miss the last reads of a batch.
+    '''
+    latencies = []
+    failed = 0
+    start = time.time()
+    interval = 1.0 / rate
+
+    for i in range(0, len(keys), concurrency):
+        futures = []
+        for key in keys[i:i + concurrency]:
+            # Spread the reads evenly instead of sending a burst each second
+            wait = start + (i + len(futures)) * interval - time.time()
+            if wait > 0:
+                time.sleep(wait)
+            futures.append((time.time(), session.execute_async(statement, key)))
+        for (started, future) in futures:
+            try:
+                future.result()
+            except Exception as excep:
+                failed += 1
+                if len(errors) < 10:
+                    errors.append(str(excep))
+                continue
+            latencies.append((time.time() - started) * 1000)
+    latencies.sort()
+    return (dict(reads=len(latencies),
+                 seconds=round(time.time() - start, 3),
+                 p50_ms=round(percentile(latencies, 50), 3) if latencies else None,
+                 p99_ms=round(percentile(latencies, 99), 3) if latencies else None,
+                 max_ms=round(latencies[-1], 3) if latencies else None),
+            failed)
+
+
+def sstable_files(data_file_directories, keyspace, table):
+    '''
+    Returns the index and data files of the SSTables of the table, newest
+    SSTable first with its index files before its data file
+    '''
+    data_files = []
+    for directory in data_file_directories:
+        data_files += glob.glob(os.path.join(directory, keyspace, "{0}-*".format(table), "*-Data.db"))
+    data_files.sort(key=lambda f: os.path.getmtime(f), reverse=True)
+    files = []
+    for data_file in data_files:
+        prefix = data_file[:-len("Data.db")]
+        for component in ["Partitions.db", "Rows.db", "Index.db", "Summary.db"]:
+            if os.path.exists(prefix + component):
+                files.append(prefix + component)
+        files.append(data_file)
+    return files
+
+
+def select_files(files, max_bytes):
+    '''
+    Returns the first files that fit into max_bytes and their total size
+    '''
+    selected = []
+    total = 0
+    for f in files:
+        size = os.path.getsize(f)
+        if total + size > max_bytes:
+            break
+        selected.append(f)
+        total += size
+    return (selected, total)
+
+
+def load_page_cache(module, selected, total):
+    '''
+    Loads the selected files into the page cache
+    '''
+    vmtouch = module.get_bin_path('vmtouch')
+    if vmtouch is not None:
+        method = "vmtouch"
+        if selected:
+            (rc, out, err) = module.run_command([vmtouch, '-q', '-t'] + selected)
+            if rc != 0:
+                module.fail_json(msg="vmtouch error: {0}".format(err), rc=rc)
+    elif hasattr(os, 'posix_fadvise'):
+        method = "posix_fadvise"
+        for f in selected:
+            fd = os.open(f, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+    else:
+        method = "read"
+        for f in selected:
+            with open(f, 'rb') as fh:
+                while fh.read(1024 * 1024):
+                    pass
+    return dict(method=method, files=len(selected), bytes=total)
+
+
+def main():
+    argument_spec = cassandra_cql_argument_spec()
+    argument_spec.update(
+        login_host=dict(type='list', elements='str', default=['127.0.0.1']),
+        keyspace=dict(type='str', required=True, no_log=False),
+        table=dict(type='str', required=True),
+        keys=dict(type='list', elements='raw', no_log=False),
+        keys_file=dict(type='path', no_log=False),
+        key_separator=dict(type='str', default=':', no_log=False),
+        rows_per_key=dict(type='int', default=1),
+        concurrency=dict(type='int', default=16),
+        rate=dict(type='int', default=500),
+        passes=dict(type='int', default=2),
+        page_cache=dict(type='bool', default=False),
+        data_file_directories=dict(type='list', elements='path', default=['/var/lib/cassandra/data']),
+        page_cache_max_mb=dict(type='int', default=1024),
+    )
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+        required_one_of=[['keys', 'keys_file']],
+    )
+
+    login_host = module.params['login_host']
+    login_port = module.params['login_port']
+    keyspace = module.params['keyspace']
+    table = module.params['table']
+    rows_per_key = module.params['rows_per_key']
+    concurrency = module.params['concurrency']
+    rate = module.params['rate']
+    passes = module.params['passes']
+
+    for option in ['concurrency', 'rate', 'passes']:
+        if module.params[option] < 1:
+            module.fail_json(msg="{0} must be 1 or more".format(option))
+    if rows_per_key < 0:
+        module.fail_json(msg="rows_per_key must be 0 or more")
+
+    check_ssl_options(module)
+
+    keys = list(module.params['keys'] or [])
+    if module.params['keys_file'] is not None:
+        try:
+            with open(module.params['keys_file']) as f:
+                keys += parse_keys_file(f.read())
+        except IOError as excep:
+            module.fail_json(msg="Unable to read {0}: {1}".format(module.params['keys_file'], excep))
+
+    result = dict(changed=False)
+
+    if import_cassandra_driver() is False:
+        msg = ("This module requires the cassandra-driver python"
+               " driver. You can probably install it with pip"
+               " install cassandra-driver.")
+        module.fail_json(msg=msg)
+
+    try:
+        auth_provider = get_auth_provider(module)
+        ssl_context = get_ssl_context(module)
+        target = socket.gethostbyname(login_host[0])
+        # Every read is coordinated by the node being warmed
+        profile = ExecutionProfile(load_balancing_policy=WhiteListRoundRobinPolicy([target]),
+                                   consistency_level=ConsistencyLevel.LOCAL_ONE)
+        cluster = Cluster(login_host,
+                          port=login_port,
+                          auth_provider=auth_provider,
+                          ssl_context=ssl_context,
+                          execution_profiles={EXEC_PROFILE_DEFAULT: profile})
+        session = cluster.connect()
+    except AuthenticationFailed as excep:
+        module.fail_json(msg="Authentication failed: {0}".format(excep))
+    except Exception as excep:
+        module.fail_json(msg="Error connecting to cluster: {0}".format(excep))
+
+    try:
+        table_meta = cluster.metadata.keyspaces.get(keyspace, None)
+        if table_meta is not None:
+            table_meta = table_meta.tables.get(table)
+        if table_meta is None:
+            module.fail_json(msg="Table {0}.{1} does not exist".format(keyspace, table))
+        key_columns = table_meta.partition_key
+        try:
+            (converted, invalid) = convert_keys(keys, [c.cql_type for c in key_columns], module.params['key_separator'])
+        except ValueError as excep:
+            module.fail_json(msg=str(excep))
+
+        cql = "SELECT * FROM \"{0}\".\"{1}\" WHERE {2}".format(
+            keyspace, table, " AND ".join("\"{0}\" = ?".format(c.name) for c in key_columns))
+        if rows_per_key > 0:
+            cql += " LIMIT {0}".format(rows_per_key)
+        statement = session.prepare(cql)
+
+        # Token aware: only the keys the node holds a replica of warm its caches
+        owned = []
+        skipped = 0
+        for key in converted:
+            try:
+                routing_key = statement.bind(key).routing_key
+            except Exception as excep:
+                invalid.append("{0}: {1}".format(key, excep))
+                continue
+            replicas = cluster.metadata.get_replicas(keyspace, routing_key)
+            if [h for h in replicas if h.address == target]:
+                owned.append(key)
+            else:
+                skipped += 1
+        result['keys'] = dict(total=len(keys), warmed=0, skipped=skipped, failed=0, invalid=len(invalid))
+        if invalid and len(invalid) == len(keys):
+            module.fail_json(msg="None of the keys are valid: {0}".format("; ".join(invalid[:10])), **result)
+        if invalid:
+            module.warn("Skipped {0} invalid keys: {1}".format(len(invalid), "; ".join(invalid[:10])))
+
+        if not module.check_mode and owned:
+            errors = []
+            result['passes'] = []
+            failed = 0
+            for i in range(passes):
+                (stats, pass_failed) = read_pass(session, statement, owned, concurrency, rate, errors)
+                result['passes'].append(stats)
+                failed = max(failed, pass_failed)
+            result['keys']['warmed'] = len(owned) - failed
+            result['keys']['failed'] = failed
+            if errors:
+                result['errors'] = errors
+        elif module.check_mode:
+            result['keys']['warmed'] = len(owned)
+    finally:
+        cluster.shutdown()
+
+    if module.params['page_cache']:
+        files = sstable_files(module.params['data_file_directories'], keyspace, table)
+        (selected, total) = select_files(files, module.params['page_cache_max_mb'] * 1024 * 1024)
+        if module.check_mode:
+            result['page_cache'] = dict(method=None, files=len(selected), bytes=total)
+        else:
+            result['page_cache'] = load_page_cache(module, selected, total)
+
+    result['changed'] = result['keys']['warmed'] > 0 or result.get('page_cache', {}).get('files', 0) > 0
+    if result['keys']['failed'] > 0 and result['keys']['warmed'] == 0:
+        result['msg'] = "All reads failed"
+        module.fail_json(**result)
+    result['msg'] = "Warmed {0} of {1} keys".format(result['keys']['warmed'], len(keys))
+    if 'page_cache' in result:
+        result['msg'] += " and {0} bytes of SSTables".format(result['page_cache']['bytes'])
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,484 @@
+#!/usr/bin/python
+
+# 2026 Rhys Campbell <rhyscampbell@bluewin.ch>
+# https://github.com/rhysmeister
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+DOCUMENTATION = '''
+---
+module: cassandra_repair
+author: Rhys Campbell (@rhysmeister)
+short_description: Repairs a keyspace in token subranges with a checkpoint.
+requirements:
+  - nodetool
+description:
+  - Reads the token ranges of the keyspace with nodetool describering and repairs the ranges of the node \
+    in subranges with nodetool repair -full -st -et.
+  - Each range is split into subranges of about I(partitions_per_subrange) partitions. The number of \
+    partitions of a range is estimated from the partition estimate of nodetool tablestats spread evenly \
+    over the ranges the node is a replica of.
+  - Every repaired subrange is saved to I(checkpoint_file). An interrupted repair resumes with the subranges \
+    that are left. Failed subranges are retried by the next run. Once every subrange is repaired the next run starts a new repair.
+  - Up to I(parallel) subranges are repaired at the same time. I(repair_mode) sets whether the replicas of a \
+    subrange are repaired in parallel, one after another or in parallel across datacenters and one after another within each.
+  - No new subrange is started outside I(window) or after I(max_duration). The subranges already running are finished.
+  - Run the module on every node with I(primary_range=true) to repair each range once.
+  - Nothing is repaired in check mode.
+
+extends_documentation_fragment:
+  - community.cassandra.nodetool_module_options
+
+options:
+  keyspace:
+    description:
+      - The keyspace to repair.
+    type: str
+    required: true
+  tables:
+    description:
+      - The tables to repair. All tables of the keyspace when not given.
+    type: list
+    elements: str
+  node_address:
+    description:
+      - The address of the node as listed in the endpoints of nodetool describering.
+      - Defaults to the address nodetool status lists for the host ID of the node from nodetool info.
+    type: str
+  primary_range:
+    description:
+      - Only repair the ranges the node is the primary replica of.
+    type: bool
+    default: true
+  datacenters:
+    description:
+      - Only repair with the replicas in these datacenters.
+    type: list
+    elements: str
+  partitions_per_subrange:
+    description:
+      - The estimated number of partitions in each subrange.
+    type: int
+    default: 100000
+  parallel:
+    description:
+      - The number of subranges repaired at the same time.
+    type: int
+    default: 1
+  repair_mode:
+    description:
+      - How the replicas of a subrange are repaired.
+      - parallel repairs all replicas at the same time, sequential one after another \
+        and dc_parallel in parallel across datacenters and one after another within each datacenter.
+    type: str
+    choices:
+      - parallel
+      - sequential
+      - dc_parallel
+    default: parallel
+  job_threads:
+    description:
+      - The number of tables repaired at the same time by each repair.
+    type: int
+    default: 1
+  checkpoint_file:
+    description:
+      - The file the progress is saved in.
+      - Defaults to C(/var/tmp/cassandra_repair_<keyspace>.json).
+    type: path
+  reset:
+    description:
+      - Discard the checkpoint and start a new repair.
+    type: bool
+    default: false
+  window:
+    description:
+      - The local time of day subranges may be started in, i.e. C(22:00-06:00).
+    type: str
+  max_duration:
+    description:
+      - No new subrange is started after this many seconds.
+    type: int
+'''
+
+EXAMPLES = '''
+- name: Repair the keyspace in subranges of about 50000 partitions, two at a time
+  community.cassandra.cassandra_repair:
+    keyspace: myapp
+    partitions_per_subrange: 50000
+    parallel: 2
+
+- name: Repair overnight, resuming where the previous night stopped
+  community.cassandra.cassandra_repair:
+    keyspace: myapp
+    tables:
+      - users
+      - orders
+    window: "22:00-06:00"
+    repair_mode: dc_parallel
+  async: 28800
+  poll: 60
+'''
+
+RETURN = '''
+msg:
+  description: A message indicating what has happened.
+  returned: always
+  type: str
+subranges:
+  description:
+    - The number of subranges in the repair and how many are repaired, failed and left.
+    - repaired is the number repaired by this run.
+  returned: on success
+  type: dict
+  sample: >
+    { "total": 96, "completed": 40, "failed": 0, "remaining": 56, "repaired": 12 }
+estimated_partitions:
+  description: The estimated number of partitions in the subranges of the repair.
+  returned: on success
+  type: int
+throughput:
+  description: The subranges per hour and estimated partitions per second repaired by this run.
+  returned: when subranges were repaired
+  type: dict
+  sample: >
+    { "subranges_per_hour": 48.2, "partitions_per_second": 1339.4 }
+eta_seconds:
+  description: The estimated time to repair the remaining subranges at the throughput of this run.
+  returned: when subranges were repaired
+  type: float
+finished:
+  description: Whether every subrange of the repair has been repaired.
+  returned: on success
+  type: bool
+stopped:
+  description: Why no more subranges were started, window or max_duration.
+  returned: when the repair stopped early
+  type: str
+checkpoint_file:
+  description: The file the progress is saved in.
+  returned: always
+  type: str
+errors:
+  description: The error of each subrange that failed in this run.
+  returned: on failure
+  type: dict
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+import json
+import os
+import tempfile
+import threading
+import time
+__metaclass__ = type
+
+
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_cmd_objects import NodeToolCmd
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_common_options import cassandra_common_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_parsers import parse_describering
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_parsers import parse_info
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_parsers import parse_status
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_parsers import parse_tablestats
+
+
+MIN_TOKEN = -2 ** 63
+RING_SIZE = 2 ** 64
+
+REPAIR_MODE_FLAGS = {
+    'parallel': "",
+    'sequential': " -seq",
+    'dc_parallel': " -dcpar",
+}
+
+
+def range_width(start, end):
+    '''
+    Returns the number of tokens in the range (start, end]. A range that
+    starts where it ends covers the whole ring.
+    '''
+    return (end - start) % RING_SIZE or RING_SIZE
+
+
+def split_range(start, end, parts):
+    '''
+    Splits the range (start, end] into parts subranges of equal width,
+    wrapping around the end of the Murmur3 ring
+    '''
+    width = range_width(start, end)
+    parts = max(min(parts, width), 1)
+    bounds = [start + width * i // parts for i in range(parts + 1)]
+    bounds = [(b - MIN_TOKEN) % RING_SIZE + MIN_TOKEN for b in bounds]
+    return [(bounds[i], bounds[i + 1]) for i in range(parts)]
+
+
+def plan_subranges(ranges, node_address, primary_range, partitions, partitions_per_subrange):
+    '''
+    Returns the subranges of the ranges of the node as a list of
+    [start, end, estimated partitions]
+    '''
+    replica_ranges = [r for r in ranges if node_address in r['endpoints']]
+    node_width = sum(range_width(r['start'], r['end']) for r in replica_ranges)
+    density = float(partitions) / node_width if node_width else 0
+    if primary_range:
+        replica_ranges = [r for r in replica_ranges if r['endpoints'][0] == node_address]
+    subranges = []
+    for r in sorted(replica_ranges, key=lambda r: r['start']):
+        estimate = range_width(r['start'], r['end']) * density
+        parts = max(int(-(-estimate // partitions_per_subrange)), 1)
+        for (start, end) in split_range(r['start'], r['end'], parts):
+            subranges.append([start, end, int(range_width(start, end) * density)])
+    return subranges
+
+
+def in_window(window, t):
+    '''
+    Returns whether the local time t falls into a window of the form
+    HH:MM-HH:MM. The window may span midnight.
+    '''
+    (start, end) = window
+    now = time.localtime(t)
+    minute = now.tm_hour * 60 + now.tm_min
+    if start <= end:
+        return start <= minute < end
+    return minute >= start or minute < end
+
+
+def parse_window(module, window):
+    try:
+        (start, end) = window.split("-")
+        minutes = []
+        for value in (start, end):
+            (hours, mins) = value.strip().split(":")
+            if not (0 <= int(hours) < 24 and 0 <= int(mins) < 60):
+                raise ValueError(value)
+            minutes.append(int(hours) * 60 + int(mins))
+        return tuple(minutes)
+    except ValueError:
+        module.fail_json(msg="window must be of the form HH:MM-HH:MM")
+
+
+def subrange_key(subrange):
+    return "{0}:{1}".format(subrange[0], subrange[1])
+
+
+def write_checkpoint(module, checkpoint_file, checkpoint):
+    (fd, tmp_path) = tempfile.mkstemp(dir=os.path.dirname(checkpoint_file) or ".")
+    with os.fdopen(fd, 'w') as f:
+        f.write(json.dumps(checkpoint, indent=2, sort_keys=True))
+    module.atomic_move(tmp_path, checkpoint_file)
+
+
+def read_checkpoint(module, checkpoint_file):
+    if not os.path.exists(checkpoint_file):
+        return None
+    try:
+        with open(checkpoint_file) as f:
+            return json.load(f)
+    except (IOError, ValueError) as excep:
+        module.fail_json(msg="Unable to read {0}: {1}".format(checkpoint_file, excep))
+
+
+def get_node_address(module, n, result):
+    '''
+    Returns the address nodetool status lists for the host ID of the node
+    '''
+    (rc, out, err) = n.nodetool_cmd("info")
+    if rc != 0:
+        result['msg'] = "nodetool error: {0}".format(err)
+        result['rc'] = rc
+        module.fail_json(**result)
+    host_id = parse_info(out).get('id')
+    (rc, out, err) = n.nodetool_cmd("status")
+    if rc != 0:
+        result['msg'] = "nodetool error: {0}".format(err)
+        result['rc'] = rc
+        module.fail_json(**result)
+    for node in parse_status(out):
+        if host_id is not None and node['host_id'] == host_id:
+            return node['address']
+    result['msg'] = "Unable to find the host ID {0} of the node in nodetool status, set node_address".format(host_id)
+    module.fail_json(**result)
+
+
+def main():
+    argument_spec = cassandra_common_argument_spec()
+    argument_spec.update(
+        keyspace=dict(type='str', required=True, no_log=False),
+        tables=dict(type='list', elements='str'),
+        node_address=dict(type='str'),
+        primary_range=dict(type='bool', default=True),
+        datacenters=dict(type='list', elements='str'),
+        partitions_per_subrange=dict(type='int', default=100000),
+        parallel=dict(type='int', default=1),
+        repair_mode=dict(type='str', choices=['parallel', 'sequential', 'dc_parallel'], default='parallel'),
+        job_threads=dict(type='int', default=1),
+        checkpoint_file=dict(type='path'),
+        reset=dict(type='bool', default=False),
+        window=dict(type='str'),
+        max_duration=dict(type='int'),
+    )
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+    )
+
+    keyspace = module.params['keyspace']
+    tables = module.params['tables'] or []
+    parallel = module.params['parallel']
+    max_duration = module.params['max_duration']
+    checkpoint_file = module.params['checkpoint_file']
+    if checkpoint_file is None:
+        checkpoint_file = "/var/tmp/cassandra_repair_{0}.json".format(keyspace)
+
+    for option in ['partitions_per_subrange', 'parallel', 'job_threads']:
+        if module.params[option] < 1:
+            module.fail_json(msg="{0} must be 1 or more".format(option))
+    window = None
+    if module.params['window'] is not None:
+        window = parse_window(module, module.params['window'])
+
+    result = dict(changed=False, checkpoint_file=checkpoint_file)
+    started = time.time()
+    if window is not None and not in_window(window, started):
+        result['msg'] = "Outside the repair window {0}".format(module.params['window'])
+        module.exit_json(**result)
+
+    n = NodeToolCmd(module)
+    node_address = module.params['node_address']
+    if node_address is None:
+        node_address = get_node_address(module, n, result)
+    datacenters = sorted(module.params['datacenters'] or [])
+
+    checkpoint = None if module.params['reset'] else read_checkpoint(module, checkpoint_file)
+    if checkpoint is not None and (checkpoint['keyspace'] != keyspace
+                                   or sorted(checkpoint['tables']) != sorted(tables)
+                                   or checkpoint['node_address'] != node_address
+                                   or checkpoint.get('primary_range') != module.params['primary_range']
+                                   or checkpoint.get('datacenters') != datacenters
+                                   or len(checkpoint['completed']) == len(checkpoint['subranges'])):
+        checkpoint = None  # a different or finished repair
+
+    if checkpoint is None:
+        (rc, out, err) = n.nodetool_cmd("describering -- {0}".format(keyspace))
+        if rc != 0:
+            result['msg'] = "nodetool error: {0}".format(err)
+            result['rc'] = rc
+            module.fail_json(**result)
+        ranges = parse_describering(out)
+        if not ranges:
+            result['msg'] = "Unable to parse the nodetool describering output"
+            module.fail_json(**result)
+        (rc, out, err) = n.nodetool_cmd("tablestats -- {0}".format(keyspace))
+        if rc != 0:
+            result['msg'] = "nodetool error: {0}".format(err)
+            result['rc'] = rc
+            module.fail_json(**result)
+        partitions = sum(t.get('number_of_partitions') or 0 for t in parse_tablestats(out.splitlines())
+                         if not tables or t['table'] in tables)
+        checkpoint = dict(keyspace=keyspace,
+                          tables=tables,
+                          node_address=node_address,
+                          primary_range=module.params['primary_range'],
+                          datacenters=datacenters,
+                          created=started,
+                          subranges=plan_subranges(ranges, node_address, module.params['primary_range'],
+                                                   partitions, module.params['partitions_per_subrange']),
+                          completed=[],
+                          failed={})
+        if not checkpoint['subranges']:
+            result['msg'] = "The node {0} has no ranges to repair in {1}".format(node_address, keyspace)
+            module.fail_json(**result)
+        if not module.check_mode:
+            write_checkpoint(module, checkpoint_file, checkpoint)
+
+    completed = set(checkpoint['completed'])
+    pending = [s for s in checkpoint['subranges'] if subrange_key(s) not in completed]
+    estimates = dict((subrange_key(s), s[2]) for s in checkpoint['subranges'])
+    result['estimated_partitions'] = sum(estimates.values())
+
+    cmd_suffix = REPAIR_MODE_FLAGS[module.params['repair_mode']]
+    for dc in module.params['datacenters'] or []:
+        cmd_suffix += " -dc {0}".format(dc)
+    cmd_suffix += " -j {0} -- {1}".format(module.params['job_threads'], keyspace)
+    if tables:
+        cmd_suffix += " {0}".format(" ".join(tables))
+
+    lock = threading.Lock()
+    repaired = []
+    errors = {}
+    stopped = []
+
+    def worker():
+        while True:
+            with lock:
+                if not pending or stopped:
+                    return
+                now = time.time()
+                if max_duration is not None and now - started >= max_duration:
+                    stopped.append("max_duration")
+                    return
+                if window is not None and not in_window(window, now):
+                    stopped.append("window")
+                    return
+                subrange = pending.pop(0)
+            key = subrange_key(subrange)
+            cmd = n.build_nodetool_cmd("repair -full -st {0} -et {1}{2}".format(subrange[0], subrange[1], cmd_suffix))
+            (rc, out, err) = n.execute_command(cmd)
+            with lock:
+                if rc == 0:
+                    repaired.append(key)
+                    checkpoint['completed'].append(key)
+                    checkpoint['failed'].pop(key, None)
+                else:
+                    errors[key] = (err or out).strip()
+                    checkpoint['failed'][key] = errors[key]
+                write_checkpoint(module, checkpoint_file, checkpoint)
+
+    if not module.check_mode:
+        threads = [threading.Thread(target=worker) for i in range(min(parallel, max(len(pending), 1)))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    elapsed = time.time() - started
+
+    total = len(checkpoint['subranges'])
+    done = len(checkpoint['completed'])
+    result['subranges'] = dict(total=total,
+                               completed=done,
+                               failed=len(checkpoint['failed']),
+                               remaining=total - done,
+                               repaired=len(repaired))
+    result['finished'] = done == total
+    if stopped:
+        result['stopped'] = stopped[0]
+    if repaired and elapsed > 0:
+        repaired_partitions = sum(estimates[k] for k in repaired)
+        result['throughput'] = dict(subranges_per_hour=round(len(repaired) * 3600 / elapsed, 1),
+                                    partitions_per_second=round(repaired_partitions / elapsed, 1))
+        remaining_partitions = sum(estimates[subrange_key(s)] for s in checkpoint['subranges']
+                                   if subrange_key(s) not in set(checkpoint['completed']))
+        if repaired_partitions > 0:
+            result['eta_seconds'] = round(remaining_partitions * elapsed / repaired_partitions, 1)
+        else:
+            result['eta_seconds'] = round((total - done) * elapsed / len(repaired), 1)
+    result['changed'] = len(repaired) > 0
+
+    if errors:
+        result['errors'] = errors
+        result['msg'] = "{0} subranges failed, they are retried by the next run".format(len(errors))
+        module.fail_json(**result)
+    if module.check_mode:
+        result['msg'] = "{0} of {1} subranges would be repaired".format(len(pending), total)
+    elif result['finished']:
+        result['msg'] = "Repaired {0} subranges, the repair of {1} is finished".format(len(repaired), keyspace)
+    else:
+        result['msg'] = "Repaired {0} subranges, {1} remaining".format(len(repaired), total - done)
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
@@ -11,39 +11,15 @@ module: cassandra_role
 short_description: Manage roles on your Cassandra cluster.
 description: Manage roles on your Cassandra Cluster.
 author: Rhys Campbell (@rhysmeister)
+extends_documentation_fragment:
+  - community.cassandra.cassandra_cql_options
+  - community.cassandra.session_daemon_options
+
 options:
-  login_user:
-    description: The Cassandra user to login with.
-    type: str
-  login_password:
-    description: The Cassandra password to login with.
-    type: str
-  ssl:
-    description: Uses SSL encryption if basic SSL encryption is enabled on Cassandra cluster (without client/server verification)
-    type: bool
-    default: False
-  ssl_cert_reqs:
-    description: SSL verification mode.
-    type: str
-    choices:
-      - 'CERT_NONE'
-      - 'CERT_OPTIONAL'
-      - 'CERT_REQUIRED'
-    default: 'CERT_NONE'
-  ssl_ca_certs:
-    description:
-        The SSL CA chain or certificate location to confirm supplied certificate validity
-        (required when  ssl_cert_reqs is set to CERT_OPTIONAL or CERT_REQUIRED)
-    type: str
-    default: ''
   login_host:
     description: The Cassandra hostname.
     type: list
     elements: str
-  login_port:
-    description: The Cassandra port.
-    type: int
-    default: 9042
   name:
     description: The name of the role to create or manage.
     type: str
@@ -108,6 +84,14 @@ options:
       - Additional debug output.
     type: bool
     default: false
+  coordinator_only:
+    description:
+      - Only connect to the hosts supplied in I(login_host).
+      - "Connection pools are restricted to these hosts with a whitelist load balancing \
+        policy and topology, status and token discovery is disabled."
+      - Connection time then remains constant regardless of the size of the cluster.
+    type: bool
+    default: false
   consistency_level:
     description:
       - Consistency level to perform cassandra queries with.
@@ -203,35 +187,55 @@ msg:
 '''
 
 __metaclass__ = type
-import os.path
-
-try:
-    from cassandra.cluster import Cluster
-    from cassandra.cluster import EXEC_PROFILE_DEFAULT
-    from cassandra.cluster import ExecutionProfile
-    from cassandra.auth import PlainTextAuthProvider
-    from cassandra import AuthenticationFailed
-    from cassandra.query import dict_factory
-    from cassandra import InvalidRequest
-    from cassandra import ConsistencyLevel
-    HAS_CASSANDRA_DRIVER = True
-except Exception:
-    HAS_CASSANDRA_DRIVER = False
 
 from ansible.module_utils.basic import AnsibleModule
-
-try:
-    from ssl import SSLContext, PROTOCOL_TLS
-    import ssl as ssl_lib
-    HAS_SSL_LIBRARY = True
-except Exception:
-    HAS_SSL_LIBRARY = False
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_common_options import CONSISTENCY_LEVELS
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_cql import cassandra_cql_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_cql import check_ssl_options
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_cql import get_auth_provider
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_cql import get_read_and_write_sessions
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_cql import get_ssl_context
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_session_daemon import (
+    RemoteSession,
+    SessionDaemonError,
+    get_session_daemon_sessions,
+    session_daemon_argument_spec,
+)
 
 # =========================================
 # Cassandra module specific support methods
 # =========================================
 
 
+def import_cassandra_driver():
+    '''
+    Imports the cassandra driver into the module namespace.
+    This is deferred until a connection is needed so that argument
+    validation and early failures don't pay the driver import cost.
+    Returns False if the driver is not installed.
+    '''
+    global EXEC_PROFILE_DEFAULT, AuthenticationFailed, dict_factory, InvalidRequest
+    try:
+        from cassandra.cluster import EXEC_PROFILE_DEFAULT
+        from cassandra import AuthenticationFailed
+        from cassandra.query import dict_factory
+        from cassandra import InvalidRequest
+    except Exception:
+        return False
+    return True
+
+
+def get_dict_factory_profile(session):
+    '''
+    Returns an execution profile that returns rows as dicts. Rows from a
+    session daemon are already dict-like and the driver is not imported
+    in that case so no profile is needed.
+    '''
+    if isinstance(session, RemoteSession):
+        return None
+    return session.execution_profile_clone_update(EXEC_PROFILE_DEFAULT, row_factory=dict_factory)
+
+
 # Does the role exist on the cluster?
 def role_exists(session, role):
     cql = "SELECT role FROM system_auth.roles WHERE role = '{0}'".format(role)
@@ -244,7 +248,7 @@ def role_exists(session, role):
 
 def get_role_properties(session, role):
     cql = "SELECT role, can_login, is_superuser, member_of, salted_hash FROM system_auth.roles WHERE role = '{0}'".format(role)
-    dict_factory_profile = session.execution_profile_clone_update(EXEC_PROFILE_DEFAULT, row_factory=dict_factory)
+    dict_factory_profile = get_dict_factory_profile(session)
     role_properties = session.execute(cql, execution_profile=dict_factory_profile)
     return role_properties[0]
 
@@ -389,8 +393,13 @@ def list_role_permissions(session, role):
     '''
     cql = "LIST ALL OF '{0}'".format(role)
     try:
-        dict_factory_profile = session.execution_profile_clone_update(EXEC_PROFILE_DEFAULT, row_factory=dict_factory)
+        dict_factory_profile = get_dict_factory_profile(session)
         role_permissions = session.execute(cql, execution_profile=dict_factory_profile)
+    except SessionDaemonError as excep:
+        # Checked first as InvalidRequest is not imported with a session daemon
+        if excep.error_type != "InvalidRequest":
+            raise
+        role_permissions = []
     except InvalidRequest as excep:
         # excep_code = type(excep).__name__
         # if excep_code == 2200: # User does not exist
@@ -573,82 +582,35 @@ def process_role_permissions(session,
     return cql_dict
 
 
-def get_read_and_write_sessions(login_host,
-                                login_port,
-                                auth_provider,
-                                ssl_context,
-                                consistency_level):
-    profile = ExecutionProfile(
-        consistency_level=ConsistencyLevel.name_to_value[consistency_level])
-    if consistency_level in ["ANY", "EACH_QUORUM"]:  # Not supported for reads
-        cluster_r = Cluster(login_host,
-                            port=login_port,
-                            auth_provider=auth_provider,
-                            ssl_context=ssl_context)  # Will be LOCAL_ONE
-    else:
-        cluster_r = Cluster(login_host,
-                            port=login_port,
-                            auth_provider=auth_provider,
-                            ssl_context=ssl_context,
-                            execution_profiles={EXEC_PROFILE_DEFAULT: profile})
-    if consistency_level in ["SERIAL", "LOCAL_SERIAL"]:  # Not supported for writes
-        cluster_w = Cluster(login_host,
-                            port=login_port,
-                            auth_provider=auth_provider,
-                            ssl_context=ssl_context)  # Will be LOCAL_ONE
-    else:
-        cluster_w = Cluster(login_host,
-                            port=login_port,
-                            auth_provider=auth_provider,
-                            ssl_context=ssl_context,
-                            execution_profiles={EXEC_PROFILE_DEFAULT: profile})
-    return (cluster_r, cluster_w)  # Return a tuple of sessions for C* (read, write)
-
 ############################################
 
 
 def main():
-    module = AnsibleModule(
-        argument_spec=dict(
-            login_user=dict(type='str'),
-            login_password=dict(type='str', no_log=True),
-            ssl=dict(type='bool', default=False),
-            ssl_cert_reqs=dict(type='str',
+    argument_spec = cassandra_cql_argument_spec()
+    argument_spec.update(
+        login_host=dict(type='list', elements='str'),
+        name=dict(type='str', required=True),
+        password=dict(type='str', required=False, no_log=True),
+        state=dict(type='str', required=True, choices=['present', 'absent']),
+        super_user=dict(type='bool', default=False),
+        login=dict(type='bool', default=True),
+        options=dict(type='dict'),
+        data_centres=dict(type='dict', aliases=['data_centers']),
+        keyspace_permissions=dict(type='dict', no_log=False),
+        roles=dict(type='list', elements='str'),
+        update_password=dict(type='bool', default=False),
+        debug=dict(type='bool', default=False),
+        coordinator_only=dict(type='bool', default=False),
+        consistency_level=dict(type='str',
                                required=False,
-                               default='CERT_NONE',
-                               choices=['CERT_NONE',
-                                        'CERT_OPTIONAL',
-                                        'CERT_REQUIRED']),
-            ssl_ca_certs=dict(type='str', default=''),
-            login_host=dict(type='list', elements='str'),
-            login_port=dict(type='int', default=9042),
-            name=dict(type='str', required=True),
-            password=dict(type='str', required=False, no_log=True),
-            state=dict(type='str', required=True, choices=['present', 'absent']),
-            super_user=dict(type='bool', default=False),
-            login=dict(type='bool', default=True),
-            options=dict(type='dict'),
-            data_centres=dict(type='dict', aliases=['data_centers']),
-            keyspace_permissions=dict(type='dict', no_log=False),
-            roles=dict(type='list', elements='str'),
-            update_password=dict(type='bool', default=False),
-            debug=dict(type='bool', default=False),
-            consistency_level=dict(type='str',
-                                   required=False,
-                                   default="LOCAL_ONE",
-                                   choices=ConsistencyLevel.name_to_value.keys())),
+                               default="LOCAL_ONE",
+                               choices=CONSISTENCY_LEVELS))
+    argument_spec.update(session_daemon_argument_spec())
+    module = AnsibleModule(
+        argument_spec=argument_spec,
         supports_check_mode=True
     )
 
-    if HAS_CASSANDRA_DRIVER is False:
-        msg = ("This module requires the cassandra-driver python"
-               " driver. You can probably install it with pip"
-               " install cassandra-driver.")
-        module.fail_json(msg=msg)
-
-    login_user = module.params['login_user']
-    login_password = module.params['login_password']
-    ssl = module.params['ssl']
     login_host = module.params['login_host']
     login_port = module.params['login_port']
     name = module.params['name']
@@ -664,24 +626,10 @@ def main():
     roles = module.params['roles']
     debug = module.params['debug']
     consistency_level = module.params['consistency_level']
+    coordinator_only = module.params['coordinator_only']
+    session_daemon = module.params['session_daemon']
 
-    if HAS_SSL_LIBRARY is False and ssl is True:
-        msg = ("This module requires the SSL python"
-               " library. You can probably install it with pip"
-               " install ssl.")
-        module.fail_json(msg=msg)
-
-    ssl_cert_reqs = module.params['ssl_cert_reqs']
-    ssl_ca_certs = module.params['ssl_ca_certs']
-
-    if ssl_cert_reqs in ('CERT_REQUIRED', 'CERT_OPTIONAL') and ssl_ca_certs == '':
-        msg = ("When verify mode is set to CERT_REQUIRED or CERT_OPTIONAL "
-               "ssl_ca_certs is also required to be set and not empty")
-        module.fail_json(msg=msg)
-
-    if ssl_cert_reqs in ('CERT_REQUIRED', 'CERT_OPTIONAL') and os.path.exists(ssl_ca_certs) is not True:
-        msg = ("ssl_ca_certs certificate: File not found")
-        module.fail_json(msg=msg)
+    check_ssl_options(module)
 
     result = dict(
         changed=False,
@@ -694,37 +642,42 @@ def main():
     # Need to figure out password hashing
     # https://shiro.apache.org/configuration.html#Configuration-EncryptingPasswords
 
-    try:
-        if keyspace_permissions is not None:
-            if not validate_keyspace_permissions(keyspace_permissions):
-                module.fail_json(msg=("Invalid permission provided in the "
-                                 "keyspace_permission parameter."))
-        auth_provider = None
-        if login_user is not None:
-            auth_provider = PlainTextAuthProvider(
-                username=login_user,
-                password=login_password
-            )
-        ssl_context = None
-        if ssl is True:
-            ssl_context = SSLContext(PROTOCOL_TLS)
-            ssl_context.verify_mode = getattr(ssl_lib, module.params['ssl_cert_reqs'])
-            if ssl_cert_reqs in ('CERT_REQUIRED', 'CERT_OPTIONAL'):
-                ssl_context.load_verify_locations(module.params['ssl_ca_certs'])
-
-        sessions = get_read_and_write_sessions(login_host,
-                                               login_port,
-                                               auth_provider,
-                                               ssl_context,
-                                               consistency_level)
-
-        session_r = sessions[0].connect()
-        session_w = sessions[1].connect()
-
-    except AuthenticationFailed as auth_failed:
-        module.fail_json(msg="Authentication failed: {0}".format(auth_failed))
-    except Exception as excep:
-        module.fail_json(msg="Error connecting to cluster: {0}".format(excep))
+    if keyspace_permissions is not None:
+        if not validate_keyspace_permissions(keyspace_permissions):
+            module.fail_json(msg=("Invalid permission provided in the "
+                             "keyspace_permission parameter."))
+
+    def connect():
+        # Runs inside the session daemon when session_daemon is set so
+        # the module itself never imports the driver
+        return get_read_and_write_sessions(login_host,
+                                           login_port,
+                                           get_auth_provider(module),
+                                           get_ssl_context(module),
+                                           consistency_level,
+                                           coordinator_only)
+
+    if session_daemon:
+        try:
+            (session_r, session_w) = get_session_daemon_sessions(module, connect)
+        except SessionDaemonError as excep:
+            module.fail_json(msg=str(excep))
+        except Exception as excep:
+            module.fail_json(msg="Error connecting to cluster: {0}".format(excep))
+    else:
+        if import_cassandra_driver() is False:
+            msg = ("This module requires the cassandra-driver python"
+                   " driver. You can probably install it with pip"
+                   " install cassandra-driver.")
+            module.fail_json(msg=msg)
+        try:
+            sessions = connect()
+            session_r = sessions[0].connect()
+            session_w = sessions[1].connect()
+        except AuthenticationFailed as excep:
+            module.fail_json(msg="Authentication failed: {0}".format(excep))
+        except Exception as excep:
+            module.fail_json(msg="Error connecting to cluster: {0}".format(excep))
 
     has_role_changed = False
 
@@ -0,0 +1,205 @@
+#!/usr/bin/python
+
+# 2026 Rhys Campbell <rhyscampbell@bluewin.ch>
+# https://github.com/rhysmeister
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+DOCUMENTATION = '''
+---
+module: cassandra_runtime_config
+author: Rhys Campbell (@rhysmeister)
+short_description: Sets several runtime settings of a node in one task.
+requirements:
+  - nodetool
+description:
+  - Reads the current values of the given runtime settings, compares them with the desired values \
+    and only runs the nodetool set commands of the settings that differ.
+  - Replaces a series of tasks using M(community.cassandra.cassandra_compactionthroughput), \
+    M(community.cassandra.cassandra_streamthroughput), M(community.cassandra.cassandra_timeout), \
+    M(community.cassandra.cassandra_concurrency), M(community.cassandra.cassandra_maxhintwindow) and similar \
+    modules that each run a get and a set command.
+  - Each nodetool command starts its own JVM so the get commands, and then the set commands, \
+    are run I(parallel) at a time. The settings are independent of each other so the order they are set in does not matter.
+  - Settings that are not given are left as they are.
+  - The values are set at runtime only and are lost when Cassandra restarts.
+
+extends_documentation_fragment:
+  - community.cassandra.nodetool_module_options
+
+options:
+  compaction_throughput:
+    description:
+      - The compaction throughput in MB/s. 0 disables throttling.
+    type: int
+  stream_throughput:
+    description:
+      - The stream throughput in Mb/s. 0 disables throttling.
+    type: int
+  interdc_stream_throughput:
+    description:
+      - The inter-dc stream throughput in Mb/s. 0 disables throttling.
+    type: int
+  timeouts:
+    description:
+      - The timeouts in milliseconds by timeout type.
+    type: dict
+    suboptions:
+      read:
+        description: The read timeout.
+        type: int
+      range:
+        description: The range timeout.
+        type: int
+      write:
+        description: The write timeout.
+        type: int
+      counterwrite:
+        description: The counter write timeout.
+        type: int
+      cascontention:
+        description: The cas contention timeout.
+        type: int
+      truncate:
+        description: The truncate timeout.
+        type: int
+      internodeconnect:
+        description: The internode connect timeout.
+        type: int
+      internodeuser:
+        description: The internode user timeout.
+        type: int
+      internodestreaminguser:
+        description: The internode streaming user timeout.
+        type: int
+      misc:
+        description: The misc timeout.
+        type: int
+  concurrency:
+    description:
+      - The maximum pool size by stage, i.e. C(ReadStage).
+    type: dict
+  concurrent_compactors:
+    description:
+      - The number of concurrent compactors.
+    type: int
+  concurrent_view_builders:
+    description:
+      - The number of concurrent view builders.
+    type: int
+  max_hint_window:
+    description:
+      - The max hint window in milliseconds.
+    type: int
+  batchlog_replay_throttle:
+    description:
+      - The batchlog replay throttle in KB/s.
+    type: int
+  trace_probability:
+    description:
+      - The trace probability between 0 and 1.
+    type: float
+  parallel:
+    description:
+      - The number of nodetool commands to run at the same time.
+    type: int
+    default: 4
+'''
+
+EXAMPLES = '''
+- name: Apply the bulk load profile
+  community.cassandra.cassandra_runtime_config:
+    compaction_throughput: 256
+    concurrent_compactors: 8
+    stream_throughput: 800
+    timeouts:
+      write: 5000
+      range: 20000
+    concurrency:
+      MutationStage: 64
+  register: bulk_load
+
+- name: Show what was changed
+  ansible.builtin.debug:
+    var: bulk_load.settings
+'''
+
+RETURN = '''
+msg:
+  description: A message indicating what has happened.
+  returned: always
+  type: str
+settings:
+  description:
+    - The value before and after of each given setting keyed by its dotted name.
+    - after is the desired value once it has been set, or would have been set in check mode.
+  returned: on success
+  type: dict
+  sample: >
+    { "compaction_throughput": { "before": 64, "after": 256, "changed": true },
+      "timeouts.write": { "before": 2000, "after": 5000, "changed": true },
+      "concurrency.MutationStage": { "before": 64, "after": 64, "changed": false } }
+errors:
+  description: The nodetool commands that failed.
+  returned: on failure
+  type: dict
+rc:
+  description: Return code of the failed command.
+  returned: on failure
+  type: int
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+__metaclass__ = type
+
+
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_cmd_objects import NodeToolCmd
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_common_options import cassandra_common_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_runtime import runtime_settings_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_runtime import desired_runtime_settings
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_runtime import apply_runtime_settings
+
+
+def main():
+    argument_spec = cassandra_common_argument_spec()
+    argument_spec.update(runtime_settings_argument_spec())
+    argument_spec.update(
+        parallel=dict(type='int', default=4),
+    )
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+    )
+
+    parallel = module.params['parallel']
+    if parallel < 1:
+        module.fail_json(msg="parallel must be 1 or more")
+    desired = desired_runtime_settings(module, module.params)
+    if not desired:
+        module.fail_json(msg="Nothing to do, no settings given")
+
+    result = dict(changed=False)
+    n = NodeToolCmd(module)
+    (settings, errors) = apply_runtime_settings(module, n, desired, parallel)
+    changed = sorted(name for name in settings if settings[name]['changed'])
+    result['settings'] = settings
+
+    if errors:
+        result['changed'] = len(changed) > 0
+        result['errors'] = errors
+        result['msg'] = "{0} set commands failed".format(len(errors))
+        result['rc'] = 1
+        module.fail_json(**result)
+
+    result['changed'] = len(changed) > 0
+    if changed:
+        result['msg'] = "Changed {0}".format(", ".join(changed))
+    else:
+        result['msg'] = "All settings already have the desired value"
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
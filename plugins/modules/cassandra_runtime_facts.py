@@ -0,0 +1,171 @@
+#!/usr/bin/python
+
+# 2026 Rhys Campbell <rhyscampbell@bluewin.ch>
+# https://github.com/rhysmeister
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+DOCUMENTATION = '''
+---
+module: cassandra_runtime_facts
+author: Rhys Campbell (@rhysmeister)
+short_description: Returns the runtime settings of a node in one task.
+requirements:
+  - nodetool
+description:
+  - Returns the values read by the nodetool get and status commands in one dict, i.e. the compaction, \
+    stream and inter-dc stream throughput, every timeout type, the concurrency of each stage, \
+    the hint window, the batchlog replay throttle and the trace probability.
+  - Each nodetool command starts its own JVM so the commands are run I(parallel) at a time.
+  - Settings the Cassandra version does not support are returned as null and listed in errors.
+  - The values are also returned as the fact I(fact_name). When fact caching is enabled later plays \
+    can reuse them without running nodetool again.
+
+extends_documentation_fragment:
+  - community.cassandra.nodetool_module_options
+
+options:
+  gather:
+    description:
+      - The groups of settings to return.
+      - throughput returns compaction_throughput, stream_throughput and interdc_stream_throughput.
+      - timeouts returns timeouts, concurrency returns concurrency, concurrent_compactors and \
+        concurrent_view_builders, hints returns max_hint_window, batchlog returns batchlog_replay_throttle, \
+        trace returns trace_probability and status returns whether binary, gossip, handoff and backup are running.
+    type: list
+    elements: str
+    choices:
+      - all
+      - throughput
+      - timeouts
+      - concurrency
+      - hints
+      - batchlog
+      - trace
+      - status
+    default:
+      - all
+  parallel:
+    description:
+      - The number of nodetool commands to run at the same time.
+    type: int
+    default: 4
+  fact_name:
+    description:
+      - The name of the fact the runtime settings are returned as.
+      - Set to an empty string to not return a fact.
+    type: str
+    default: cassandra_runtime
+'''
+
+EXAMPLES = '''
+- name: Get the runtime settings
+  community.cassandra.cassandra_runtime_facts:
+
+- name: Show the read timeout
+  ansible.builtin.debug:
+    var: cassandra_runtime.timeouts.read
+
+- name: Only get the throughput settings
+  community.cassandra.cassandra_runtime_facts:
+    gather:
+      - throughput
+  register: runtime
+'''
+
+RETURN = '''
+msg:
+  description: A message indicating what has happened.
+  returned: always
+  type: str
+runtime:
+  description:
+    - The runtime settings of the requested groups.
+    - Throughput values are in the units of the nodetool get commands, MB/s for compaction and Mb/s for streaming.
+    - Timeouts and max_hint_window are in milliseconds and batchlog_replay_throttle in KB/s.
+    - concurrency holds the maximum pool size of each stage.
+  returned: on success
+  type: dict
+  sample: >
+    { "compaction_throughput": 64, "stream_throughput": 200, "interdc_stream_throughput": 200,
+      "timeouts": { "read": 5000, "range": 10000, "write": 2000, "counterwrite": 5000,
+                    "cascontention": 1000, "truncate": 60000, "internodeconnect": 2000,
+                    "internodeuser": 30000, "internodestreaminguser": 300000, "misc": 10000 },
+      "concurrency": { "MutationStage": 32, "ReadStage": 32 },
+      "concurrent_compactors": 2, "concurrent_view_builders": 1,
+      "max_hint_window": 10800000, "batchlog_replay_throttle": 1024, "trace_probability": 0.0,
+      "status": { "binary": true, "gossip": true, "handoff": true, "backup": false },
+      "cassandra_version": "4.0" }
+errors:
+  description: The get commands that failed or returned output that could not be parsed.
+  returned: on success
+  type: dict
+  sample: >
+    { "getconcurrentviewbuilders": "nodetool: Found unexpected parameters: [getconcurrentviewbuilders]" }
+ansible_facts:
+  description: The runtime value as the fact I(fact_name).
+  returned: when fact_name is set
+  type: dict
+rc:
+  description: Return code of the last failed command.
+  returned: on failure
+  type: int
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+__metaclass__ = type
+
+
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_cmd_objects import NodeToolCmd
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_common_options import cassandra_common_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_runtime import RUNTIME_GROUPS
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_runtime import get_runtime
+
+
+def main():
+    argument_spec = cassandra_common_argument_spec()
+    argument_spec.update(
+        gather=dict(type='list', elements='str', choices=['all'] + RUNTIME_GROUPS, default=['all']),
+        parallel=dict(type='int', default=4),
+        fact_name=dict(type='str', default='cassandra_runtime'),
+    )
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+    )
+
+    groups = module.params['gather']
+    if 'all' in groups:
+        groups = RUNTIME_GROUPS
+    parallel = module.params['parallel']
+    fact_name = module.params['fact_name']
+    if parallel < 1:
+        module.fail_json(msg="parallel must be 1 or more")
+
+    result = dict(changed=False)
+    n = NodeToolCmd(module)
+    (runtime, errors) = get_runtime(n, groups, parallel)
+
+    values = [v for v in runtime.values() if not isinstance(v, dict)]
+    values += [s for v in runtime.values() if isinstance(v, dict) for s in v.values()]
+    if errors and all(v is None for v in values):
+        result['msg'] = "nodetool error: {0}".format(list(errors.values())[0])
+        result['errors'] = errors
+        result['rc'] = 1
+        module.fail_json(**result)
+
+    runtime['cassandra_version'] = module.params['cassandra_version']
+    result['runtime'] = runtime
+    result['errors'] = errors
+    if fact_name:
+        result['ansible_facts'] = {fact_name: runtime}
+    result['msg'] = "Runtime settings returned"
+    if errors:
+        result['msg'] = "Runtime settings returned, {0} commands failed".format(len(errors))
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,373 @@
+#!/usr/bin/python
+
+# 2026 Rhys Campbell <rhyscampbell@bluewin.ch>
+# https://github.com/rhysmeister
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+DOCUMENTATION = '''
+---
+module: cassandra_runtime_profile
+author: Rhys Campbell (@rhysmeister)
+short_description: Applies a temporary runtime profile and restores the previous values.
+requirements:
+  - nodetool
+  - systemd-run when expiry is set
+description:
+  - With I(state=applied) the current values of the settings in I(settings) are saved to I(state_file) \
+    before any setting is changed, and then the settings are changed, i.e. to raise the compaction and stream throughput and the number of \
+    compactors before a repair or a bulk load.
+  - With I(state=restored) the saved values are set again and I(state_file) is removed.
+  - Applying a profile while a snapshot exists keeps the saved values so the restore always returns \
+    to the values from before the first profile was applied.
+  - With I(expiry) a transient systemd timer restores the saved values on the host after that many seconds, \
+    even when the play that applied the profile does not finish. Restoring the profile stops the timer.
+  - The timer runs a script next to I(state_file) holding the nodetool commands, including the credentials \
+    when I(password) is used. Use I(password_file) to keep the password out of the script.
+  - The script only removes I(state_file) when every nodetool command succeeded, otherwise the values \
+    can be restored again with I(state=restored).
+
+extends_documentation_fragment:
+  - community.cassandra.nodetool_module_options
+
+options:
+  state:
+    description:
+      - Whether to apply the profile or restore the saved values.
+    type: str
+    choices:
+      - applied
+      - restored
+    default: applied
+  profile:
+    description:
+      - The name of the profile.
+      - Required when I(state=applied).
+    type: str
+  settings:
+    description:
+      - The runtime settings of the profile.
+      - The settings are those of M(community.cassandra.cassandra_runtime_config).
+      - Required when I(state=applied).
+    type: dict
+    suboptions:
+      compaction_throughput:
+        description: The compaction throughput in MB/s.
+        type: int
+      stream_throughput:
+        description: The stream throughput in Mb/s.
+        type: int
+      interdc_stream_throughput:
+        description: The inter-dc stream throughput in Mb/s.
+        type: int
+      timeouts:
+        description: The timeouts in milliseconds by timeout type.
+        type: dict
+        suboptions:
+          read:
+            description: The read timeout.
+            type: int
+          range:
+            description: The range timeout.
+            type: int
+          write:
+            description: The write timeout.
+            type: int
+          counterwrite:
+            description: The counterwrite timeout.
+            type: int
+          cascontention:
+            description: The cascontention timeout.
+            type: int
+          truncate:
+            description: The truncate timeout.
+            type: int
+          internodeconnect:
+            description: The internodeconnect timeout.
+            type: int
+          internodeuser:
+            description: The internodeuser timeout.
+            type: int
+          internodestreaminguser:
+            description: The internodestreaminguser timeout.
+            type: int
+          misc:
+            description: The misc timeout.
+            type: int
+      concurrency:
+        description: The maximum pool size by stage, i.e. C(MutationStage).
+        type: dict
+      concurrent_compactors:
+        description: The number of concurrent compactors.
+        type: int
+      concurrent_view_builders:
+        description: The number of concurrent view builders.
+        type: int
+      max_hint_window:
+        description: The max hint window in milliseconds.
+        type: int
+      batchlog_replay_throttle:
+        description: The batchlog replay throttle in KB/s.
+        type: int
+      trace_probability:
+        description: The trace probability between 0 and 1.
+        type: float
+  state_file:
+    description:
+      - The file the saved values are kept in.
+    type: path
+    default: /var/tmp/cassandra_runtime_profile.json
+  expiry:
+    description:
+      - Restore the saved values after this many seconds with a systemd timer on the host.
+      - Applying the profile again restarts the timer.
+    type: int
+  timer_unit:
+    description:
+      - The name of the transient systemd unit running the restore.
+    type: str
+    default: cassandra-runtime-profile-restore
+  parallel:
+    description:
+      - The number of nodetool commands to run at the same time.
+    type: int
+    default: 4
+'''
+
+EXAMPLES = '''
+- name: Raise the throughput for the repair, restoring it after 6 hours at the latest
+  community.cassandra.cassandra_runtime_profile:
+    profile: repair
+    settings:
+      compaction_throughput: 256
+      stream_throughput: 800
+      concurrent_compactors: 8
+    expiry: 21600
+
+- name: Repair the node
+  community.cassandra.cassandra_repair:
+    keyspace: myapp
+
+- name: Restore the previous values
+  community.cassandra.cassandra_runtime_profile:
+    state: restored
+'''
+
+RETURN = '''
+msg:
+  description: A message indicating what has happened.
+  returned: always
+  type: str
+profile:
+  description: The name of the profile applied or restored.
+  returned: when a profile was applied or restored
+  type: str
+settings:
+  description: The value before and after of each setting keyed by its dotted name.
+  returned: when a profile was applied or restored
+  type: dict
+  sample: >
+    { "compaction_throughput": { "before": 64, "after": 256, "changed": true },
+      "concurrent_compactors": { "before": 2, "after": 8, "changed": true } }
+snapshot:
+  description: The saved values keyed by their dotted name.
+  returned: when a profile was applied or restored
+  type: dict
+  sample: >
+    { "compaction_throughput": 64, "concurrent_compactors": 2 }
+expires:
+  description: The unix time the timer restores the saved values at.
+  returned: when expiry is set
+  type: float
+errors:
+  description: The nodetool commands that failed.
+  returned: on failure
+  type: dict
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+import json
+import os
+import tempfile
+import time
+__metaclass__ = type
+
+
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_cmd_objects import NodeToolCmd
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_common_options import cassandra_common_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_runtime import runtime_settings_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_runtime import desired_runtime_settings
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_runtime import apply_runtime_settings
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_runtime import read_runtime_settings
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_runtime import set_runtime_settings
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_runtime import runtime_set_command
+
+
+def read_state_file(module, state_file):
+    if not os.path.exists(state_file):
+        return None
+    try:
+        with open(state_file) as f:
+            return json.load(f)
+    except (IOError, ValueError) as excep:
+        module.fail_json(msg="Unable to read {0}: {1}".format(state_file, excep))
+
+
+def write_file(module, path, content, mode):
+    '''
+    Writes content to path through a temporary file in the same directory
+    so a reader never sees a partial file
+    '''
+    (fd, tmp_path) = tempfile.mkstemp(dir=os.path.dirname(path) or ".")
+    with os.fdopen(fd, 'w') as f:
+        f.write(content)
+    os.chmod(tmp_path, mode)
+    module.atomic_move(tmp_path, path)
+
+
+def restore_script(n, state_file, snapshot):
+    '''
+    Returns the shell script the systemd timer runs to restore the snapshot.
+    The state file is only removed when every set command succeeded so a
+    failed restore can be retried with state=restored.
+    '''
+    lines = ["#!/bin/sh",
+             "# Restores the runtime settings saved by community.cassandra.cassandra_runtime_profile",
+             "rc=0"]
+    for name in sorted(snapshot):
+        lines.append("{0} || rc=1".format(n.build_nodetool_cmd(runtime_set_command(name.split("."), snapshot[name]))))
+    lines.append("if [ $rc -eq 0 ]; then")
+    lines.append("    rm -f '{0}' \"$0\"".format(state_file))
+    lines.append("fi")
+    lines.append("exit $rc")
+    return "\n".join(lines) + "\n"
+
+
+def stop_timer(module, timer_unit):
+    systemctl = module.get_bin_path('systemctl')
+    if systemctl is not None:
+        module.run_command([systemctl, 'stop', "{0}.timer".format(timer_unit)])
+        module.run_command([systemctl, 'reset-failed', "{0}.service".format(timer_unit)])
+
+
+def main():
+    argument_spec = cassandra_common_argument_spec()
+    argument_spec.update(
+        state=dict(type='str', choices=['applied', 'restored'], default='applied'),
+        profile=dict(type='str'),
+        settings=dict(type='dict', options=runtime_settings_argument_spec()),
+        state_file=dict(type='path', default='/var/tmp/cassandra_runtime_profile.json'),
+        expiry=dict(type='int'),
+        timer_unit=dict(type='str', default='cassandra-runtime-profile-restore'),
+        parallel=dict(type='int', default=4),
+    )
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+        required_if=[["state", "applied", ["profile", "settings"]]],
+    )
+
+    state = module.params['state']
+    profile = module.params['profile']
+    state_file = module.params['state_file']
+    expiry = module.params['expiry']
+    timer_unit = module.params['timer_unit']
+    parallel = module.params['parallel']
+    script_file = "{0}.restore.sh".format(state_file)
+
+    if parallel < 1:
+        module.fail_json(msg="parallel must be 1 or more")
+    if expiry is not None and expiry < 1:
+        module.fail_json(msg="expiry must be 1 or more")
+
+    result = dict(changed=False)
+    saved = read_state_file(module, state_file)
+
+    if state == "restored":
+        if saved is None:
+            result['msg'] = "No saved values to restore"
+            module.exit_json(**result)
+        n = NodeToolCmd(module)
+        desired = [(name.split("."), value) for (name, value) in sorted(saved['snapshot'].items())]
+        (settings, errors) = apply_runtime_settings(module, n, desired, parallel)
+        result['profile'] = saved['profile']
+        result['settings'] = settings
+        result['snapshot'] = saved['snapshot']
+        result['changed'] = len([s for s in settings.values() if s['changed']]) > 0
+        if errors:
+            result['errors'] = errors
+            result['msg'] = "{0} set commands failed, the saved values are kept".format(len(errors))
+            module.fail_json(**result)
+        if not module.check_mode:
+            stop_timer(module, timer_unit)
+            for path in (state_file, script_file):
+                if os.path.exists(path):
+                    os.remove(path)
+        result['msg'] = "Restored the values saved before profile {0}".format(saved['profile'])
+        module.exit_json(**result)
+
+    desired = desired_runtime_settings(module, module.params['settings'])
+    if not desired:
+        module.fail_json(msg="Nothing to do, the profile has no settings")
+    systemd_run = None
+    if expiry is not None:
+        systemd_run = module.get_bin_path('systemd-run', required=True)
+
+    n = NodeToolCmd(module)
+    settings = read_runtime_settings(module, n, desired, parallel)
+
+    # Keep the values saved before the first profile, only adding settings it did not touch
+    snapshot = dict(saved['snapshot']) if saved is not None else {}
+    for name in settings:
+        if name not in snapshot:
+            snapshot[name] = settings[name]['before']
+    result['profile'] = profile
+    result['snapshot'] = snapshot
+
+    # Save the values before setting anything so they can always be restored
+    new_state = dict(profile=profile,
+                     applied=time.time(),
+                     expires=saved.get('expires') if saved is not None else None,
+                     snapshot=snapshot)
+    if expiry is not None:
+        new_state['expires'] = time.time() + expiry
+    if not module.check_mode:
+        write_file(module, state_file, json.dumps(new_state, indent=2, sort_keys=True), 0o600)
+        if expiry is not None or os.path.exists(script_file):
+            # A running timer must restore the settings of this profile too
+            write_file(module, script_file, restore_script(n, state_file, snapshot), 0o700)
+
+    errors = set_runtime_settings(module, n, settings, parallel)
+    result['settings'] = settings
+    changed = len([s for s in settings.values() if s['changed']]) > 0
+    if saved is None or saved['snapshot'] != snapshot or saved['profile'] != profile:
+        changed = True
+
+    if expiry is not None:
+        if not module.check_mode:
+            stop_timer(module, timer_unit)
+            (rc, out, err) = module.run_command([systemd_run,
+                                                 "--unit={0}".format(timer_unit),
+                                                 "--on-active={0}".format(expiry),
+                                                 "--timer-property=AccuracySec=1s",
+                                                 "/bin/sh", script_file])
+            if rc != 0:
+                result['msg'] = "Unable to start the restore timer: {0}".format(err)
+                result['rc'] = rc
+                module.fail_json(**result)
+            result['expires'] = new_state['expires']
+        changed = True
+
+    result['changed'] = changed
+    if errors:
+        result['errors'] = errors
+        result['msg'] = "{0} set commands failed, restore to undo the others".format(len(errors))
+        module.fail_json(**result)
+    result['msg'] = "Applied profile {0}".format(profile)
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
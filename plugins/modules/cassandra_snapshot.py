@@ -0,0 +1,398 @@
+#!/usr/bin/python
+
+# 2026 Rhys Campbell <rhyscampbell@bluewin.ch>
+# https://github.com/rhysmeister
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+DOCUMENTATION = '''
+---
+module: cassandra_snapshot
+author: Rhys Campbell (@rhysmeister)
+short_description: Takes, lists and clears snapshots and applies a retention policy.
+requirements:
+  - nodetool
+description:
+  - Takes a snapshot with nodetool snapshot, clears one with nodetool clearsnapshot or lists the snapshots \
+    with nodetool listsnapshots.
+  - A snapshot is only taken when no snapshot with the tag exists and only cleared when one does.
+  - With I(keep_last) or I(max_age_days) the snapshots whose tag starts with I(tag_prefix) are cleared once \
+    there are more than I(keep_last) of them or they are older than I(max_age_days). The snapshot taken by the task \
+    is never cleared.
+  - With I(hosts) the same tag is snapshotted, cleared or listed on every node at the same time with nodetool over JMX, \
+    i.e. to take a cluster wide backup point from a single task with run_once. Remote JMX access must be enabled.
+  - The returned sizes are those of nodetool listsnapshots. The true size is the disk space only used by the snapshot, \
+    size on disk includes the SSTables the snapshot shares with the live data through hard links.
+
+extends_documentation_fragment:
+  - community.cassandra.nodetool_module_options
+
+options:
+  state:
+    description:
+      - present takes the snapshot, absent clears it and list only returns the snapshots.
+    type: str
+    choices:
+      - present
+      - absent
+      - list
+    default: present
+  tag:
+    description:
+      - The name of the snapshot.
+      - Defaults to I(tag_prefix) followed by the current epoch time when taking a snapshot.
+      - Required for I(state=absent).
+    type: str
+  tag_prefix:
+    description:
+      - The prefix of the generated tags and of the tags the retention policy applies to.
+    type: str
+    default: ansible
+  keyspaces:
+    description:
+      - The keyspaces to snapshot or clear. All keyspaces when not given.
+    type: list
+    elements: str
+  tables:
+    description:
+      - The tables to snapshot as keyspace.table.
+    type: list
+    elements: str
+  skip_flush:
+    description:
+      - Do not flush the memtables before taking the snapshot.
+    type: bool
+    default: false
+  keep_last:
+    description:
+      - The number of snapshots with I(tag_prefix) to keep.
+    type: int
+  max_age_days:
+    description:
+      - Clear the snapshots with I(tag_prefix) older than this many days.
+      - The age is read from the creation time of nodetool listsnapshots on Cassandra 4.1 and later \
+        and from the epoch time at the end of generated tags otherwise.
+    type: int
+  hosts:
+    description:
+      - Run on all these nodes at the same time rather than on I(host) only.
+    type: list
+    elements: str
+  parallel:
+    description:
+      - The number of nodes run on at the same time when I(hosts) is set.
+      - Defaults to all nodes.
+    type: int
+'''
+
+EXAMPLES = '''
+- name: Take a snapshot of a keyspace
+  community.cassandra.cassandra_snapshot:
+    tag: before_upgrade
+    keyspaces:
+      - myapp
+
+- name: Take the same nightly snapshot on every node and keep a week of them
+  community.cassandra.cassandra_snapshot:
+    tag: "nightly-{{ ansible_date_time.epoch }}"
+    tag_prefix: nightly
+    hosts: "{{ groups['cassandra'] }}"
+    keep_last: 7
+  run_once: true
+
+- name: Clear a snapshot
+  community.cassandra.cassandra_snapshot:
+    tag: before_upgrade
+    state: absent
+
+- name: List the snapshots
+  community.cassandra.cassandra_snapshot:
+    state: list
+  register: snapshots
+'''
+
+RETURN = '''
+msg:
+  description: A message indicating what has happened.
+  returned: always
+  type: str
+tag:
+  description: The tag of the snapshot.
+  returned: when state is present or absent
+  type: str
+snapshots:
+  description:
+    - The snapshots after the task by tag with their keyspaces, number of tables, creation time and sizes.
+    - The sizes are the totals of all nodes, nodes holds the sizes of each node.
+  returned: on success
+  type: dict
+  sample: >
+    { "ansible-1792398000": { "keyspaces": [ "myapp" ], "tables": 4, "creation_time": 1792398000,
+                              "true_size_bytes": 1258291, "size_on_disk_bytes": 5767168,
+                              "nodes": { "10.0.0.1": { "true_size_bytes": 1258291, "size_on_disk_bytes": 5767168 } } } }
+created:
+  description: The nodes the snapshot was taken on.
+  returned: when state is present
+  type: list
+cleared:
+  description: The tags cleared on each node.
+  returned: on success
+  type: dict
+  sample: >
+    { "10.0.0.1": [ "ansible-1791793200" ] }
+errors:
+  description: The error of each node that failed.
+  returned: on failure
+  type: dict
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+import calendar
+import re
+import threading
+import time
+__metaclass__ = type
+
+
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_cmd_objects import NodeToolCmd
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_cmd_objects import nodetool_for_host
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_common_options import cassandra_common_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_parsers import parse_listsnapshots
+
+
+TAG_REGEX = re.compile(r"^[A-Za-z0-9_.:-]+$")
+
+TAG_EPOCH_REGEX = re.compile(r"-(\d{9,10})$")
+
+
+def creation_time(row):
+    '''
+    Returns the epoch time a snapshot was taken from the creation time of
+    nodetool listsnapshots, i.e. 2026-10-18T22:00:01.123Z, or from the
+    epoch time at the end of the tag. None when neither is available.
+    '''
+    if row['creation_time']:
+        try:
+            return calendar.timegm(time.strptime(row['creation_time'].split(".")[0].rstrip("Z"), "%Y-%m-%dT%H:%M:%S"))
+        except ValueError:
+            pass
+    match = TAG_EPOCH_REGEX.search(row['tag'])
+    if match is not None:
+        return int(match.group(1))
+    return None
+
+
+def group_snapshots(rows):
+    '''
+    Returns the listsnapshots rows of one node by tag, i.e.
+
+    { "nightly": { "keyspaces": [ "myapp" ], "tables": 2, "creation_time": 1792398000,
+                   "true_size_bytes": 1258291, "size_on_disk_bytes": 5767168 } }
+    '''
+    snapshots = {}
+    for row in rows:
+        snapshot = snapshots.setdefault(row['tag'], dict(keyspaces=[],
+                                                         tables=0,
+                                                         creation_time=creation_time(row),
+                                                         true_size_bytes=0,
+                                                         size_on_disk_bytes=0))
+        if row['keyspace'] not in snapshot['keyspaces']:
+            snapshot['keyspaces'].append(row['keyspace'])
+        snapshot['tables'] += 1
+        snapshot['true_size_bytes'] += row['true_size_bytes']
+        snapshot['size_on_disk_bytes'] += row['size_on_disk_bytes']
+    return snapshots
+
+
+def expired_snapshots(snapshots, tag_prefix, keep_last, max_age_days, keep_tag, now):
+    '''
+    Returns the tags of the snapshots with tag_prefix to clear, newest
+    first. keep_tag is never returned.
+    '''
+    managed = [(s['creation_time'] or 0, tag) for (tag, s) in snapshots.items() if tag.startswith(tag_prefix)]
+    managed.sort(reverse=True)
+    expired = []
+    for (i, (created, tag)) in enumerate(managed):
+        if tag == keep_tag:
+            continue
+        if keep_last is not None and i >= keep_last:
+            expired.append(tag)
+        elif max_age_days is not None and created and now - created > max_age_days * 86400:
+            expired.append(tag)
+    return expired
+
+
+def main():
+    argument_spec = cassandra_common_argument_spec()
+    argument_spec.update(
+        state=dict(type='str', choices=['present', 'absent', 'list'], default='present'),
+        tag=dict(type='str'),
+        tag_prefix=dict(type='str', default='ansible'),
+        keyspaces=dict(type='list', elements='str', no_log=False),
+        tables=dict(type='list', elements='str'),
+        skip_flush=dict(type='bool', default=False),
+        keep_last=dict(type='int'),
+        max_age_days=dict(type='int'),
+        hosts=dict(type='list', elements='str'),
+        parallel=dict(type='int'),
+    )
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+        mutually_exclusive=[['keyspaces', 'tables']],
+        required_if=[['state', 'absent', ['tag']]],
+    )
+
+    state = module.params['state']
+    tag = module.params['tag']
+    tag_prefix = module.params['tag_prefix']
+    keyspaces = module.params['keyspaces'] or []
+    tables = module.params['tables'] or []
+    keep_last = module.params['keep_last']
+    max_age_days = module.params['max_age_days']
+    parallel = module.params['parallel']
+
+    if keep_last is not None and keep_last < 1:
+        module.fail_json(msg="keep_last must be 1 or more")
+    if max_age_days is not None and max_age_days < 1:
+        module.fail_json(msg="max_age_days must be 1 or more")
+    if parallel is not None and parallel < 1:
+        module.fail_json(msg="parallel must be 1 or more")
+    if [t for t in tables if len(t.split(".")) != 2]:
+        module.fail_json(msg="tables must be given as keyspace.table")
+    if state == "present" and tag is None:
+        tag = "{0}-{1}".format(tag_prefix, int(time.time()))
+    if tag is not None and not TAG_REGEX.match(tag):
+        module.fail_json(msg="tag may only contain letters, digits and the characters _ . : -")
+
+    result = dict(changed=False)
+    if state != "list":
+        result['tag'] = tag
+    n = NodeToolCmd(module)
+    hosts = module.params['hosts'] or [n.host]
+
+    snapshot_cmd = "snapshot -t {0}".format(tag)
+    if module.params['skip_flush']:
+        snapshot_cmd += " -sf"
+    if tables:
+        snapshot_cmd += " -kt {0}".format(",".join(tables))
+    elif keyspaces:
+        snapshot_cmd += " -- {0}".format(" ".join(keyspaces))
+
+    def clear_cmd(clear_tag, clear_keyspaces):
+        cmd = "clearsnapshot -t {0}".format(clear_tag)
+        if clear_keyspaces:
+            cmd += " -- {0}".format(" ".join(clear_keyspaces))
+        return cmd
+
+    def run_node(host):
+        '''
+        Takes or clears the snapshot and applies the retention on one node.
+        Returns (created, cleared, snapshots).
+        '''
+        node_n = nodetool_for_host(module, host)
+
+        def nodetool(cmd):
+            (rc, out, err) = node_n.nodetool_cmd(cmd)
+            if rc != 0:
+                raise Exception("{0} failed: {1}".format(cmd.split()[0], (err or out).strip()))
+            return out
+
+        snapshots = group_snapshots(parse_listsnapshots(nodetool("listsnapshots")))
+        created = False
+        cleared = []
+        if state == "present" and tag not in snapshots:
+            if not module.check_mode:
+                nodetool(snapshot_cmd)
+            snapshots[tag] = dict(creation_time=int(time.time()))
+            created = True
+        elif state == "absent" and tag in snapshots:
+            if not module.check_mode:
+                nodetool(clear_cmd(tag, keyspaces))
+            if not keyspaces:
+                snapshots.pop(tag)
+            cleared.append(tag)
+        if state != "list" and (keep_last is not None or max_age_days is not None):
+            for expired in expired_snapshots(snapshots, tag_prefix, keep_last, max_age_days,
+                                             tag if state == "present" else None, time.time()):
+                if not module.check_mode:
+                    nodetool(clear_cmd(expired, []))
+                snapshots.pop(expired)
+                cleared.append(expired)
+        if (created or cleared) and not module.check_mode:
+            snapshots = group_snapshots(parse_listsnapshots(nodetool("listsnapshots")))
+        return (created, cleared, snapshots)
+
+    outcome = {}
+    errors = {}
+    pending = list(hosts)
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                if not pending:
+                    return
+                host = pending.pop(0)
+            try:
+                node = run_node(host)
+            except Exception as excep:
+                with lock:
+                    errors[host] = str(excep)
+                continue
+            with lock:
+                outcome[host] = node
+
+    threads = [threading.Thread(target=worker) for i in range(min(parallel or len(hosts), len(hosts)))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    snapshots = {}
+    for host in sorted(outcome):
+        for (snapshot_tag, snapshot) in outcome[host][2].items():
+            total = snapshots.setdefault(snapshot_tag, dict(keyspaces=[],
+                                                            tables=0,
+                                                            creation_time=snapshot['creation_time'],
+                                                            true_size_bytes=0,
+                                                            size_on_disk_bytes=0,
+                                                            nodes={}))
+            for keyspace in snapshot.get('keyspaces', []):
+                if keyspace not in total['keyspaces']:
+                    total['keyspaces'].append(keyspace)
+            total['tables'] = max(total['tables'], snapshot.get('tables', 0))
+            total['true_size_bytes'] += snapshot.get('true_size_bytes', 0)
+            total['size_on_disk_bytes'] += snapshot.get('size_on_disk_bytes', 0)
+            total['nodes'][host] = dict(true_size_bytes=snapshot.get('true_size_bytes', 0),
+                                        size_on_disk_bytes=snapshot.get('size_on_disk_bytes', 0))
+    result['snapshots'] = snapshots
+    result['cleared'] = dict((host, outcome[host][1]) for host in sorted(outcome) if outcome[host][1])
+    created = [host for host in sorted(outcome) if outcome[host][0]]
+    if state == "present":
+        result['created'] = created
+    result['changed'] = len(created) > 0 or len(result['cleared']) > 0
+
+    if errors:
+        result['errors'] = errors
+        result['msg'] = "Failed on {0} of {1} nodes".format(len(errors), len(hosts))
+        module.fail_json(**result)
+    if state == "list":
+        result['msg'] = "{0} snapshots found".format(len(snapshots))
+    elif state == "present" and created:
+        result['msg'] = "Snapshot {0} taken on {1} nodes".format(tag, len(created))
+    elif state == "present":
+        result['msg'] = "Snapshot {0} already exists".format(tag)
+    elif [host for host in result['cleared'] if tag in result['cleared'][host]]:
+        result['msg'] = "Snapshot {0} cleared".format(tag)
+    else:
+        result['msg'] = "Snapshot {0} does not exist".format(tag)
+    if module.check_mode and result['changed']:
+        result['msg'] += " (check mode)"
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,346 @@
+#!/usr/bin/python
+
+# 2026 Rhys Campbell <rhyscampbell@bluewin.ch>
+# https://github.com/rhysmeister
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+DOCUMENTATION = '''
+---
+module: cassandra_streamthroughput_controller
+author: Rhys Campbell (@rhysmeister)
+short_description: Adjusts the stream throughput while streams are active.
+requirements:
+  - nodetool
+description:
+  - Watches the progress of streaming sessions, i.e. of a bootstrap, rebuild, node replacement or decommission, \
+    with nodetool netstats and adjusts the stream throughput while they run.
+  - Every I(sample_interval) seconds it measures the streamed bytes per second and reads the p99 coordinator \
+    read latency from nodetool proxyhistograms. It raises the stream throughput by I(step_up) while the \
+    latency is below I(latency_target) by at least I(headroom) percent and streaming uses at least half of the \
+    current throughput, and lowers it by I(step_down) when the latency exceeds I(latency_target).
+  - When streaming finishes, or after I(duration) seconds, the original stream throughput, \
+    and inter-dc stream throughput when I(interdc_ratio) is set, are restored.
+  - Run it as an async task next to the task that starts the streaming operation.
+  - Throughput values are in megabits per second as used by nodetool setstreamthroughput.
+
+extends_documentation_fragment:
+  - community.cassandra.nodetool_module_options
+
+options:
+  value:
+    description:
+      - The stream throughput to start from. Defaults to the current value or I(max_value) when it is unlimited.
+    type: int
+  min_value:
+    description:
+      - The lowest stream throughput the controller sets.
+    type: int
+    default: 25
+  max_value:
+    description:
+      - The highest stream throughput the controller sets.
+    type: int
+    default: 800
+  step_up:
+    description:
+      - The value the controller raises the stream throughput by.
+    type: int
+    default: 50
+  step_down:
+    description:
+      - The value the controller lowers the stream throughput by.
+    type: int
+    default: 100
+  interdc_ratio:
+    description:
+      - Also set the inter-dc stream throughput to this fraction of the stream throughput.
+    type: float
+  latency_target:
+    description:
+      - The p99 coordinator read latency in microseconds the controller keeps below.
+    type: float
+    default: 10000
+  headroom:
+    description:
+      - The percentage the p99 read latency must be below I(latency_target) for the controller to raise the throughput.
+    type: int
+    default: 20
+  sample_interval:
+    description:
+      - The number of seconds between controller decisions.
+    type: int
+    default: 10
+  start_timeout:
+    description:
+      - The number of seconds to wait for streaming to start.
+      - The module returns without changes when no streams start in this time.
+    type: int
+    default: 300
+  duration:
+    description:
+      - The maximum number of seconds the controller runs for once streaming has started.
+    type: int
+    default: 14400
+  restore:
+    description:
+      - Set the throughput values back to their values before the controller started when it stops, \
+        also when it stops because a nodetool command failed.
+    type: bool
+    default: true
+  decision_log:
+    description:
+      - Append each controller decision as a line of json to this file, i.e. to follow an async task.
+    type: path
+'''
+
+EXAMPLES = '''
+- name: Adjust the stream throughput while the node is replaced
+  community.cassandra.cassandra_streamthroughput_controller:
+    min_value: 100
+    max_value: 1600
+    latency_target: 5000
+    interdc_ratio: 0.25
+    decision_log: /var/log/cassandra/streamthroughput_controller.log
+  async: 90000
+  poll: 0
+  register: stream_controller
+
+- name: Decommission the node
+  community.cassandra.cassandra_decommission:
+
+- name: Wait for the controller to restore the stream throughput
+  ansible.builtin.async_status:
+    jid: "{{ stream_controller.ansible_job_id }}"
+  register: job
+  until: job.finished
+  retries: 60
+  delay: 10
+'''
+
+RETURN = '''
+msg:
+  description: Why the controller stopped.
+  returned: always
+  type: str
+decisions:
+  description:
+    - Each controller decision.
+    - action is one of raise, lower, hold or stop.
+    - rate is the observed stream rate in megabits per second.
+  returned: always
+  type: list
+  sample: >
+    [ { "elapsed": 10.0, "bytes_remaining": 93456799, "rate": 180.2, "p99_read_latency": 2816.16,
+        "throughput": 200, "new_throughput": 250, "action": "raise", "reason": "p99 read latency has headroom" } ]
+final_throughput:
+  description: The stream throughput when the controller stopped, before any restore.
+  returned: when streaming started
+  type: int
+original_throughput:
+  description: The stream throughput and inter-dc stream throughput before the controller started.
+  returned: always
+  type: dict
+  sample: >
+    { "stream": 200, "interdc": 200 }
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+import json
+import re
+import time
+__metaclass__ = type
+
+
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_cmd_objects import NodeToolCmd
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_common_options import cassandra_common_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_parsers import parse_histograms
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_parsers import parse_netstats
+
+
+def extract_throughput(string):
+    match = re.search(r'(\d+(?:\.\d+)?) Mb/s', string)
+    if match:
+        return int(float(match.group(1)))
+    return None
+
+
+def controller_decision(module, throughput, rate, p99):
+    '''
+    Returns (new throughput, action, reason) for one controller sample
+    '''
+    p = module.params
+    if p99 is None:
+        return (throughput, "hold", "no p99 read latency available")
+    if p99 > p['latency_target']:
+        new_throughput = max(throughput - p['step_down'], p['min_value'])
+        if new_throughput < throughput:
+            return (new_throughput, "lower", "p99 read latency above target")
+        return (throughput, "hold", "p99 read latency above target at min_value")
+    if p99 <= p['latency_target'] * (100 - p['headroom']) / 100.0:
+        if rate is not None and rate < throughput / 2.0:
+            return (throughput, "hold", "stream rate below half of the throughput")
+        new_throughput = min(throughput + p['step_up'], p['max_value'])
+        if new_throughput > throughput:
+            return (new_throughput, "raise", "p99 read latency has headroom")
+        return (throughput, "hold", "at max_value")
+    return (throughput, "hold", "p99 read latency within headroom of target")
+
+
+def main():
+    argument_spec = cassandra_common_argument_spec()
+    argument_spec.update(
+        value=dict(type='int'),
+        min_value=dict(type='int', default=25),
+        max_value=dict(type='int', default=800),
+        step_up=dict(type='int', default=50),
+        step_down=dict(type='int', default=100),
+        interdc_ratio=dict(type='float'),
+        latency_target=dict(type='float', default=10000),
+        headroom=dict(type='int', default=20),
+        sample_interval=dict(type='int', default=10),
+        start_timeout=dict(type='int', default=300),
+        duration=dict(type='int', default=14400),
+        restore=dict(type='bool', default=True),
+        decision_log=dict(type='path', default=None),
+    )
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+    )
+
+    p = module.params
+    if p['min_value'] < 1 or p['min_value'] > p['max_value']:
+        module.fail_json(msg="min_value must be between 1 and max_value")
+
+    n = NodeToolCmd(module)
+    result = dict(changed=False, decisions=[])
+    get_flag = " -d" if p['cassandra_version'] == "4.1" else ""
+
+    state = dict(original=None, current=None, restored=False)
+
+    def nodetool(cmd):
+        (rc, out, err) = n.nodetool_cmd(cmd)
+        if rc != 0:
+            result['msg'] = "{0} command failed: {1}".format(cmd.split()[0], err)
+            result['rc'] = rc
+            restore_original()
+            module.fail_json(**result)
+        return out
+
+    def get_throughput(cmd):
+        value = extract_throughput(nodetool(cmd + get_flag))
+        if value is None:
+            module.fail_json(msg="Unable to read the {0} value".format(cmd), **result)
+        return value
+
+    def set_throughput(value):
+        if not module.check_mode:
+            state['current'] = value
+            nodetool("setstreamthroughput {0}".format(value))
+            if p['interdc_ratio'] is not None:
+                nodetool("setinterdcstreamthroughput {0}".format(max(int(value * p['interdc_ratio']), 1)))
+        result['changed'] = True
+
+    def restore_original():
+        '''
+        Sets the original throughput values again, once, if the controller
+        has changed them. Called before the module fails too.
+        '''
+        if not p['restore'] or state['restored'] or state['current'] is None:
+            return
+        state['restored'] = True
+        cmds = []
+        if state['current'] != state['original']['stream']:
+            cmds.append("setstreamthroughput {0}".format(state['original']['stream']))
+        if p['interdc_ratio'] is not None:
+            cmds.append("setinterdcstreamthroughput {0}".format(state['original']['interdc']))
+        for cmd in cmds:
+            (rc, out, err) = n.nodetool_cmd(cmd)
+            if rc != 0:
+                result['msg'] = "{0}, restoring the original throughput failed: {1}".format(result.get('msg'), err)
+                result['rc'] = rc
+                module.fail_json(**result)
+
+    def log_decision(decision):
+        result['decisions'].append(decision)
+        module.log("stream throughput controller: {0}".format(json.dumps(decision, sort_keys=True)))
+        if p['decision_log'] is not None:
+            with open(p['decision_log'], 'a') as f:
+                f.write(json.dumps(decision, sort_keys=True) + "\n")
+
+    original = dict(stream=get_throughput("getstreamthroughput"))
+    if p['interdc_ratio'] is not None:
+        original['interdc'] = get_throughput("getinterdcstreamthroughput")
+    result['original_throughput'] = original
+    state['original'] = original
+
+    # Wait for streaming to start
+    start = time.time()
+    netstats = parse_netstats(nodetool("netstats"))
+    while netstats['no_active_streams']:
+        if module.check_mode or time.time() + p['sample_interval'] > start + p['start_timeout']:
+            result['msg'] = "No streams started within {0} seconds".format(p['start_timeout'])
+            module.exit_json(**result)
+        time.sleep(p['sample_interval'])
+        netstats = parse_netstats(nodetool("netstats"))
+
+    throughput = original['stream']
+    if p['value'] is not None:
+        throughput = p['value']
+    elif throughput == 0:  # unlimited
+        throughput = p['max_value']
+    throughput = min(max(throughput, p['min_value']), p['max_value'])
+    try:
+        if throughput != original['stream'] or p['interdc_ratio'] is not None:
+            set_throughput(throughput)
+
+        start = time.time()
+        deadline = start + p['duration']
+        last = (start, netstats['bytes_done'])
+        result['msg'] = "duration expired"
+        while True:
+            if not module.check_mode:
+                time.sleep(p['sample_interval'])
+            netstats = parse_netstats(nodetool("netstats"))
+            now = time.time()
+            rate = None
+            if netstats['bytes_done'] >= last[1] and now > last[0]:
+                rate = round((netstats['bytes_done'] - last[1]) * 8 / 1000000.0 / (now - last[0]), 1)
+            last = (now, netstats['bytes_done'])
+            p99 = None
+            if netstats['no_active_streams']:
+                (new_throughput, action, reason) = (throughput, "stop", "streaming finished")
+            else:
+                p99 = parse_histograms(nodetool("proxyhistograms")).get('read_latency', {}).get('p99')
+                (new_throughput, action, reason) = controller_decision(module, throughput, rate, p99)
+            log_decision(dict(elapsed=round(now - start, 1),
+                              bytes_remaining=netstats['bytes_remaining'],
+                              rate=rate,
+                              p99_read_latency=p99,
+                              throughput=throughput,
+                              new_throughput=new_throughput,
+                              action=action,
+                              reason=reason))
+            if new_throughput != throughput:
+                set_throughput(new_throughput)
+                throughput = new_throughput
+            if action == "stop":
+                result['msg'] = reason
+                break
+            if module.check_mode:
+                result['msg'] = "first decision only (check mode)"
+                break
+            if time.time() + p['sample_interval'] > deadline:
+                break
+
+        result['final_throughput'] = throughput
+    finally:
+        restore_original()
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/python
+
+# 2026 Rhys Campbell <rhyscampbell@bluewin.ch>
+# https://github.com/rhysmeister
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+DOCUMENTATION = '''
+---
+module: cassandra_tablestats
+author: Rhys Campbell (@rhysmeister)
+short_description: Returns per table statistics.
+requirements:
+  - nodetool
+description:
+  - Returns per table statistics from nodetool tablestats.
+  - The output is parsed line by line as nodetool produces it so clusters with thousands of tables \
+    can be handled without holding the whole output in memory.
+  - Use I(where) to only return tables that need attention.
+
+extends_documentation_fragment:
+  - community.cassandra.nodetool_module_options
+
+options:
+  keyspace:
+    description:
+      - Only return the tables of this keyspace.
+    type: str
+  table:
+    description:
+      - Only return these tables.
+      - Requires I(keyspace) unless the names are given as keyspace.table.
+    type: list
+    elements: str
+  where:
+    description:
+      - Only return the tables matching these conditions.
+      - A condition is a field of the table record, an operator (<, <=, >, >=, ==, !=) and a number, \
+        i.e. C(sstable_count > 32).
+      - Fields nodetool reports as NaN never match.
+    type: list
+    elements: str
+  match:
+    description:
+      - Whether a table must match any or all of the I(where) conditions.
+    type: str
+    choices:
+      - any
+      - all
+    default: any
+'''
+
+EXAMPLES = '''
+- name: Get the statistics of all tables
+  community.cassandra.cassandra_tablestats:
+  register: tablestats
+
+- name: Get the statistics of the tables in a keyspace
+  community.cassandra.cassandra_tablestats:
+    keyspace: myapp
+  register: tablestats
+
+- name: Only return tables that need attention
+  community.cassandra.cassandra_tablestats:
+    where:
+      - sstable_count > 32
+      - max_tombstones_per_slice >= 1000
+      - partition_size_max > 104857600
+      - bloom_filter_false_ratio > 0.1
+  register: problem_tables
+'''
+
+RETURN = '''
+msg:
+  description: A message indicating what has happened.
+  returned: always
+  type: str
+tablestats:
+  description:
+    - The table records keyed by keyspace.table.
+    - Sizes are in bytes and latencies in milliseconds.
+    - Values nodetool reports as NaN are null.
+  returned: on success
+  type: dict
+  sample: >
+    { "myapp.users": { "keyspace": "myapp", "table": "users", "sstable_count": 4,
+                       "space_used_live": 1048576, "space_used_total": 1048576,
+                       "space_used_by_snapshots": 0, "number_of_partitions": 1200,
+                       "local_read_count": 310, "local_read_latency_ms": 0.25,
+                       "local_write_count": 1200, "local_write_latency_ms": 0.04,
+                       "pending_flushes": 0, "percent_repaired": 0.0,
+                       "partition_size_min": 51, "partition_size_max": 1109, "partition_size_mean": 220,
+                       "avg_live_cells_per_slice": 1.0, "max_live_cells_per_slice": 1,
+                       "avg_tombstones_per_slice": 1.0, "max_tombstones_per_slice": 1,
+                       "bloom_filter_false_positives": 0, "bloom_filter_false_ratio": 0.0,
+                       "sstable_compression_ratio": 0.45, "dropped_mutations": 0 } }
+tables_total:
+  description: The number of tables nodetool reported on.
+  returned: on success
+  type: int
+tables_returned:
+  description: The number of tables in tablestats.
+  returned: on success
+  type: int
+rc:
+  description: Return code of nodetool tablestats.
+  returned: on failure
+  type: int
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+__metaclass__ = type
+
+
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_cmd_objects import NodeToolCmd
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_common_options import cassandra_common_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_wait_until import parse_wait_conditions
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_parsers import parse_tablestats
+
+
+def tablestats_targets(keyspace, tables):
+    '''
+    Returns the arguments nodetool tablestats is filtered with
+    '''
+    if not tables:
+        return [keyspace] if keyspace is not None else []
+    targets = []
+    for table in tables:
+        if "." not in table and keyspace is not None:
+            table = "{0}.{1}".format(keyspace, table)
+        targets.append(table)
+    return targets
+
+
+def main():
+    argument_spec = cassandra_common_argument_spec()
+    argument_spec.update(
+        keyspace=dict(type='str', default=None, no_log=False),
+        table=dict(type='list', elements='str', default=None),
+        where=dict(type='list', elements='str', default=None),
+        match=dict(type='str', choices=['any', 'all'], default='any'),
+    )
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+    )
+
+    keyspace = module.params['keyspace']
+    tables = module.params['table']
+    match = module.params['match']
+    debug = module.params['debug']
+
+    if tables and keyspace is None and [t for t in tables if "." not in t]:
+        module.fail_json(msg="keyspace is required when a table is not given as keyspace.table")
+
+    conditions = parse_wait_conditions(module, 'where')
+
+    def matches(record):
+        if not conditions:
+            return True
+        try:
+            results = [c.evaluate(record)[0] for c in conditions]
+        except ValueError as excep:
+            module.fail_json(msg=str(excep))
+        if match == "all":
+            return all(results)
+        return any(results)
+
+    cmd = " ".join(["tablestats"] + tablestats_targets(keyspace, tables))
+    result = dict(changed=False)
+    n = NodeToolCmd(module)
+    if debug:
+        result['cmd'] = cmd
+
+    tablestats = {}
+    tables_total = 0
+    for record in parse_tablestats(n.stream_nodetool_cmd(cmd)):
+        tables_total += 1
+        if matches(record):
+            tablestats["{0}.{1}".format(record['keyspace'], record['table'])] = record
+
+    if n.rc != 0:
+        result['msg'] = "nodetool error: {0}".format(n.err)
+        result['rc'] = n.rc
+        module.fail_json(**result)
+    if debug and n.err:
+        result['stderr'] = n.err
+
+    result['tablestats'] = tablestats
+    result['tables_total'] = tables_total
+    result['tables_returned'] = len(tablestats)
+    result['msg'] = "Returned {0} of {1} tables".format(len(tablestats), tables_total)
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/python
+
+# 2026 Rhys Campbell <rhyscampbell@bluewin.ch>
+# https://github.com/rhysmeister
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+
+DOCUMENTATION = '''
+---
+module: cassandra_tpstats
+author: Rhys Campbell (@rhysmeister)
+short_description: Returns thread pool statistics and can wait for a pool to drain.
+requirements:
+  - nodetool
+description:
+  - Returns the active, pending, completed, blocked and all time blocked counts of each thread pool \
+    and the dropped message counts from nodetool tpstats.
+  - Optionally polls until conditions on these values are met, i.e. until the MutationStage has \
+    worked off its backlog after a node restart, instead of sleeping for a fixed time.
+
+extends_documentation_fragment:
+  - community.cassandra.nodetool_module_options
+  - community.cassandra.wait_until_options
+'''
+
+EXAMPLES = '''
+- name: Get thread pool statistics
+  community.cassandra.cassandra_tpstats:
+  register: tpstats
+
+- name: Wait until the node has absorbed writes after a restart
+  community.cassandra.cassandra_tpstats:
+    wait_until:
+      - thread_pools.MutationStage.pending < 10
+      - thread_pools.Native-Transport-Requests.pending == 0
+    wait_timeout: 600
+
+- name: Wait until no thread pool is blocked
+  community.cassandra.cassandra_tpstats:
+    wait_until:
+      - totals.blocked == 0
+'''
+
+RETURN = '''
+msg:
+  description: A message indicating what has happened.
+  returned: always
+  type: str
+tpstats:
+  description:
+    - The thread pool statistics.
+    - Values nodetool reports as N/A are null.
+    - message_latency is only returned by Cassandra 4.0 onwards and is in microseconds.
+  returned: on success
+  type: dict
+  sample: >
+    { "thread_pools": { "MutationStage": { "active": 0, "pending": 0, "completed": 2044,
+                                           "blocked": 0, "all_time_blocked": 0 } },
+      "dropped_messages": { "MUTATION": 0, "READ": 0 },
+      "message_latency": { "MUTATION": { "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0 } },
+      "totals": { "active": 0, "pending": 0, "blocked": 0, "all_time_blocked": 0, "dropped": 0 } }
+wait:
+  description:
+    - The outcome of I(wait_until).
+    - conditions holds the last value seen for each condition.
+  returned: when wait_until is set
+  type: dict
+  sample: >
+    { "met": true, "polls": 4, "elapsed": 9.02,
+      "conditions": { "thread_pools.MutationStage.pending < 10": 3 } }
+rc:
+  description: Return code of the last executed command.
+  returned: on failure
+  type: int
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+__metaclass__ = type
+
+
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_cmd_objects import NodeToolCommandSimple
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_common_options import cassandra_common_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_wait_until import wait_until_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.cassandra_wait_until import run_wait
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_parsers import parse_tpstats
+
+
+def main():
+    argument_spec = cassandra_common_argument_spec()
+    argument_spec.update(wait_until_argument_spec())
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+    )
+
+    debug = module.params['debug']
+
+    result = dict(changed=False)
+    n = NodeToolCommandSimple(module, "tpstats")
+
+    def get_tpstats():
+        (rc, out, err) = n.run_command()
+        if rc != 0:
+            result['msg'] = "nodetool error: {0}".format(err)
+            result['rc'] = rc
+            module.fail_json(**result)
+        if debug:
+            result['stdout'] = out
+            if err:
+                result['stderr'] = err
+        result['tpstats'] = parse_tpstats(out)
+        return result['tpstats']
+
+    run_wait(module, get_tpstats, result,
+             optional=["thread_pools", "dropped_messages", "message_latency"])
+    if 'wait' in result:
+        result['msg'] = "Thread pool conditions met after {0} polls".format(result['wait']['polls'])
+    else:
+        result['msg'] = "Thread pool statistics returned"
+
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
@@ -19,6 +19,7 @@ description:
 
 extends_documentation_fragment:
   - community.cassandra.nodetool_module_options
+  - community.cassandra.nodetool_job_options
 
 options:
   keyspace:
@@ -41,6 +42,18 @@ options:
 EXAMPLES = '''
 - name: Run cleanup on the Cassandra node
   community.cassandra.cassandra_cleanup:
+
+- name: Start nodetool upgradesstables in the background
+  community.cassandra.cassandra_upgradesstables:
+    state: started
+
+- name: Wait for nodetool upgradesstables to finish
+  community.cassandra.cassandra_upgradesstables:
+    state: status
+  register: job
+  until: not job.job.running
+  retries: 360
+  delay: 60
 '''
 
 RETURN = '''
@@ -48,6 +61,23 @@ cassandra_cleanup:
   description: The return state of the executed command.
   returned: success
   type: str
+job:
+  description:
+    - The job record of the detached command with its pid, start and end time, return code \
+      and the tail of its output.
+  returned: when state is set
+  type: dict
+  sample: >
+    { "operation": "upgradesstables", "command": "upgradesstables", "pid": 31337, "start_time": 1792398068.3,
+      "end_time": null, "rc": null, "cancelled": false, "running": true, "elapsed": 842.1,
+      "output_file": "/var/tmp/cassandra_upgradesstables.job.out", "output": "" }
+progress:
+  description: The progress of the operation from nodetool compactionstats.
+  returned: when state is set and the job is running
+  type: dict
+  sample: >
+    { "active": 2, "completed_bytes": 1048576, "total_bytes": 4194304,
+      "progress": 25.0, "remaining_time_seconds": 35 }
 '''
 
 
@@ -57,6 +87,8 @@ __metaclass__ = type
 
 from ansible_collections.community.cassandra.plugins.module_utils.nodetool_cmd_objects import NodeToolCommandKeyspaceTableNumJobs
 from ansible_collections.community.cassandra.plugins.module_utils.cassandra_common_options import cassandra_common_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_jobs import nodetool_job_argument_spec
+from ansible_collections.community.cassandra.plugins.module_utils.nodetool_jobs import run_nodetool_job
 
 
 def main():
@@ -66,20 +98,26 @@ def main():
         table=dict(type='raw', default=None, required=False),
         num_jobs=dict(type='int', default=2, aliases=['j'], required=False)
     )
+    argument_spec.update(nodetool_job_argument_spec())
     module = AnsibleModule(
         argument_spec=argument_spec,
-        supports_check_mode=False,
+        supports_check_mode=True,
     )
 
     cmd = 'upgradesstables'
 
     n = NodeToolCommandKeyspaceTableNumJobs(module, cmd)
+    if module.params['state'] is not None:
+        run_nodetool_job(module, n, 'upgradesstables', n.cmd)
 
     rc = None
     out = ''
     err = ''
     result = {}
 
+    if module.check_mode:
+        module.exit_json(changed=True, msg="nodetool upgradesstables would be executed (check mode)")
+
     (rc, out, err) = n.run_command()
     out = out.strip()
     err = err.strip()
@@ -0,0 +1,44 @@
+import json
+import os
+
+import testinfra.utils.ansible_runner
+
+testinfra_hosts = testinfra.utils.ansible_runner.AnsibleRunner(
+    os.environ['MOLECULE_INVENTORY_FILE']
+).get_hosts('all')
+
+
+def test_textfile_directory(host):
+    d = host.file("/var/lib/node_exporter/textfile_collector")
+
+    assert d.exists
+    assert d.is_directory
+
+
+def test_module_arguments_file(host):
+    f = host.file("/etc/cassandra_metrics_textfile.json")
+
+    assert f.exists
+    assert f.user == 'root'
+    assert f.mode == 0o600
+    args = json.loads(f.content_string)['ANSIBLE_MODULE_ARGS']
+    assert args['path'] == "/var/lib/node_exporter/textfile_collector/cassandra.prom"
+    assert args['tablestats_keyspaces'] == ["system_auth"]
+    assert args['cassandra_version'] == "4.0"
+
+
+def test_service_file(host):
+    f = host.file("/etc/systemd/system/cassandra-metrics-textfile.service")
+
+    assert f.exists
+    assert f.mode == 0o644
+    assert "ansible_collections.community.cassandra.plugins.modules.cassandra_metrics_textfile" in f.content_string
+    assert "/etc/cassandra_metrics_textfile.json" in f.content_string
+
+
+def test_timer_file(host):
+    f = host.file("/etc/systemd/system/cassandra-metrics-textfile.timer")
+
+    assert f.exists
+    assert f.mode == 0o644
+    assert "OnUnitActiveSec=1min" in f.content_string
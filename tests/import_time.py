@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+
+# Measures the import time of each module in plugins/modules.
+# Each module is imported in a fresh interpreter after ansible.module_utils.basic
+# has been loaded, so the figure is the cost the module itself adds at start-up.
+#
+# python tests/import_time.py
+# python tests/import_time.py --repeat 5 --budget 50
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+TIMER = """
+import time
+import ansible.module_utils.basic
+start = time.time()
+import ansible_collections.community.cassandra.plugins.modules.{0}
+print((time.time() - start) * 1000)
+"""
+
+
+def collections_path(collection_root):
+    """
+    Returns a path that contains ansible_collections/community/cassandra,
+    symlinking the checkout into a temporary directory if needed.
+    """
+    parent = os.path.dirname(os.path.dirname(os.path.dirname(collection_root)))
+    if os.path.basename(os.path.dirname(os.path.dirname(collection_root))) == "ansible_collections":
+        return parent
+    tmp = tempfile.mkdtemp()
+    os.makedirs(os.path.join(tmp, "ansible_collections", "community"))
+    os.symlink(collection_root, os.path.join(tmp, "ansible_collections", "community", "cassandra"))
+    return tmp
+
+
+def import_time(module, path, repeat):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([path, env.get('PYTHONPATH', '')])
+    timings = []
+    for i in range(repeat):
+        out = subprocess.check_output([sys.executable, "-c", TIMER.format(module)], env=env)
+        timings.append(float(out.strip()))
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the import time of each module")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per module, the fastest is reported")
+    parser.add_argument("--budget", type=float, default=None, help="Fail if any module takes longer (ms)")
+    parser.add_argument("--json", action="store_true", help="Output the timings as json")
+    parser.add_argument("modules", nargs="*", help="Modules to measure, defaults to all")
+    args = parser.parse_args()
+
+    collection_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    modules = args.modules
+    if not modules:
+        modules = sorted(f[:-3] for f in os.listdir(os.path.join(collection_root, "plugins", "modules"))
+                         if f.endswith(".py") and f != "__init__.py")
+    path = collections_path(collection_root)
+
+    timings = {}
+    for module in modules:
+        timings[module] = import_time(module, path, args.repeat)
+
+    if args.json:
+        print(json.dumps(timings, indent=2, sort_keys=True))
+    else:
+        for module in sorted(timings, key=timings.get, reverse=True):
+            print("{0:<40} {1:>8.1f} ms".format(module, timings[module]))
+
+    if args.budget is not None:
+        over = [m for m in modules if timings[m] > args.budget]
+        if over:
+            print("Over the {0} ms import budget: {1}".format(args.budget, ", ".join(over)), file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()